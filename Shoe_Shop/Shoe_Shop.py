@@ -1,9 +1,3353 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
+import heapq
+import os
+import queue
+import re
 import sqlite3
+import sys
+import time
+from bisect import bisect_left
+import threading
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 
 
+# SQLite storage profiles. journal_mode is stored in the database file; the
+# other settings are applied to every connection when it is opened.
+STORAGE_PROFILES = {
+    # WAL lets readers run while an order is being written
+    'balanced': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -16000,           # negative values are KiB (~16 MB)
+        'mmap_size': 64 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,           # milliseconds
+        'wal_autocheckpoint': 1000,     # pages written before a checkpoint
+        'journal_size_limit': 32 * 1024 * 1024,
+        'checkpoint_on_close': 'TRUNCATE',
+    },
+    # Same as balanced but fsyncs on every commit
+    'durable': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'cache_size': -16000,
+        'mmap_size': 64 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+        'wal_autocheckpoint': 1000,
+        'journal_size_limit': 32 * 1024 * 1024,
+        'checkpoint_on_close': 'TRUNCATE',
+    },
+    # SQLite defaults (rollback journal), kept for comparison
+    'legacy': {
+        'journal_mode': 'DELETE',
+        'synchronous': 'FULL',
+        'cache_size': -2000,
+        'mmap_size': 0,
+        'temp_store': 'DEFAULT',
+        'busy_timeout': 5000,
+        'wal_autocheckpoint': 1000,
+        'journal_size_limit': -1,
+        'checkpoint_on_close': None,
+    },
+}
+
+DEFAULT_STORAGE_PROFILE = 'balanced'
+
+
+# Base tables, created on first start
+SCHEMA_TABLES = [
+    '''
+        CREATE TABLE IF NOT EXISTS Categories (
+            category_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            category_name VARCHAR(50) NOT NULL,
+            description TEXT
+        )
+    ''',
+    '''
+        CREATE TABLE IF NOT EXISTS Suppliers (
+            supplier_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            supplier_name VARCHAR(100) NOT NULL,
+            contact_person VARCHAR(100),
+            phone VARCHAR(20),
+            email VARCHAR(100),
+            address TEXT
+        )
+    ''',
+    '''
+        CREATE TABLE IF NOT EXISTS Products (
+            product_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            product_name VARCHAR(100) NOT NULL,
+            category_id INTEGER,
+            supplier_id INTEGER,
+            brand VARCHAR(50),
+            size DECIMAL(3,1),
+            color VARCHAR(30),
+            gender VARCHAR(10),
+            price DECIMAL(10,2) NOT NULL,
+            cost_price DECIMAL(10,2),
+            description TEXT,
+            FOREIGN KEY (category_id) REFERENCES Categories(category_id),
+            FOREIGN KEY (supplier_id) REFERENCES Suppliers(supplier_id)
+        )
+    ''',
+    '''
+        CREATE TABLE IF NOT EXISTS Customers (
+            customer_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            first_name VARCHAR(50) NOT NULL,
+            last_name VARCHAR(50) NOT NULL,
+            email VARCHAR(100),
+            phone VARCHAR(20),
+            address TEXT,
+            registration_date DATE DEFAULT CURRENT_DATE
+        )
+    ''',
+    '''
+        CREATE TABLE IF NOT EXISTS Employees (
+            employee_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            first_name VARCHAR(50) NOT NULL,
+            last_name VARCHAR(50) NOT NULL,
+            email VARCHAR(100),
+            phone VARCHAR(20),
+            position VARCHAR(50),
+            salary DECIMAL(10,2),
+            hire_date DATE DEFAULT CURRENT_DATE
+        )
+    ''',
+    '''
+        CREATE TABLE IF NOT EXISTS Orders (
+            order_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            customer_id INTEGER,
+            employee_id INTEGER,
+            order_date DATE DEFAULT CURRENT_DATE,
+            total_amount DECIMAL(10,2),
+            status VARCHAR(20) DEFAULT 'Pending',
+            payment_method VARCHAR(30),
+            FOREIGN KEY (customer_id) REFERENCES Customers(customer_id),
+            FOREIGN KEY (employee_id) REFERENCES Employees(employee_id)
+        )
+    ''',
+    '''
+        CREATE TABLE IF NOT EXISTS OrderDetails (
+            order_detail_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            order_id INTEGER,
+            product_id INTEGER,
+            quantity INTEGER NOT NULL,
+            unit_price DECIMAL(10,2) NOT NULL,
+            subtotal DECIMAL(10,2),
+            FOREIGN KEY (order_id) REFERENCES Orders(order_id),
+            FOREIGN KEY (product_id) REFERENCES Products(product_id)
+        )
+    ''',
+    '''
+        CREATE TABLE IF NOT EXISTS Inventory (
+            inventory_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            product_id INTEGER UNIQUE,
+            quantity INTEGER DEFAULT 0,
+            last_restocked DATE,
+            min_stock_level INTEGER DEFAULT 10,
+            FOREIGN KEY (product_id) REFERENCES Products(product_id)
+        )
+    ''',
+]
+
+# Triggers that keep the FTS5 search tables in sync, as (name, DDL)
+SEARCH_INDEX_TRIGGERS = [
+    ('trg_products_fts_insert', '''
+        CREATE TRIGGER IF NOT EXISTS trg_products_fts_insert AFTER INSERT ON Products
+        BEGIN
+            INSERT INTO products_fts(rowid, product_name, brand, category_name)
+            VALUES (new.product_id, new.product_name, new.brand,
+                    (SELECT category_name FROM Categories WHERE category_id = new.category_id));
+        END
+    '''),
+    ('trg_products_fts_update', '''
+        CREATE TRIGGER IF NOT EXISTS trg_products_fts_update AFTER UPDATE OF product_name, brand, category_id ON Products
+        BEGIN
+            UPDATE products_fts
+            SET product_name = new.product_name,
+                brand = new.brand,
+                category_name = (SELECT category_name FROM Categories WHERE category_id = new.category_id)
+            WHERE rowid = new.product_id;
+        END
+    '''),
+    ('trg_products_fts_delete', '''
+        CREATE TRIGGER IF NOT EXISTS trg_products_fts_delete AFTER DELETE ON Products
+        BEGIN
+            DELETE FROM products_fts WHERE rowid = old.product_id;
+        END
+    '''),
+    ('trg_categories_fts_update', '''
+        CREATE TRIGGER IF NOT EXISTS trg_categories_fts_update AFTER UPDATE OF category_name ON Categories
+        BEGIN
+            UPDATE products_fts SET category_name = new.category_name
+            WHERE rowid IN (SELECT product_id FROM Products WHERE category_id = new.category_id);
+        END
+    '''),
+    ('trg_categories_fts_delete', '''
+        CREATE TRIGGER IF NOT EXISTS trg_categories_fts_delete AFTER DELETE ON Categories
+        BEGIN
+            UPDATE products_fts SET category_name = NULL
+            WHERE rowid IN (SELECT product_id FROM Products WHERE category_id = old.category_id);
+        END
+    '''),
+    ('trg_customers_fts_insert', '''
+        CREATE TRIGGER IF NOT EXISTS trg_customers_fts_insert AFTER INSERT ON Customers
+        BEGIN
+            INSERT INTO customers_fts(rowid, first_name, last_name, email)
+            VALUES (new.customer_id, new.first_name, new.last_name, new.email);
+        END
+    '''),
+    ('trg_customers_fts_update', '''
+        CREATE TRIGGER IF NOT EXISTS trg_customers_fts_update AFTER UPDATE OF first_name, last_name, email ON Customers
+        BEGIN
+            UPDATE customers_fts
+            SET first_name = new.first_name, last_name = new.last_name, email = new.email
+            WHERE rowid = new.customer_id;
+        END
+    '''),
+    ('trg_customers_fts_delete', '''
+        CREATE TRIGGER IF NOT EXISTS trg_customers_fts_delete AFTER DELETE ON Customers
+        BEGIN
+            DELETE FROM customers_fts WHERE rowid = old.customer_id;
+        END
+    '''),
+]
+
+# Statements that repopulate the FTS5 search tables from scratch. Segment
+# merging is switched off while the rows go in (it roughly halves the time
+# for a million-row catalog) and set back to the FTS5 default afterwards.
+SEARCH_INDEX_REBUILD = [
+    "INSERT INTO products_fts(products_fts, rank) VALUES ('automerge', 0)",
+    "DELETE FROM products_fts",
+    '''
+        INSERT INTO products_fts(rowid, product_name, brand, category_name)
+        SELECT p.product_id, p.product_name, p.brand, c.category_name
+        FROM Products p
+        LEFT JOIN Categories c ON p.category_id = c.category_id
+    ''',
+    "INSERT INTO products_fts(products_fts, rank) VALUES ('automerge', 4)",
+    "INSERT INTO customers_fts(customers_fts, rank) VALUES ('automerge', 0)",
+    "DELETE FROM customers_fts",
+    '''
+        INSERT INTO customers_fts(rowid, first_name, last_name, email)
+        SELECT customer_id, first_name, last_name, email FROM Customers
+    ''',
+    "INSERT INTO customers_fts(customers_fts, rank) VALUES ('automerge', 4)",
+]
+
+# Dashboard KPIs in the order they are stored in DashboardStats
+DASHBOARD_STATS_COLUMNS = ('total_products', 'total_customers', 'total_orders', 'low_stock',
+                           'completed_orders', 'completed_revenue')
+
+# Every dashboard KPI computed from the base tables in a single statement.
+# Used to (re)build DashboardStats and as a fallback when it is missing.
+DASHBOARD_STATS_SNAPSHOT = '''
+    SELECT p.total_products, c.total_customers, o.total_orders, i.low_stock,
+           r.completed_orders, r.completed_revenue
+    FROM (SELECT COUNT(*) AS total_products FROM Products) p,
+         (SELECT COUNT(*) AS total_customers FROM Customers) c,
+         (SELECT COUNT(*) AS total_orders FROM Orders) o,
+         (SELECT COUNT(*) AS low_stock FROM Inventory WHERE quantity < min_stock_level) i,
+         (SELECT COUNT(*) AS completed_orders, COALESCE(SUM(total_amount), 0) AS completed_revenue
+          FROM Orders WHERE status = 'Completed') r
+'''
+
+# Statement that recomputes the single DashboardStats row
+DASHBOARD_STATS_REBUILD = f'''
+    INSERT OR REPLACE INTO DashboardStats (stat_id, {', '.join(DASHBOARD_STATS_COLUMNS)})
+    SELECT 1, * FROM ({DASHBOARD_STATS_SNAPSHOT})
+'''
+
+# Triggers that keep DashboardStats in step with every write, as (name, DDL)
+DASHBOARD_STATS_TRIGGERS = [
+    ('trg_stats_products_insert', '''
+        CREATE TRIGGER IF NOT EXISTS trg_stats_products_insert AFTER INSERT ON Products
+        BEGIN
+            UPDATE DashboardStats SET total_products = total_products + 1;
+        END
+    '''),
+    ('trg_stats_products_delete', '''
+        CREATE TRIGGER IF NOT EXISTS trg_stats_products_delete AFTER DELETE ON Products
+        BEGIN
+            UPDATE DashboardStats SET total_products = total_products - 1;
+        END
+    '''),
+    ('trg_stats_customers_insert', '''
+        CREATE TRIGGER IF NOT EXISTS trg_stats_customers_insert AFTER INSERT ON Customers
+        BEGIN
+            UPDATE DashboardStats SET total_customers = total_customers + 1;
+        END
+    '''),
+    ('trg_stats_customers_delete', '''
+        CREATE TRIGGER IF NOT EXISTS trg_stats_customers_delete AFTER DELETE ON Customers
+        BEGIN
+            UPDATE DashboardStats SET total_customers = total_customers - 1;
+        END
+    '''),
+    ('trg_stats_orders_insert', '''
+        CREATE TRIGGER IF NOT EXISTS trg_stats_orders_insert AFTER INSERT ON Orders
+        BEGIN
+            UPDATE DashboardStats
+            SET total_orders = total_orders + 1,
+                completed_orders = completed_orders + (new.status = 'Completed'),
+                completed_revenue = completed_revenue
+                    + CASE WHEN new.status = 'Completed' THEN COALESCE(new.total_amount, 0) ELSE 0 END;
+        END
+    '''),
+    ('trg_stats_orders_update', '''
+        CREATE TRIGGER IF NOT EXISTS trg_stats_orders_update AFTER UPDATE OF status, total_amount ON Orders
+        BEGIN
+            UPDATE DashboardStats
+            SET completed_orders = completed_orders + (new.status = 'Completed') - (old.status = 'Completed'),
+                completed_revenue = completed_revenue
+                    + CASE WHEN new.status = 'Completed' THEN COALESCE(new.total_amount, 0) ELSE 0 END
+                    - CASE WHEN old.status = 'Completed' THEN COALESCE(old.total_amount, 0) ELSE 0 END;
+        END
+    '''),
+    ('trg_stats_orders_delete', '''
+        CREATE TRIGGER IF NOT EXISTS trg_stats_orders_delete AFTER DELETE ON Orders
+        BEGIN
+            UPDATE DashboardStats
+            SET total_orders = total_orders - 1,
+                completed_orders = completed_orders - (old.status = 'Completed'),
+                completed_revenue = completed_revenue
+                    - CASE WHEN old.status = 'Completed' THEN COALESCE(old.total_amount, 0) ELSE 0 END;
+        END
+    '''),
+    ('trg_stats_inventory_insert', '''
+        CREATE TRIGGER IF NOT EXISTS trg_stats_inventory_insert AFTER INSERT ON Inventory
+        BEGIN
+            UPDATE DashboardStats SET low_stock = low_stock + (new.quantity < new.min_stock_level);
+        END
+    '''),
+    ('trg_stats_inventory_update', '''
+        CREATE TRIGGER IF NOT EXISTS trg_stats_inventory_update AFTER UPDATE OF quantity, min_stock_level ON Inventory
+        BEGIN
+            UPDATE DashboardStats
+            SET low_stock = low_stock + (new.quantity < new.min_stock_level) - (old.quantity < old.min_stock_level);
+        END
+    '''),
+    ('trg_stats_inventory_delete', '''
+        CREATE TRIGGER IF NOT EXISTS trg_stats_inventory_delete AFTER DELETE ON Inventory
+        BEGIN
+            UPDATE DashboardStats SET low_stock = low_stock - (old.quantity < old.min_stock_level);
+        END
+    '''),
+]
+
+# Tables the CatalogCache lists and the paged listings are read from, with
+# the lists each one feeds (product rows carry their category name, stock
+# rows their product's name)
+CATALOG_TABLES = {
+    'Products': ('products', 'inventory'),
+    'Customers': ('customers',),
+    'Categories': ('categories', 'products'),
+    'Inventory': ('inventory',),
+}
+
+# Triggers that count every write to a cached list's tables, as (name, DDL).
+# The counters in CatalogVersions tell a cache whether its copy of a list
+# is still current, whichever connection or terminal did the write.
+CATALOG_VERSION_TRIGGERS = [
+    (f'trg_{table.lower()}_version_{event.lower()}', f'''
+        CREATE TRIGGER IF NOT EXISTS trg_{table.lower()}_version_{event.lower()} AFTER {event} ON {table}
+        BEGIN
+            UPDATE CatalogVersions SET version = version + 1
+            WHERE list_name IN ({', '.join(f"'{name}'" for name in names)});
+        END
+    ''')
+    for table, names in CATALOG_TABLES.items()
+    for event in ('INSERT', 'UPDATE', 'DELETE')
+]
+
+# Marks every cached list as changed, e.g. after the triggers were suspended
+CATALOG_VERSIONS_BUMP = "UPDATE CatalogVersions SET version = version + 1"
+
+# Versioned schema changes applied on top of SCHEMA_TABLES. The database's
+# PRAGMA user_version records the last migration that has been applied.
+SCHEMA_MIGRATIONS = [
+    (1, "Secondary indexes for dashboard, order and customer lookups", [
+        # load_recent_orders: ORDER BY order_date DESC, order_id DESC LIMIT 10
+        "CREATE INDEX IF NOT EXISTS idx_orders_order_date ON Orders(order_date)",
+        # get_total_revenue / get_avg_order_value: covering index on status
+        "CREATE INDEX IF NOT EXISTS idx_orders_status_amount ON Orders(status, total_amount)",
+        # delete_customer: existing-order check
+        "CREATE INDEX IF NOT EXISTS idx_orders_customer ON Orders(customer_id)",
+        # create_order: customer lookup by name
+        "CREATE INDEX IF NOT EXISTS idx_customers_name ON Customers(first_name, last_name)",
+        # OrderDetails joins from either side
+        "CREATE INDEX IF NOT EXISTS idx_order_details_order ON OrderDetails(order_id)",
+        "CREATE INDEX IF NOT EXISTS idx_order_details_product ON OrderDetails(product_id)",
+    ]),
+    (2, "FTS5 search indexes for products and customers, kept in sync by triggers", [
+        # rowid is the product_id; category_name is denormalised so the
+        # product search box can match categories without a join.
+        '''
+            CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+                product_name, brand, category_name,
+                tokenize = 'unicode61 remove_diacritics 2',
+                prefix = '1 2 3'
+            )
+        ''',
+        # Rank name matches above brand matches above category matches
+        "INSERT INTO products_fts(products_fts, rank) VALUES ('rank', 'bm25(10.0, 5.0, 2.0)')",
+        '''
+            CREATE VIRTUAL TABLE IF NOT EXISTS customers_fts USING fts5(
+                first_name, last_name, email,
+                tokenize = 'unicode61 remove_diacritics 2',
+                prefix = '1 2 3'
+            )
+        ''',
+    ] + SEARCH_INDEX_REBUILD + [ddl for _, ddl in SEARCH_INDEX_TRIGGERS]),
+    (3, "Materialized dashboard KPIs, kept current by triggers", [
+        '''
+            CREATE TABLE IF NOT EXISTS DashboardStats (
+                stat_id INTEGER PRIMARY KEY CHECK (stat_id = 1),
+                total_products INTEGER NOT NULL,
+                total_customers INTEGER NOT NULL,
+                total_orders INTEGER NOT NULL,
+                low_stock INTEGER NOT NULL,
+                completed_orders INTEGER NOT NULL,
+                completed_revenue REAL NOT NULL
+            )
+        ''',
+        DASHBOARD_STATS_REBUILD,
+    ] + [ddl for _, ddl in DASHBOARD_STATS_TRIGGERS]),
+    (4, "Stock reservations held by open order carts", [
+        # Units held by carts; available stock is quantity - reserved
+        "ALTER TABLE Inventory ADD COLUMN reserved INTEGER NOT NULL DEFAULT 0",
+        '''
+            CREATE TABLE IF NOT EXISTS StockReservations (
+                session_id TEXT NOT NULL,
+                product_id INTEGER NOT NULL,
+                quantity INTEGER NOT NULL,
+                reserved_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (session_id, product_id),
+                FOREIGN KEY (product_id) REFERENCES Products(product_id)
+            )
+        ''',
+    ]),
+    (5, "Write counters for the cached product, customer and category lists", [
+        '''
+            CREATE TABLE IF NOT EXISTS CatalogVersions (
+                list_name TEXT PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0
+            )
+        ''',
+        "INSERT OR IGNORE INTO CatalogVersions (list_name) VALUES ('products'), ('customers'), ('categories')",
+    ] + [ddl for _, ddl in CATALOG_VERSION_TRIGGERS]),
+    (6, "Write counter for the inventory listing", [
+        "INSERT OR IGNORE INTO CatalogVersions (list_name) VALUES ('inventory')",
+        # Product writes now feed the inventory counter too
+        "DROP TRIGGER IF EXISTS trg_products_version_insert",
+        "DROP TRIGGER IF EXISTS trg_products_version_update",
+        "DROP TRIGGER IF EXISTS trg_products_version_delete",
+    ] + [ddl for _, ddl in CATALOG_VERSION_TRIGGERS]),
+]
+
+# Triggers that maintain derived data, as (migration that creates them,
+# triggers, statements that rebuild the data from the base tables)
+DERIVED_DATA_TRIGGERS = [
+    (2, SEARCH_INDEX_TRIGGERS, SEARCH_INDEX_REBUILD),
+    (3, DASHBOARD_STATS_TRIGGERS, [DASHBOARD_STATS_REBUILD]),
+    (5, CATALOG_VERSION_TRIGGERS, [CATALOG_VERSIONS_BUMP]),
+]
+
+# Reservations not refreshed for this long are treated as abandoned
+# (crashed terminal) and returned to stock when the application starts
+RESERVATION_TTL_MINUTES = 120
+
+# How often a window with a non-empty cart refreshes its reservations, so
+# a cart that stays open for hours is never mistaken for an abandoned one
+RESERVATION_HEARTBEAT_MINUTES = 10
+
+# Most rows a search box shows; results are ordered best match first.
+SEARCH_RESULT_LIMIT = 200
+
+# Shortest typed word that gets its matches ranked. Ranking scores every
+# match before the limit applies, and a one- or two-letter prefix matches
+# a large part of the catalog (about 200 ms for "a" over 300k products);
+# shorter text takes the first matches in rowid order, which stops at the
+# limit.
+SEARCH_RANK_MIN_PREFIX = 3
+
+# Restock target policies as (target quantity SQL, default parameters, setup
+# statements). The setup statements run first in the same transaction; the
+# target is then evaluated per Inventory row and low-stock rows below it are
+# topped up.
+RESTOCK_POLICIES = {
+    # Minimum stock level plus a fixed safety margin
+    'min_plus': ('min_stock_level + :margin', {'margin': 20}, []),
+    # A multiple of the minimum stock level
+    'par': ('CAST(min_stock_level * :factor + 0.5 AS INTEGER)', {'factor': 2.0}, []),
+    # Enough units for `days` at the sales rate of the last `window_days`,
+    # never less than the minimum stock level. Sales in the window are summed
+    # once into a keyed temp table first, walking only the window's orders
+    # (CROSS JOIN keeps Orders as the outer loop on idx_orders_order_date),
+    # rather than by a correlated subquery evaluated twice per row.
+    'days_of_cover': ('''
+        MAX(min_stock_level, (
+            COALESCE((SELECT units FROM temp.restock_sales s WHERE s.product_id = Inventory.product_id), 0)
+            * :days + :window_days - 1) / :window_days)
+    ''', {'days': 30, 'window_days': 90}, [
+        "CREATE TEMP TABLE IF NOT EXISTS restock_sales (product_id INTEGER PRIMARY KEY, units INTEGER NOT NULL)",
+        "DELETE FROM temp.restock_sales",
+        '''
+            INSERT INTO temp.restock_sales (product_id, units)
+            SELECT d.product_id, SUM(d.quantity)
+            FROM Orders o
+            CROSS JOIN OrderDetails d ON d.order_id = o.order_id
+            WHERE o.order_date >= date('now', '-' || :window_days || ' days')
+            GROUP BY d.product_id
+        ''',
+    ]),
+}
+
+# Restock policies offered in the inventory section, by display label
+RESTOCK_POLICY_LABELS = {
+    'Min + 20': 'min_plus',
+    'Par (2x min)': 'par',
+    '30 days of cover': 'days_of_cover',
+}
+
+# Most suggestions an order-form type-ahead dropdown shows at once
+TYPEAHEAD_LIMIT = 25
+
+# How often the visible dashboard checks the database for changes (0 = never)
+DASHBOARD_REFRESH_MS = 2000
+
+# How often the Tk thread collects finished background tasks while any are running
+TASK_POLL_MS = 20
+
+# Event-loop monitor: heartbeat interval, stall threshold, heartbeats kept
+# for the lag percentiles (one minute), stalls kept and overlay refresh.
+# The monitor runs from startup when MONITOR_ENV or STALL_LOG_ENV is set,
+# otherwise from the first F12. Stalls are also written to the file named
+# by STALL_LOG_ENV when it is set.
+HEARTBEAT_MS = 50
+STALL_MS = 100
+LAG_HISTORY = 1200
+WORST_STALLS = 10
+MONITOR_OVERLAY_MS = 500
+STALL_LOG_ENV = 'SHOE_SHOP_STALL_LOG'
+MONITOR_ENV = 'SHOE_SHOP_MONITOR'
+
+# Inventory table columns, shared by the listing and the search query
+INVENTORY_COLUMNS = '''i.inventory_id, p.product_name, p.brand, p.size,
+                   i.quantity, i.min_stock_level,
+                   CASE
+                     WHEN i.quantity = 0 THEN 'Out of Stock'
+                     WHEN i.quantity < i.min_stock_level THEN 'Low Stock'
+                     ELSE 'In Stock'
+                   END as status'''
+
+# WHERE clauses behind the inventory stock filter combobox
+INVENTORY_FILTERS = {
+    'All': '',
+    'Low Stock': 'i.quantity < i.min_stock_level AND i.quantity > 0',
+    'Out of Stock': 'i.quantity = 0',
+}
+
+
+def fts_prefix_query(search_term):
+    """
+    Turn free text from a search box into an FTS5 prefix query.
+    
+    Every word becomes a quoted prefix term, so "air ma" matches
+    "Air Max 270". Quoting keeps FTS5 operators and punctuation typed by
+    the user from being parsed as query syntax.
+    
+    Args:
+        search_term: Raw text from the search entry
+    
+    Returns:
+        str: MATCH expression, or None when the text has no searchable words
+    """
+    words = re.findall(r'\w+', search_term.lower())
+    if not words:
+        return None
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def fts_result_order(search_term):
+    """
+    Choose how the matches of fts_prefix_query(search_term) are ordered.
+    
+    Args:
+        search_term: Raw text from the search entry
+    
+    Returns:
+        str: 'rank' (best match first) once a typed word has
+            SEARCH_RANK_MIN_PREFIX characters, else 'rowid'
+    """
+    words = re.findall(r'\w+', search_term)
+    return 'rank' if any(len(word) >= SEARCH_RANK_MIN_PREFIX for word in words) else 'rowid'
+
+
+class ShopError(Exception):
+    """Base class for business-rule failures that are reported to the user."""
+
+
+class InsufficientStockError(ShopError):
+    """Raised when a reservation or order asks for more units than are available."""
+    
+    def __init__(self, product_id, requested, available):
+        """
+        Args:
+            product_id: Product that is short
+            requested: Units asked for
+            available: Units on hand and not held by another cart
+        """
+        super().__init__(
+            f"Only {available} unit(s) of product #{product_id} available, {requested} requested"
+        )
+        self.product_id = product_id
+        self.requested = requested
+        self.available = available
+
+
+# Slow-query logging. The profiler is off unless SLOW_QUERY_ENV is set to a
+# threshold in milliseconds; SLOW_LOG_ENV overrides the log file.
+SLOW_QUERY_ENV = 'SHOE_SHOP_SLOW_MS'
+SLOW_LOG_ENV = 'SHOE_SHOP_SLOW_LOG'
+SLOW_QUERY_MS = 50
+SLOW_QUERY_LOG = "shoe_shop_slow.log"
+
+# Upper bounds (ms) of the query latency histogram buckets; slower calls
+# land in a final overflow bucket
+LATENCY_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+# Statements EXPLAIN QUERY PLAN can describe
+EXPLAINABLE = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+# Generic data-access functions skipped when naming the caller of a query,
+# as Class.method names of this module (matched by code object)
+PROFILER_INTERNALS = {
+    'DatabaseManager.execute', 'DatabaseManager.executemany', 'DatabaseManager._query',
+    'DatabaseManager.fetchone', 'DatabaseManager.fetchall', 'DatabaseManager.fetchvalue',
+    'ProfiledCursor.execute', 'ProfiledCursor.executemany', 'QueryProfiler.record',
+}
+
+
+class QueryProfiler:
+    """
+    Per-statement timing for everything that goes through DatabaseManager.
+    
+    Each distinct SQL text gets a call count, total/max time, a latency
+    histogram, the rows it returned or changed and the methods that ran
+    it. Calls at or above the slow threshold are appended to the slow-query
+    log together with the statement's EXPLAIN QUERY PLAN, which is taken
+    on the same connection once per statement.
+    """
+    
+    # Code objects of PROFILER_INTERNALS, filled in by internal_code()
+    _internal_code = None
+    
+    def __init__(self, slow_ms=SLOW_QUERY_MS, log_path=SLOW_QUERY_LOG):
+        """
+        Args:
+            slow_ms: Calls taking at least this many milliseconds are logged
+            log_path: Slow-query log file (None keeps statistics only)
+        """
+        self.slow_ms = slow_ms
+        self.log_path = log_path
+        self.stats = {}
+        self._explained = set()
+        self._lock = threading.Lock()
+        self._log = None
+    
+    @classmethod
+    def from_environment(cls):
+        """
+        Build a profiler from SLOW_QUERY_ENV and SLOW_LOG_ENV.
+        
+        Returns:
+            QueryProfiler, or None when profiling is not switched on
+        """
+        threshold = os.environ.get(SLOW_QUERY_ENV)
+        if not threshold:
+            return None
+        return cls(float(threshold), os.environ.get(SLOW_LOG_ENV, SLOW_QUERY_LOG))
+    
+    @classmethod
+    def internal_code(cls):
+        """Code objects of the PROFILER_INTERNALS functions, looked up once."""
+        if cls._internal_code is None:
+            cls._internal_code = frozenset(
+                getattr(globals()[class_name], method).__code__
+                for class_name, method in (name.split('.') for name in PROFILER_INTERNALS))
+        return cls._internal_code
+    
+    @staticmethod
+    def frame_name(frame):
+        """
+        Name the function a frame is running as Class.method where possible.
+        
+        Uses co_qualname where the interpreter has it (3.11+); otherwise the
+        class is taken from the frame's self or cls argument.
+        """
+        code = frame.f_code
+        name = getattr(code, 'co_qualname', None)
+        if name is not None:
+            return name
+        owner = frame.f_locals.get('self', frame.f_locals.get('cls'))
+        if owner is None:
+            return code.co_name
+        owner_class = owner if isinstance(owner, type) else type(owner)
+        return f"{owner_class.__name__}.{code.co_name}"
+    
+    @classmethod
+    def caller(cls):
+        """Name the first function outside the data-access layer on the stack."""
+        internal = cls.internal_code()
+        frame = sys._getframe(1)
+        while frame is not None:
+            if frame.f_code not in internal:
+                return cls.frame_name(frame)
+            frame = frame.f_back
+        return '?'
+    
+    def record(self, conn, query, params, seconds, rows):
+        """
+        Account one statement and log it if it was slow.
+        
+        Args:
+            conn: Connection the statement ran on (used for EXPLAIN)
+            query: SQL text
+            params: Bound parameters (None for executemany)
+            seconds: Elapsed time
+            rows: Rows returned or changed, or None when unknown
+        """
+        elapsed_ms = seconds * 1000
+        rows = rows if rows is not None and rows >= 0 else None
+        sql = ' '.join(query.split())
+        caller = self.caller()
+        bucket = bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)
+        
+        with self._lock:
+            entry = self.stats.get(sql)
+            if entry is None:
+                entry = self.stats[sql] = {
+                    'calls': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'rows': 0,
+                    'histogram': [0] * (len(LATENCY_BUCKETS_MS) + 1), 'callers': {},
+                }
+            entry['calls'] += 1
+            entry['total_ms'] += elapsed_ms
+            entry['max_ms'] = max(entry['max_ms'], elapsed_ms)
+            entry['rows'] += rows or 0
+            entry['histogram'][bucket] += 1
+            entry['callers'][caller] = entry['callers'].get(caller, 0) + 1
+            explain = elapsed_ms >= self.slow_ms and sql not in self._explained
+            if explain:
+                self._explained.add(sql)
+        
+        if elapsed_ms >= self.slow_ms and self.log_path:
+            plan = self.explain(conn, sql, params) if explain else None
+            self.log_slow(sql, params, elapsed_ms, rows, caller, plan)
+    
+    @staticmethod
+    def explain(conn, sql, params):
+        """
+        Return the EXPLAIN QUERY PLAN lines for a statement.
+        
+        Returns:
+            list: Plan lines indented by depth, or a one-line reason why
+            no plan is available
+        """
+        if not sql.upper().startswith(EXPLAINABLE):
+            return ["(no plan for this kind of statement)"]
+        if params is None:
+            return ["(no plan for executemany)"]
+        try:
+            rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+        except sqlite3.Error as e:
+            return [f"(plan unavailable: {e})"]
+        depth = {0: 0}
+        lines = []
+        for node_id, parent, _, detail in rows:
+            depth[node_id] = depth.get(parent, 0) + 1
+            lines.append('  ' * (depth[node_id] - 1) + detail)
+        return lines
+    
+    def _write(self, text):
+        """Append text to the log file, opening it on first use."""
+        with self._lock:
+            if self._log is None:
+                self._log = open(self.log_path, 'a', encoding='utf-8')
+            self._log.write(text)
+            self._log.flush()
+    
+    def log_slow(self, sql, params, elapsed_ms, rows, caller, plan):
+        """Append one slow call to the log file."""
+        lines = [
+            f"{datetime.now():%Y-%m-%d %H:%M:%S}  {elapsed_ms:.1f} ms  rows={rows}  caller={caller}",
+            f"  SQL: {sql}",
+        ]
+        if params is not None:
+            lines.append(f"  params: {repr(params)[:200]}")
+        if plan is not None:
+            lines.append("  plan:")
+            lines.extend(f"    {line}" for line in plan)
+        self._write('\n'.join(lines) + '\n\n')
+    
+    def report(self, limit=None):
+        """
+        Summarise the recorded statements, most total time first.
+        
+        Args:
+            limit: Maximum number of statements (None for all)
+        
+        Returns:
+            list: Dicts with sql, calls, total_ms, mean_ms, max_ms, rows,
+                callers and a histogram keyed by bucket upper bound
+        """
+        labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        with self._lock:
+            entries = sorted(self.stats.items(), key=lambda item: item[1]['total_ms'], reverse=True)
+            summary = [{
+                'sql': sql,
+                'calls': entry['calls'],
+                'total_ms': round(entry['total_ms'], 3),
+                'mean_ms': round(entry['total_ms'] / entry['calls'], 3),
+                'max_ms': round(entry['max_ms'], 3),
+                'rows': entry['rows'],
+                'callers': dict(entry['callers']),
+                'histogram': {label: count for label, count in zip(labels, entry['histogram']) if count},
+            } for sql, entry in entries[:limit]]
+        return summary
+    
+    def format_report(self, limit=20):
+        """Render report() as text for the log or a terminal."""
+        lines = [f"{'calls':>8} {'total ms':>10} {'mean ms':>9} {'max ms':>9} {'rows':>9}  statement / callers"]
+        for entry in self.report(limit):
+            lines.append(f"{entry['calls']:>8} {entry['total_ms']:>10.1f} {entry['mean_ms']:>9.3f} "
+                         f"{entry['max_ms']:>9.1f} {entry['rows']:>9}  {entry['sql'][:100]}")
+            lines.append(' ' * 50 + ', '.join(f"{name} x{count}" for name, count in entry['callers'].items()))
+        return '\n'.join(lines)
+    
+    def close(self):
+        """Write the statement summary to the log and close it."""
+        if self.log_path and self.stats:
+            self._write(f"{datetime.now():%Y-%m-%d %H:%M:%S}  query summary\n{self.format_report()}\n\n")
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+
+class ProfiledCursor(sqlite3.Cursor):
+    """
+    Cursor that reports execute/executemany calls to a QueryProfiler.
+    
+    Used for transaction blocks while profiling. Only the statement step
+    is timed; rows fetched from the cursor afterwards are not.
+    """
+    
+    profiler = None
+    
+    def execute(self, sql, parameters=()):
+        """Run one statement and report it."""
+        start = time.perf_counter()
+        super().execute(sql, parameters)
+        self.profiler.record(self.connection, sql, parameters, time.perf_counter() - start, self.rowcount)
+        return self
+    
+    def executemany(self, sql, seq_of_parameters):
+        """Run a statement for every parameter set and report it once."""
+        start = time.perf_counter()
+        super().executemany(sql, seq_of_parameters)
+        self.profiler.record(self.connection, sql, None, time.perf_counter() - start, self.rowcount)
+        return self
+
+
+class DatabaseManager:
+    """
+    Shared data-access layer for the shop database.
+    
+    Owns one long-lived SQLite connection per thread instead of opening and
+    closing a connection for every query. Each connection keeps its own
+    prepared-statement cache, so the fixed SQL strings used by the
+    application are only compiled once per thread, and is configured from
+    a storage profile (see STORAGE_PROFILES) when it is opened. An
+    optional QueryProfiler times every statement run through it.
+    """
+    
+    def __init__(self, db_name, statement_cache_size=256, storage_profile=DEFAULT_STORAGE_PROFILE,
+                 profiler=None):
+        """
+        Create the manager without opening any connection yet.
+        
+        Args:
+            db_name: Path of the SQLite database file
+            statement_cache_size: Prepared statements kept per connection
+            storage_profile: Name from STORAGE_PROFILES, or a dict of
+                settings overriding the default profile
+            profiler: QueryProfiler to report statements to (None disables it)
+        """
+        self.db_name = db_name
+        self.profiler = profiler
+        self.statement_cache_size = statement_cache_size
+        if isinstance(storage_profile, str):
+            self.storage_profile = dict(STORAGE_PROFILES[storage_profile])
+        else:
+            self.storage_profile = dict(STORAGE_PROFILES[DEFAULT_STORAGE_PROFILE], **storage_profile)
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+    
+    def get_connection(self):
+        """
+        Return the calling thread's connection, opening it on first use.
+        
+        Returns:
+            sqlite3.Connection: Connection owned by the current thread
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Connections never cross threads; check_same_thread is only
+            # disabled so close() can release them from the main thread.
+            conn = sqlite3.connect(self.db_name,
+                                   cached_statements=self.statement_cache_size,
+                                   check_same_thread=False)
+            self.apply_storage_profile(conn)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+    
+    def apply_storage_profile(self, conn):
+        """
+        Apply the storage profile PRAGMAs to a freshly opened connection.
+        
+        Args:
+            conn: Connection to configure
+        """
+        profile = self.storage_profile
+        conn.execute(f"PRAGMA busy_timeout = {int(profile['busy_timeout'])}")
+        conn.execute(f"PRAGMA journal_mode = {profile['journal_mode']}")
+        conn.execute(f"PRAGMA synchronous = {profile['synchronous']}")
+        conn.execute(f"PRAGMA cache_size = {int(profile['cache_size'])}")
+        conn.execute(f"PRAGMA mmap_size = {int(profile['mmap_size'])}")
+        conn.execute(f"PRAGMA temp_store = {profile['temp_store']}")
+        conn.execute(f"PRAGMA wal_autocheckpoint = {int(profile['wal_autocheckpoint'])}")
+        conn.execute(f"PRAGMA journal_size_limit = {int(profile['journal_size_limit'])}")
+    
+    def checkpoint(self, mode='PASSIVE'):
+        """
+        Copy committed WAL frames back into the main database file.
+        
+        Args:
+            mode: PASSIVE, FULL, RESTART or TRUNCATE
+        
+        Returns:
+            tuple: (busy, wal_frames, checkpointed_frames), or None when the
+            database is not in WAL mode
+        """
+        if self.fetchvalue("PRAGMA journal_mode").lower() != 'wal':
+            return None
+        return self.fetchone(f"PRAGMA wal_checkpoint({mode})")
+    
+    def execute(self, query, params=()):
+        """
+        Execute a single statement on the thread's connection.
+        
+        Returns:
+            sqlite3.Cursor: Cursor positioned on the statement results
+        """
+        conn = self.get_connection()
+        if self.profiler is None:
+            return conn.execute(query, params)
+        start = time.perf_counter()
+        cursor = conn.execute(query, params)
+        self.profiler.record(conn, query, params, time.perf_counter() - start, cursor.rowcount)
+        return cursor
+    
+    def executemany(self, query, seq_of_params):
+        """Execute a statement against every parameter tuple in the sequence."""
+        conn = self.get_connection()
+        if self.profiler is None:
+            return conn.executemany(query, seq_of_params)
+        start = time.perf_counter()
+        cursor = conn.executemany(query, seq_of_params)
+        self.profiler.record(conn, query, None, time.perf_counter() - start, cursor.rowcount)
+        return cursor
+    
+    def _query(self, query, params, fetch):
+        """Run a query and fetch its rows, timing both when profiling."""
+        conn = self.get_connection()
+        if self.profiler is None:
+            return fetch(conn.execute(query, params))
+        start = time.perf_counter()
+        result = fetch(conn.execute(query, params))
+        rows = len(result) if isinstance(result, list) else int(result is not None)
+        self.profiler.record(conn, query, params, time.perf_counter() - start, rows)
+        return result
+    
+    def fetchone(self, query, params=()):
+        """Execute a query and return its first row (or None)."""
+        return self._query(query, params, sqlite3.Cursor.fetchone)
+    
+    def fetchall(self, query, params=()):
+        """Execute a query and return all rows."""
+        return self._query(query, params, sqlite3.Cursor.fetchall)
+    
+    def fetchvalue(self, query, params=(), default=None):
+        """Execute a query and return the first column of its first row."""
+        row = self._query(query, params, sqlite3.Cursor.fetchone)
+        return row[0] if row is not None else default
+    
+    @contextmanager
+    def transaction(self, immediate=False):
+        """
+        Run a block of writes as one transaction.
+        
+        Commits when the block finishes and rolls back if it raises. The
+        transaction is opened explicitly so schema statements are covered
+        too; a block nested inside another transaction joins the outer one.
+        
+        Args:
+            immediate: Take the write lock up front (BEGIN IMMEDIATE) so a
+                read-check-write block waits on busy_timeout instead of
+                failing when another connection writes first
+        
+        Yields:
+            sqlite3.Cursor: Cursor bound to the thread's connection
+        """
+        conn = self.get_connection()
+        if self.profiler is None:
+            cursor = conn.cursor()
+        else:
+            cursor = conn.cursor(ProfiledCursor)
+            cursor.profiler = self.profiler
+        if conn.in_transaction:
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+            return
+        
+        cursor.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+        try:
+            yield cursor
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+    
+    def create_schema(self):
+        """Create the base tables if needed and bring the schema up to date."""
+        with self.transaction() as cursor:
+            for statement in SCHEMA_TABLES:
+                cursor.execute(statement)
+        self.migrate()
+        self.restore_triggers()
+    
+    def migrate(self):
+        """
+        Apply every migration newer than the database's user_version.
+        
+        Each migration runs in its own transaction together with the
+        user_version bump. Planner statistics are refreshed afterwards so
+        new indexes are picked up immediately.
+        
+        Returns:
+            list: Versions that were applied
+        """
+        current_version = self.fetchvalue("PRAGMA user_version")
+        applied = []
+        
+        for version, description, statements in SCHEMA_MIGRATIONS:
+            if version <= current_version:
+                continue
+            with self.transaction() as cursor:
+                for statement in statements:
+                    cursor.execute(statement)
+                cursor.execute(f"PRAGMA user_version = {int(version)}")
+            applied.append(version)
+        
+        if applied:
+            self.execute("ANALYZE")
+        return applied
+    
+    def rebuild_search_index(self):
+        """Repopulate the FTS5 search tables from the base tables."""
+        with self.transaction() as cursor:
+            for statement in SEARCH_INDEX_REBUILD:
+                cursor.execute(statement)
+    
+    def rebuild_dashboard_stats(self):
+        """Recompute the materialized dashboard KPIs from the base tables."""
+        with self.transaction() as cursor:
+            cursor.execute(DASHBOARD_STATS_REBUILD)
+    
+    def dashboard_stats(self):
+        """
+        Read every dashboard KPI in one query.
+        
+        The materialized DashboardStats row is used when present, so the
+        cost does not grow with order volume; otherwise the KPIs are
+        computed from the base tables in a single snapshot query.
+        
+        Returns:
+            dict: Values keyed by DASHBOARD_STATS_COLUMNS
+        """
+        try:
+            row = self.fetchone(
+                f"SELECT {', '.join(DASHBOARD_STATS_COLUMNS)} FROM DashboardStats WHERE stat_id = 1")
+        except sqlite3.OperationalError:
+            # Database predates migration 3
+            row = None
+        if row is None:
+            row = self.fetchone(DASHBOARD_STATS_SNAPSHOT)
+        return dict(zip(DASHBOARD_STATS_COLUMNS, row))
+    
+    def restore_triggers(self):
+        """
+        Recreate derived-data triggers that are missing and resync their data.
+        
+        A bulk load that was killed before it finished leaves its triggers
+        dropped; this puts them back the next time the schema is opened.
+        Costs one sqlite_master read when nothing is missing.
+        
+        Returns:
+            list: Names of the triggers that were recreated
+        """
+        version = self.fetchvalue("PRAGMA user_version")
+        existing = {row[0] for row in self.fetchall("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+        missing = [(triggers, rebuild) for since, triggers, rebuild in DERIVED_DATA_TRIGGERS
+                   if since <= version and any(name not in existing for name, _ in triggers)]
+        if not missing:
+            return []
+        
+        restored = []
+        with self.transaction() as cursor:
+            for triggers, rebuild in missing:
+                for name, ddl in triggers:
+                    if name not in existing:
+                        cursor.execute(ddl)
+                        restored.append(name)
+                for statement in rebuild:
+                    cursor.execute(statement)
+        return restored
+    
+    @contextmanager
+    def bulk_load(self):
+        """
+        Suspend the derived-data triggers while loading many rows.
+        
+        Row-by-row FTS5 updates from triggers get slower as the index
+        grows, so bulk loaders drop the search, dashboard and catalog
+        triggers, write their rows and let this context manager recreate
+        the triggers, rebuild the index and recompute the KPIs afterwards.
+        
+        Offline use only: the triggers are dropped for the whole database,
+        so writes from other connections during the load reach search and
+        the KPIs only at the final rebuild. If the process dies mid-load,
+        restore_triggers() repairs the schema on the next open.
+        """
+        with self.transaction() as cursor:
+            for _, triggers, _ in DERIVED_DATA_TRIGGERS:
+                for name, _ in triggers:
+                    cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        try:
+            yield
+        finally:
+            with self.transaction() as cursor:
+                for _, triggers, rebuild in DERIVED_DATA_TRIGGERS:
+                    for _, ddl in triggers:
+                        cursor.execute(ddl)
+                    for statement in rebuild:
+                        cursor.execute(statement)
+    
+    def _available_stock(self, cursor, product_id, held=0):
+        """
+        Units of a product that are on hand and not held by another cart.
+        
+        Args:
+            cursor: Cursor of the open transaction
+            product_id: Product to check
+            held: Units reserved by the caller's own session
+        
+        Returns:
+            int: Available units (0 when the product has no Inventory row)
+        """
+        row = cursor.execute("SELECT quantity - reserved FROM Inventory WHERE product_id = ?",
+                             (product_id,)).fetchone()
+        return max((row[0] + held) if row else 0, 0)
+    
+    def reserve_stock(self, session_id, product_id, quantity):
+        """
+        Hold units of a product for an open cart.
+        
+        The check and the hold are one conditional UPDATE, so two terminals
+        can never reserve the same last unit.
+        
+        Args:
+            session_id: Cart session holding the stock
+            product_id: Product to hold
+            quantity: Additional units to hold
+        
+        Raises:
+            InsufficientStockError: Fewer than `quantity` units are available
+        """
+        with self.transaction(immediate=True) as cursor:
+            cursor.execute('''
+                UPDATE Inventory SET reserved = reserved + ?
+                WHERE product_id = ? AND quantity - reserved >= ?
+            ''', (quantity, product_id, quantity))
+            if cursor.rowcount == 0:
+                raise InsufficientStockError(product_id, quantity, self._available_stock(cursor, product_id))
+            
+            cursor.execute('''
+                INSERT INTO StockReservations (session_id, product_id, quantity) VALUES (?, ?, ?)
+                ON CONFLICT (session_id, product_id) DO UPDATE SET
+                    quantity = quantity + excluded.quantity
+            ''', (session_id, product_id, quantity))
+            # Any change to the cart shows all of its lines are still live
+            self.touch_reservations(session_id)
+    
+    def release_stock(self, session_id, product_id=None, quantity=None):
+        """
+        Return a cart's held units to available stock.
+        
+        Args:
+            session_id: Cart session holding the stock
+            product_id: Only release this product (default: every product)
+            quantity: Only release this many units (default: all held)
+        
+        Returns:
+            int: Units released
+        """
+        query = "SELECT product_id, quantity FROM StockReservations WHERE session_id = ?"
+        params = [session_id]
+        if product_id is not None:
+            query += " AND product_id = ?"
+            params.append(product_id)
+        
+        with self.transaction(immediate=True) as cursor:
+            released = [(held if quantity is None else min(quantity, held), pid)
+                        for pid, held in cursor.execute(query, params).fetchall()]
+            cursor.executemany("UPDATE Inventory SET reserved = MAX(reserved - ?, 0) WHERE product_id = ?",
+                               released)
+            cursor.executemany('''
+                UPDATE StockReservations SET quantity = quantity - ?
+                WHERE session_id = ? AND product_id = ?
+            ''', [(units, session_id, pid) for units, pid in released])
+            cursor.execute("DELETE FROM StockReservations WHERE session_id = ? AND quantity <= 0",
+                           (session_id,))
+            self.touch_reservations(session_id)
+        
+        return sum(units for units, _ in released)
+    
+    def touch_reservations(self, session_id):
+        """
+        Mark every reservation of a cart as current.
+        
+        release_stale_reservations() measures age from this timestamp, so
+        an open cart calls this regularly to keep its holds.
+        
+        Args:
+            session_id: Cart session holding the stock
+        
+        Returns:
+            int: Reservations refreshed
+        """
+        with self.transaction() as cursor:
+            cursor.execute("UPDATE StockReservations SET reserved_at = CURRENT_TIMESTAMP WHERE session_id = ?",
+                           (session_id,))
+            return cursor.rowcount
+    
+    def release_stale_reservations(self, max_age_minutes=RESERVATION_TTL_MINUTES):
+        """
+        Return stock held by carts that were abandoned without checkout.
+        
+        Args:
+            max_age_minutes: Time since a reservation was last refreshed
+                after which it counts as abandoned
+        
+        Returns:
+            int: Reservations released
+        """
+        cutoff = f"-{int(max_age_minutes)} minutes"
+        with self.transaction(immediate=True) as cursor:
+            cursor.execute('''
+                UPDATE Inventory SET reserved = MAX(reserved - (
+                    SELECT SUM(r.quantity) FROM StockReservations r
+                    WHERE r.product_id = Inventory.product_id
+                      AND r.reserved_at < datetime('now', :cutoff)
+                ), 0)
+                WHERE product_id IN (
+                    SELECT product_id FROM StockReservations
+                    WHERE reserved_at < datetime('now', :cutoff)
+                )
+            ''', {'cutoff': cutoff})
+            cursor.execute("DELETE FROM StockReservations WHERE reserved_at < datetime('now', ?)",
+                           (cutoff,))
+            return cursor.rowcount
+    
+    def place_order(self, customer_id, employee_id, items, status, payment_method, session_id=None):
+        """
+        Save an order with all its lines and stock decrements atomically.
+        
+        Stock is taken with a conditional decrement (the row only changes
+        while enough units are available), so concurrent checkouts cannot
+        oversell. If any product is short nothing is written. Units the
+        session reserved for the cart count as available to it and are
+        consumed by the order.
+        
+        Args:
+            customer_id: Ordering customer
+            employee_id: Employee recording the sale
+            items: Dicts with product_id, quantity, unit_price and subtotal
+            status: Order status
+            payment_method: Payment method
+            session_id: Cart session whose reservations the order consumes
+        
+        Returns:
+            int: The new order_id
+        
+        Raises:
+            InsufficientStockError: A product does not have enough stock
+        """
+        total = sum(item['subtotal'] for item in items)
+        
+        # A product can appear on several lines; take its summed quantity once
+        taken = {}
+        for item in items:
+            taken[item['product_id']] = taken.get(item['product_id'], 0) + item['quantity']
+        
+        with self.transaction(immediate=True) as cursor:
+            held = {}
+            if session_id is not None:
+                held = dict(cursor.execute(
+                    "SELECT product_id, quantity FROM StockReservations WHERE session_id = ?",
+                    (session_id,)).fetchall())
+            
+            decrements = [(quantity, min(quantity, held.get(product_id, 0)), product_id)
+                          for product_id, quantity in sorted(taken.items())]
+            cursor.executemany('''
+                UPDATE Inventory SET quantity = quantity - ?1, reserved = reserved - ?2
+                WHERE product_id = ?3 AND quantity - reserved + ?2 >= ?1
+            ''', decrements)
+            if cursor.rowcount != len(decrements):
+                # Something was short; find what for the message. Raising rolls back.
+                for quantity, own, product_id in decrements:
+                    available = self._available_stock(cursor, product_id, own)
+                    if available < quantity:
+                        raise InsufficientStockError(product_id, quantity, available)
+                raise InsufficientStockError(decrements[0][2], decrements[0][0], 0)
+            
+            cursor.execute('''
+                INSERT INTO Orders (customer_id, employee_id, total_amount, status, payment_method)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (customer_id, employee_id, total, status, payment_method))
+            order_id = cursor.lastrowid
+            
+            cursor.executemany('''
+                INSERT INTO OrderDetails (order_id, product_id, quantity, unit_price, subtotal)
+                VALUES (?, ?, ?, ?, ?)
+            ''', [(order_id, item['product_id'], item['quantity'], item['unit_price'], item['subtotal'])
+                  for item in items])
+            
+            if held:
+                cursor.executemany('''
+                    UPDATE StockReservations SET quantity = quantity - ?
+                    WHERE session_id = ? AND product_id = ?
+                ''', [(own, session_id, product_id) for _, own, product_id in decrements if own])
+                cursor.execute("DELETE FROM StockReservations WHERE session_id = ? AND quantity <= 0",
+                               (session_id,))
+        
+        return order_id
+    
+    def restock_low_stock(self, policy='min_plus', **options):
+        """
+        Top up every low-stock item to its policy target in one statement.
+        
+        Args:
+            policy: Key of RESTOCK_POLICIES
+            **options: Overrides for the policy's default parameters
+        
+        Returns:
+            list: (inventory_id, product_id, new_quantity) for each restocked row
+        
+        Raises:
+            ValueError: If the policy or an option name is unknown
+        """
+        if policy not in RESTOCK_POLICIES:
+            raise ValueError(f"Unknown restock policy: {policy}")
+        target, defaults, setup = RESTOCK_POLICIES[policy]
+        unknown = set(options) - set(defaults)
+        if unknown:
+            raise ValueError(f"Unknown options for {policy}: {', '.join(sorted(unknown))}")
+        params = {**defaults, **options}
+        
+        with self.transaction() as cursor:
+            for statement in setup:
+                cursor.execute(statement, params)
+            cursor.execute(f'''
+                UPDATE Inventory
+                SET quantity = {target}, last_restocked = CURRENT_DATE
+                WHERE quantity < min_stock_level AND {target} > quantity
+                RETURNING inventory_id, product_id, quantity
+            ''', params)
+            return cursor.fetchall()
+    
+    def optimize(self):
+        """Let SQLite refresh statistics for tables whose indexes were used."""
+        self.execute("PRAGMA optimize")
+    
+    def close(self):
+        """Optimize, checkpoint the WAL according to the profile and close every connection."""
+        try:
+            self.optimize()
+        except sqlite3.Error:
+            pass
+        if self.storage_profile['checkpoint_on_close']:
+            try:
+                self.checkpoint(self.storage_profile['checkpoint_on_close'])
+            except sqlite3.Error:
+                # Another terminal may still be reading; its own close will
+                # finish the checkpoint.
+                pass
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+        if self.profiler is not None:
+            self.profiler.close()
+
+
+class TaskRunner:
+    """
+    Runs blocking work off the Tk thread and hands the results back to it.
+    
+    Work goes to a named lane: a single worker thread (and so a single
+    database connection) that runs its tasks in order. Button handlers use
+    the 'db' lane; searches and dashboard polls get lanes of their own so
+    they never queue behind a large write. Workers only put finished
+    futures on a queue. The Tk thread drains it with root.after while
+    anything is outstanding and schedules each task's callback as its own
+    after() call, so widgets are only ever touched from the Tk thread.
+    Tasks submitted with a busy message drive the busy indicator until
+    they finish.
+    """
+    
+    def __init__(self, root, on_busy=None, poll_ms=TASK_POLL_MS):
+        """
+        Args:
+            root: Tk root window used for polling and result delivery
+            on_busy: Called on the Tk thread with the latest busy message,
+                or None when no busy task is left
+            poll_ms: Interval between queue checks while tasks are outstanding
+        """
+        self.root = root
+        self.on_busy = on_busy
+        self.poll_ms = poll_ms
+        self._lanes = {}
+        self._results = queue.Queue()
+        self._pending = 0
+        self._busy = []
+        self._keys = set()
+        self._after_id = None
+        self._closed = False
+    
+    def submit(self, func, *args, on_done=None, on_error=None, busy=None, key=None, lane='db'):
+        """
+        Run func(*args) on a worker lane.
+        
+        Args:
+            func: Blocking callable; must not touch any widget
+            *args: Arguments for func
+            on_done: Called on the Tk thread with func's return value
+            on_error: Called on the Tk thread with the exception func raised
+                (default: Tk's report_callback_exception)
+            busy: Message shown by the busy indicator while the task runs
+            key: Ignore this submission while a task with the same key is
+                outstanding, e.g. a second click on a save button
+            lane: Worker lane name
+        
+        Returns:
+            concurrent.futures.Future, or None if the task was ignored
+        """
+        if self._closed or (key is not None and key in self._keys):
+            return None
+        executor = self._lanes.get(lane)
+        if executor is None:
+            executor = self._lanes[lane] = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f'shop-{lane}')
+        
+        future = executor.submit(func, *args)
+        self._pending += 1
+        if key is not None:
+            self._keys.add(key)
+        if busy:
+            self._busy.append(busy)
+            self._show_busy()
+        # Runs on the worker thread: only the thread-safe queue is touched
+        future.add_done_callback(lambda f: self._results.put((f, on_done, on_error, busy, key)))
+        if self._after_id is None:
+            self._after_id = self.root.after(self.poll_ms, self._poll)
+        return future
+    
+    @property
+    def busy(self):
+        """Whether any task with a busy message is outstanding."""
+        return bool(self._busy)
+    
+    def _poll(self):
+        """Tk side: hand finished tasks to their callbacks."""
+        self._after_id = None
+        while True:
+            try:
+                future, on_done, on_error, busy, key = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending -= 1
+            self._keys.discard(key)
+            if busy:
+                self._busy.remove(busy)
+                self._show_busy()
+            if future.cancelled():
+                continue
+            error = future.exception()
+            if error is None:
+                if on_done is not None:
+                    self.root.after(0, on_done, future.result())
+            elif on_error is not None:
+                self.root.after(0, on_error, error)
+            else:
+                self.root.after(0, self.root.report_callback_exception, type(error), error, error.__traceback__)
+        if self._pending and not self._closed:
+            self._after_id = self.root.after(self.poll_ms, self._poll)
+    
+    def _show_busy(self):
+        """Tell the busy indicator about the latest outstanding busy task."""
+        if self.on_busy is not None:
+            self.on_busy(self._busy[-1] if self._busy else None)
+    
+    def shutdown(self):
+        """Drop queued tasks, wait for running ones and stop the workers."""
+        self._closed = True
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except tk.TclError:
+                # The window is already gone
+                pass
+            self._after_id = None
+        for executor in self._lanes.values():
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+class SearchScheduler:
+    """
+    Debounced, cancellable search for one search box.
+    
+    Keystrokes only restart a short timer. When the timer fires, the input
+    is read on the Tk thread and the query runs on the TaskRunner's
+    'search' lane. Every new keystroke bumps a generation counter: queued
+    work for an older generation is skipped, a query still running for it
+    is interrupted, and its rows are dropped instead of being shown. Only
+    the latest result is rendered.
+    """
+    
+    def __init__(self, root, db, runner, read_input, query, render, delay_ms=250):
+        """
+        Args:
+            root: Tk root window used for timers
+            db: DatabaseManager the query runs against
+            runner: TaskRunner shared by the search boxes
+            read_input: Called on the Tk thread; returns the query arguments
+            query: Called on the worker thread with those arguments; returns rows
+            render: Called on the Tk thread with the rows of the latest search
+            delay_ms: Quiet period after the last keystroke before searching
+        """
+        self.root = root
+        self.db = db
+        self.runner = runner
+        self.read_input = read_input
+        self.query = query
+        self.render = render
+        self.delay_ms = delay_ms
+        self._generation = 0
+        self._after_id = None
+        self._running_conn = None
+        self._lock = threading.Lock()
+    
+    def schedule(self, delay_ms=None):
+        """
+        Restart the debounce timer; bind this to the entry's <KeyRelease>.
+        
+        Args:
+            delay_ms: Override for the quiet period (0 searches right away)
+        """
+        self.cancel()
+        delay = self.delay_ms if delay_ms is None else delay_ms
+        self._after_id = self.root.after(delay, self._start, self._generation)
+    
+    def cancel(self):
+        """Forget any pending or running search, e.g. before a full reload."""
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        with self._lock:
+            self._generation += 1
+            if self._running_conn is not None:
+                self._running_conn.interrupt()
+    
+    def _start(self, generation):
+        """Read the input on the Tk thread and hand the query to the worker."""
+        self._after_id = None
+        args = self.read_input()
+        self.runner.submit(self._run_query, generation, args, lane='search',
+                           on_done=lambda rows: self._deliver(generation, rows),
+                           on_error=lambda error: self._failed(generation, error))
+    
+    def _run_query(self, generation, args):
+        """Worker side: skip stale work, otherwise run the query."""
+        with self._lock:
+            if generation != self._generation:
+                return None
+            self._running_conn = self.db.get_connection()
+        try:
+            return self.query(*args)
+        finally:
+            with self._lock:
+                self._running_conn = None
+    
+    def _deliver(self, generation, rows):
+        """Tk side: render the rows unless a newer search has started."""
+        if generation == self._generation and rows is not None:
+            self.render(rows)
+    
+    def _failed(self, generation, error):
+        """Tk side: ignore a search interrupted by a newer keystroke; report any other failure."""
+        superseded = generation != self._generation
+        if superseded and isinstance(error, sqlite3.OperationalError) and str(error) == 'interrupted':
+            return
+        raise error
+
+
+class DashboardRefresher:
+    """
+    Keeps the dashboard current while it is on screen.
+    
+    Every interval a worker thread reads PRAGMA data_version, which changes
+    whenever another connection (the UI thread's own connection or another
+    terminal on the same database file) commits. Only when it has changed
+    are the KPIs and recent orders recomputed, still on the worker, and
+    handed back to the Tk thread for display. Idle polls cost one pragma.
+    Polls run on the TaskRunner's 'dashboard' lane.
+    """
+    
+    def __init__(self, root, db, runner, query, render, interval_ms=DASHBOARD_REFRESH_MS,
+                 on_change=None):
+        """
+        Args:
+            root: Tk root window used for timers
+            db: DatabaseManager to poll
+            runner: TaskRunner the polls and queries run on
+            query: Called on the worker thread; returns the dashboard data
+            render: Called on the Tk thread with that data
+            interval_ms: Delay between change checks (0 disables polling)
+            on_change: Called on the worker thread whenever a change is seen
+        """
+        self.root = root
+        self.db = db
+        self.runner = runner
+        self.query = query
+        self.render = render
+        self.interval_ms = interval_ms
+        self.on_change = on_change
+        self._after_id = None
+        self._running = False
+        self._data_version = None
+        self._force = False
+    
+    def start(self):
+        """Refresh right away, then keep polling until stop() is called."""
+        self.stop()
+        self._running = True
+        self._force = True
+        self._after_id = self.root.after(0, self._poll)
+    
+    def stop(self):
+        """Stop polling; a poll already on the worker is discarded."""
+        self._running = False
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except tk.TclError:
+                # The window is already gone
+                pass
+            self._after_id = None
+    
+    def _poll(self):
+        """Tk side: hand one change check to the worker."""
+        self._after_id = None
+        self.runner.submit(self._check, on_done=self._deliver, on_error=self._failed, lane='dashboard')
+    
+    def _check(self):
+        """Worker side: recompute only if the database changed since the last check."""
+        data_version = self.db.fetchvalue("PRAGMA data_version")
+        changed = self._data_version is not None and data_version != self._data_version
+        if not changed and not self._force:
+            return None
+        self._data_version = data_version
+        self._force = False
+        if changed and self.on_change is not None:
+            self.on_change()
+        return self.query()
+    
+    def _deliver(self, data):
+        """Tk side: show fresh data and schedule the next poll."""
+        if not self._running:
+            return
+        if data is not None:
+            self.render(data)
+        if self.interval_ms:
+            self._after_id = self.root.after(self.interval_ms, self._poll)
+    
+    def _failed(self, error):
+        """Tk side: retry on the next poll when the database was locked or busy."""
+        if not isinstance(error, sqlite3.Error):
+            raise error
+        self._force = True
+        self._deliver(None)
+
+
+class TimedCallWrapper(tk.CallWrapper):
+    """
+    Tk callback wrapper that reports each call to the running EventLoopMonitor.
+    
+    Installed in place of tkinter.CallWrapper by EventLoopMonitor.arm()
+    or start(), so every command, binding and after() callback registered
+    from then on is timed while a monitor runs. With none running, calls
+    are passed straight through.
+    """
+    
+    monitor = None
+    
+    def __call__(self, *args):
+        """Apply SUBST, then call FUNC under the monitor's clock."""
+        monitor = TimedCallWrapper.monitor
+        try:
+            if self.subst:
+                args = self.subst(*args)
+            if monitor is None:
+                return self.func(*args)
+            frame = monitor.callback_started()
+            try:
+                return self.func(*args)
+            finally:
+                monitor.callback_finished(frame, self.func, args)
+        except SystemExit:
+            raise
+        except Exception:
+            self.widget._report_exception()
+
+
+class EventLoopMonitor:
+    """
+    Measures how long the Tk event loop is kept busy, and by which handler.
+    
+    Every Tk callback is timed through TimedCallWrapper. A callback that
+    opens a nested event loop (a message box, wait_window) is only charged
+    for the stretches in which nothing else could run, so a dialog left
+    open is not a stall. A heartbeat scheduled with after() measures how
+    late the loop gets back to it, which also catches stalls that no single
+    handler explains (redraws, geometry passes). Stalls of STALL_MS or
+    more are kept, optionally logged, and shown with the loop lag in an
+    overlay toggled with F12.
+    """
+    
+    def __init__(self, root, stall_ms=STALL_MS, heartbeat_ms=HEARTBEAT_MS, log_path=None,
+                 overlay_key='<F12>'):
+        """
+        Args:
+            root: Tk root window
+            stall_ms: Busy stretches at least this long count as stalls
+            heartbeat_ms: Interval between heartbeats
+            log_path: File stalls are appended to (None keeps them in memory)
+            overlay_key: Key sequence that toggles the overlay (None for none)
+        """
+        self.root = root
+        self.stall_ms = stall_ms
+        self.heartbeat_ms = heartbeat_ms
+        self.log_path = log_path
+        self.overlay_key = overlay_key
+        self.lags = deque(maxlen=LAG_HISTORY)
+        self.handlers = {}
+        self.worst = []
+        self.stall_count = 0
+        self._stack = []
+        self._names = {}
+        self._stalled_since_beat = False
+        self._due = None
+        self._after_id = None
+        self._previous_wrapper = None
+        self._overlay = None
+        self._overlay_after_id = None
+        self._log = None
+    
+    @classmethod
+    def from_environment(cls, root):
+        """
+        Build the window's monitor, running from startup only when asked to.
+        
+        MONITOR_ENV (or STALL_LOG_ENV, which also names the stall log)
+        starts it right away; otherwise it is armed and starts on the first
+        press of the overlay key.
+        
+        Returns:
+            EventLoopMonitor: The started or armed monitor
+        """
+        monitor = cls(root, log_path=os.environ.get(STALL_LOG_ENV))
+        if os.environ.get(MONITOR_ENV) or monitor.log_path:
+            monitor.start()
+        else:
+            monitor.arm()
+        return monitor
+    
+    def _install_wrapper(self):
+        """Make Tk wrap callbacks registered from now on in TimedCallWrapper."""
+        if tk.CallWrapper is not TimedCallWrapper:
+            self._previous_wrapper = tk.CallWrapper
+            tk.CallWrapper = TimedCallWrapper
+    
+    def arm(self):
+        """
+        Start on the first press of the overlay key instead of right away.
+        
+        Until then nothing is measured. TimedCallWrapper is installed now
+        but passes calls straight through while no monitor runs, so the
+        commands and bindings created from here on can be timed once the
+        monitor starts.
+        """
+        self._install_wrapper()
+        if self.overlay_key:
+            self.root.bind_all(self.overlay_key, self._start_from_key)
+    
+    def _start_from_key(self, event=None):
+        """Overlay key of an armed monitor: start measuring and show the overlay."""
+        self.start()
+        self.toggle_overlay()
+    
+    def start(self):
+        """Time callbacks registered since arm() or from now on, and start the heartbeat."""
+        self._install_wrapper()
+        TimedCallWrapper.monitor = self
+        if self.overlay_key:
+            self.root.bind_all(self.overlay_key, self.toggle_overlay)
+        self._due = time.perf_counter() + self.heartbeat_ms / 1000
+        self._after_id = self.root.after(self.heartbeat_ms, self._heartbeat)
+    
+    def stop(self):
+        """Stop the heartbeat, restore Tk's callback wrapper and close the log."""
+        for after_id in (self._after_id, self._overlay_after_id):
+            if after_id is not None:
+                try:
+                    self.root.after_cancel(after_id)
+                except tk.TclError:
+                    # The window is already gone
+                    pass
+        self._after_id = self._overlay_after_id = None
+        if TimedCallWrapper.monitor is self:
+            TimedCallWrapper.monitor = None
+        if self._previous_wrapper is not None:
+            tk.CallWrapper = self._previous_wrapper
+            self._previous_wrapper = None
+        if self._log is not None:
+            self._log.write(f"{datetime.now():%Y-%m-%d %H:%M:%S}  session summary\n{self.format_summary()}\n\n")
+            self._log.close()
+            self._log = None
+    
+    def callback_started(self):
+        """
+        Note that a callback is starting.
+        
+        Returns:
+            list: Timing frame to hand back to callback_finished
+        """
+        now = time.perf_counter()
+        if self._stack:
+            # A nested event loop is running: the outer callback is waiting
+            self._close_segment(self._stack[-1], now)
+        frame = [now, 0.0, 0.0]     # segment start, longest segment, busy time
+        self._stack.append(frame)
+        return frame
+    
+    def callback_finished(self, frame, func, args):
+        """
+        Account a callback that has returned.
+        
+        Args:
+            frame: Value returned by callback_started
+            func: The callback
+            args: Arguments it was called with (the event for bindings)
+        """
+        now = time.perf_counter()
+        self._stack.pop()
+        self._close_segment(frame, now)
+        if self._stack:
+            self._stack[-1][0] = now
+        func = self._unwrap_after(func)
+        if getattr(func, '__self__', None) is self:
+            # The monitor's own heartbeat and overlay
+            return
+        
+        name = self.handler_name(func, args)
+        longest_ms = frame[1] * 1000
+        stats = self.handlers.get(name)
+        if stats is None:
+            stats = self.handlers[name] = {'calls': 0, 'busy_ms': 0.0, 'max_ms': 0.0}
+        stats['calls'] += 1
+        stats['busy_ms'] += frame[2] * 1000
+        stats['max_ms'] = max(stats['max_ms'], longest_ms)
+        if longest_ms >= self.stall_ms:
+            self._stall(longest_ms, name)
+    
+    @staticmethod
+    def _unwrap_after(func):
+        """Return the function an after() callback runs instead of Tk's wrapper closure."""
+        code = getattr(func, '__code__', None)
+        if code is not None and code.co_name == 'callit' and 'func' in code.co_freevars:
+            return func.__closure__[code.co_freevars.index('func')].cell_contents
+        return func
+    
+    @staticmethod
+    def _close_segment(frame, now):
+        """End the current busy stretch of a timing frame."""
+        segment = now - frame[0]
+        frame[1] = max(frame[1], segment)
+        frame[2] += segment
+    
+    def handler_name(self, func, args):
+        """
+        Name a callback for the statistics.
+        
+        Methods are named by their qualified name, lambdas additionally by
+        line, and event bindings by the event type they handled.
+        """
+        code = getattr(func, '__code__', None)
+        name = self._names.get(code) if code is not None else None
+        if name is None:
+            name = getattr(func, '__qualname__', None) or repr(func)
+            if code is not None:
+                if code.co_name == '<lambda>':
+                    name = f"{name} (line {code.co_firstlineno})"
+                self._names[code] = name
+        if args and isinstance(args[0], tk.Event):
+            event_type = args[0].type
+            name = f"{name} <{getattr(event_type, 'name', event_type)}>"
+        return name
+    
+    def _heartbeat(self):
+        """Record how late the loop came back to the heartbeat and reschedule it."""
+        now = time.perf_counter()
+        lag_ms = max(0.0, (now - self._due) * 1000)
+        self.lags.append(lag_ms)
+        if lag_ms >= self.stall_ms and not self._stalled_since_beat:
+            self._stall(lag_ms, "(event loop: no single handler)")
+        self._stalled_since_beat = False
+        self._due = now + self.heartbeat_ms / 1000
+        self._after_id = self.root.after(self.heartbeat_ms, self._heartbeat)
+    
+    def _stall(self, duration_ms, name):
+        """Keep a stall among the worst ones and log it."""
+        self.stall_count += 1
+        self._stalled_since_beat = True
+        stall = (round(duration_ms, 1), f"{datetime.now():%H:%M:%S}", name)
+        if len(self.worst) < WORST_STALLS:
+            heapq.heappush(self.worst, stall)
+        else:
+            heapq.heappushpop(self.worst, stall)
+        if self.log_path:
+            if self._log is None:
+                self._log = open(self.log_path, 'a', encoding='utf-8')
+            self._log.write(f"{datetime.now():%Y-%m-%d %H:%M:%S}  {duration_ms:.0f} ms  {name}\n")
+            self._log.flush()
+    
+    def summary(self):
+        """
+        Snapshot of the monitor's figures.
+        
+        Returns:
+            dict: lag_p50_ms, lag_p99_ms and lag_max_ms over the recent
+                heartbeats, stalls (count), worst (slowest first) and the
+                handlers with the longest single stretch
+        """
+        lags = sorted(self.lags)
+        slowest = sorted(self.handlers.items(), key=lambda item: item[1]['max_ms'], reverse=True)
+        return {
+            'lag_p50_ms': round(lags[len(lags) // 2], 1) if lags else 0.0,
+            'lag_p99_ms': round(lags[min(len(lags) - 1, int(len(lags) * 0.99))], 1) if lags else 0.0,
+            'lag_max_ms': round(lags[-1], 1) if lags else 0.0,
+            'stalls': self.stall_count,
+            'worst': sorted(self.worst, reverse=True),
+            'handlers': [(name, stats['calls'], round(stats['max_ms'], 1),
+                          round(stats['busy_ms'] / stats['calls'], 2)) for name, stats in slowest[:WORST_STALLS]],
+        }
+    
+    def format_summary(self):
+        """Render summary() as text for the overlay and the log."""
+        summary = self.summary()
+        lines = [
+            f"Event loop lag (last {len(self.lags) * self.heartbeat_ms // 1000} s): "
+            f"p50 {summary['lag_p50_ms']} ms  p99 {summary['lag_p99_ms']} ms  max {summary['lag_max_ms']} ms",
+            f"Stalls of {self.stall_ms} ms or more: {summary['stalls']}",
+            "Worst stalls:",
+        ]
+        lines.extend(f"  {ms:>7.0f} ms  {when}  {name}" for ms, when, name in summary['worst'])
+        lines.append("Slowest handlers (max ms / mean ms / calls):")
+        lines.extend(f"  {max_ms:>7.0f} {mean_ms:>8.2f} {calls:>6}  {name}"
+                     for name, calls, max_ms, mean_ms in summary['handlers'])
+        return '\n'.join(lines)
+    
+    def toggle_overlay(self, event=None):
+        """Show or hide the debug overlay in the window's top right corner."""
+        if self._overlay is not None:
+            if self._overlay_after_id is not None:
+                self.root.after_cancel(self._overlay_after_id)
+                self._overlay_after_id = None
+            self._overlay.destroy()
+            self._overlay = None
+            return
+        self._overlay = tk.Label(self.root, font=('Courier', 9), justify='left', anchor='nw',
+                                 bg='#1e1e1e', fg='#9cdc5c', padx=8, pady=6)
+        self._overlay.place(relx=1.0, rely=0.0, anchor='ne')
+        self._refresh_overlay()
+    
+    def _refresh_overlay(self):
+        """Redraw the overlay while it is visible."""
+        self._overlay.config(text=self.format_summary())
+        self._overlay.lift()
+        self._overlay_after_id = self.root.after(MONITOR_OVERLAY_MS, self._refresh_overlay)
+
+
+class PrefixIndex:
+    """
+    Word-prefix lookup over a list of display names, for type-ahead pickers.
+    
+    Every word of every name is kept in one sorted list, so the names
+    containing a word that starts with the typed text form a contiguous
+    run found with two bisections. With several typed words the shortest
+    run is scanned and the other words are checked against each candidate,
+    stopping as soon as enough matches are found.
+    """
+    
+    def __init__(self, names):
+        """
+        Args:
+            names: Display names to index, in the order suggestions are preferred
+        """
+        self.names = list(names)
+        self._words = [frozenset(re.findall(r'\w+', name.lower())) for name in self.names]
+        words = []
+        positions = []
+        for position, name_words in enumerate(self._words):
+            words.extend(name_words)
+            positions.extend([position] * len(name_words))
+        # Stable sort: names sharing a word stay in preference order
+        order = sorted(range(len(words)), key=words.__getitem__)
+        self._keys = [words[i] for i in order]
+        self._positions = [positions[i] for i in order]
+    
+    def search(self, text, limit=TYPEAHEAD_LIMIT):
+        """
+        Find names with a word starting with each typed word.
+        
+        Args:
+            text: Text typed so far
+            limit: Maximum number of names to return
+        
+        Returns:
+            list: Up to limit matching names (the first names when text is empty)
+        """
+        typed = re.findall(r'\w+', text.lower())
+        if not typed:
+            return self.names[:limit]
+        
+        runs = [(bisect_left(self._keys, word), bisect_left(self._keys, word + '\uffff'), word)
+                for word in typed]
+        start, end, scanned = min(runs, key=lambda run: run[1] - run[0])
+        others = [word for word in typed if word != scanned]
+        
+        matches = []
+        seen = set()
+        for position in self._positions[start:end]:
+            if position in seen:
+                continue
+            seen.add(position)
+            words = self._words[position]
+            if all(any(word.startswith(other) for word in words) for other in others):
+                matches.append(self.names[position])
+                if len(matches) >= limit:
+                    break
+        return matches
+
+
+class CatalogCache:
+    """
+    Shared in-memory copy of the product, customer and category lists.
+    
+    Each list is read from the database the first time it is needed and
+    then served from memory. Every list has a version number that the CRUD
+    methods bump through invalidate(); values derived from a list (display
+    strings, lookup dicts) are memoised against that version, so switching
+    tabs does no database work and no rebuilding until something changes.
+    Writes made elsewhere (another connection or terminal) are picked up by
+    drop_changed(), which compares the CatalogVersions counter each list
+    was loaded at with the current one.
+    """
+    
+    QUERIES = {
+        'products': '''
+            SELECT p.product_id, p.product_name, p.brand, p.size, p.color, p.price, c.category_name
+            FROM Products p
+            LEFT JOIN Categories c ON p.category_id = c.category_id
+            ORDER BY p.product_id
+        ''',
+        'customers': '''
+            SELECT customer_id, first_name, last_name, email, phone
+            FROM Customers
+            ORDER BY customer_id
+        ''',
+        'categories': "SELECT category_id, category_name FROM Categories ORDER BY category_id",
+    }
+    
+    # Lists that embed data from another list and go stale with it
+    DEPENDENTS = {'categories': ('products',)}
+    
+    def __init__(self, db):
+        """
+        Args:
+            db: DatabaseManager to load from
+        """
+        self.db = db
+        self.versions = {name: 0 for name in self.QUERIES}
+        self._rows = {}
+        self._loaded_at = {}
+        self._derived = {}
+        self._lock = threading.RLock()
+    
+    def rows(self, name):
+        """
+        Return the cached rows of one list, loading them if needed.
+        
+        Args:
+            name: 'products', 'customers' or 'categories'
+        
+        Returns:
+            list: Rows in the shape of the list's query
+        """
+        with self._lock:
+            if name not in self._rows:
+                # One read transaction, so the counter matches the rows
+                with self.db.transaction() as cursor:
+                    cursor.execute("SELECT version FROM CatalogVersions WHERE list_name = ?", (name,))
+                    self._loaded_at[name] = cursor.fetchone()
+                    self._rows[name] = cursor.execute(self.QUERIES[name]).fetchall()
+            return self._rows[name]
+    
+    def derived(self, key, name, build, load=True):
+        """
+        Return a value computed from a list, rebuilt only when the list changes.
+        
+        Args:
+            key: Name of the derived value
+            name: List it is computed from
+            build: Called with the list's rows to compute the value
+            load: Load and build when stale; False returns None instead,
+                without touching the database or waiting for the lock,
+                so the Tk thread can use it
+        """
+        if not load:
+            version, value = self._derived.get(key, (None, None))
+            return value if version == self.versions[name] else None
+        with self._lock:
+            version, value = self._derived.get(key, (None, None))
+            if version != self.versions[name]:
+                value = build(self.rows(name))
+                self._derived[key] = (self.versions[name], value)
+            return value
+    
+    def invalidate(self, *names):
+        """
+        Drop cached lists so the next read reloads them.
+        
+        Args:
+            *names: Lists to drop (all of them when none are given)
+        """
+        with self._lock:
+            for name in names or tuple(self.QUERIES):
+                for stale in (name,) + self.DEPENDENTS.get(name, ()):
+                    self.versions[stale] += 1
+                    self._rows.pop(stale, None)
+                    self._loaded_at.pop(stale, None)
+    
+    def written_versions(self):
+        """
+        Read the write counters of every list, cached or not.
+        
+        Returns:
+            dict: {list name: counter}; a counter only ever grows
+        """
+        return dict(self.db.fetchall("SELECT list_name, version FROM CatalogVersions"))
+    
+    def drop_changed(self):
+        """
+        Drop the loaded lists whose tables were written since they were read.
+        
+        Costs one query over CatalogVersions; lists that are still current,
+        such as the product list after a checkout, are kept.
+        
+        Returns:
+            list: Names of the lists that were dropped
+        """
+        current = {name: (version,) for name, version in self.written_versions().items()}
+        with self._lock:
+            changed = [name for name, loaded_at in self._loaded_at.items() if current.get(name) != loaded_at]
+            if changed:
+                self.invalidate(*changed)
+            return changed
+    
+    def product_choices(self, load=True):
+        """
+        Product dropdown entries for the Orders section.
+        
+        Args:
+            load: See derived()
+        
+        Returns:
+            tuple: (display names, {display name: (product_id, product_name, price)})
+        """
+        def build(rows):
+            info = {}
+            for product_id, product_name, _, _, _, price, _ in rows:
+                info[f"{product_name} (₱{price:,.2f})"] = (product_id, product_name, price)
+            return list(info), info
+        return self.derived('product_choices', 'products', build, load)
+    
+    def customer_choices(self, load=True):
+        """
+        Customer dropdown entries for the Orders section.
+        
+        The customer ID is part of each entry, so customers who share a
+        name still get distinct entries.
+        
+        Args:
+            load: See derived()
+        
+        Returns:
+            tuple: (display names, {display name: customer_id})
+        """
+        def build(rows):
+            ids = {f"{first} {last} (#{customer_id})": customer_id for customer_id, first, last, _, _ in rows}
+            return list(ids), ids
+        return self.derived('customer_choices', 'customers', build, load)
+    
+    def product_index(self, load=True):
+        """Return a PrefixIndex over the product dropdown entries (load: see derived())."""
+        return self.derived('product_index', 'products', lambda rows: PrefixIndex(self.product_choices()[0]), load)
+    
+    def customer_index(self, load=True):
+        """Return a PrefixIndex over the customer names (load: see derived())."""
+        return self.derived('customer_index', 'customers', lambda rows: PrefixIndex(self.customer_choices()[0]), load)
+    
+    def category_names(self):
+        """Return every category name, in ID order."""
+        return self.derived('category_names', 'categories', lambda rows: [row[1] for row in rows])
+
+
+class OrderCart:
+    """
+    Line items of the order being built, keyed by Treeview iid.
+    
+    Each product has one line whose iid is its product_id, so adding a
+    product that is already in the cart merges into the existing line.
+    The order total is kept as a running sum in centavos, which makes add,
+    remove and quantity changes O(1) and keeps the total exact.
+    """
+    
+    def __init__(self):
+        self._lines = {}
+        self._total_cents = 0
+    
+    def __len__(self):
+        return len(self._lines)
+    
+    def __contains__(self, iid):
+        return iid in self._lines
+    
+    @property
+    def total(self):
+        """float: Sum of every line's subtotal."""
+        return self._total_cents / 100
+    
+    def items(self):
+        """
+        Return the lines in the order they were first added.
+        
+        Returns:
+            list: Dicts with product_id, product_name, quantity, unit_price and subtotal
+        """
+        return list(self._lines.values())
+    
+    def line(self, iid):
+        """
+        Return one line.
+        
+        Returns:
+            dict: Line with product_id, product_name, quantity, unit_price and subtotal
+        """
+        return self._lines[iid]
+    
+    def add(self, product_id, product_name, unit_price, quantity):
+        """
+        Add units of a product, merging with its existing line.
+        
+        Returns:
+            tuple: (iid, line dict, True if an existing line was merged into)
+        """
+        iid = str(product_id)
+        line = self._lines.get(iid)
+        if line is not None:
+            self.set_quantity(iid, line['quantity'] + quantity)
+            return iid, line, True
+        
+        line = {'product_id': product_id, 'product_name': product_name,
+                'quantity': quantity, 'unit_price': unit_price, 'subtotal': unit_price * quantity}
+        self._lines[iid] = line
+        self._total_cents += round(line['subtotal'] * 100)
+        return iid, line, False
+    
+    def set_quantity(self, iid, quantity):
+        """
+        Change the quantity of a line.
+        
+        Returns:
+            dict: The updated line
+        """
+        line = self._lines[iid]
+        self._total_cents -= round(line['subtotal'] * 100)
+        line['quantity'] = quantity
+        line['subtotal'] = line['unit_price'] * quantity
+        self._total_cents += round(line['subtotal'] * 100)
+        return line
+    
+    def remove(self, iid):
+        """
+        Remove a line.
+        
+        Returns:
+            dict: The removed line
+        """
+        line = self._lines.pop(iid)
+        self._total_cents -= round(line['subtotal'] * 100)
+        return line
+    
+    def clear(self):
+        """Remove every line."""
+        self._lines.clear()
+        self._total_cents = 0
+
+
+class TreeviewSync:
+    """
+    Keyed reconciliation of a flat Treeview against a fresh result set.
+    
+    Items are created with the row's primary key as their iid and the last
+    rendered values are remembered, so a refresh only touches the rows
+    that were added, removed, changed or reordered instead of deleting and
+    re-inserting the whole table.
+    """
+    
+    def __init__(self, tree, key_index=0):
+        """
+        Args:
+            tree: ttk.Treeview to keep in sync
+            key_index: Position of the primary key within each values tuple
+        """
+        self.tree = tree
+        self.key_index = key_index
+        self._values = {}
+        self._order = []
+    
+    def sync(self, rows):
+        """
+        Make the tree show exactly the given rows, in order.
+        
+        Args:
+            rows: Sequence of values tuples, one per item
+        
+        Returns:
+            int: Number of Tk item calls that were needed
+        """
+        new_values = {}
+        new_order = []
+        for values in rows:
+            values = tuple(values)
+            iid = str(values[self.key_index])
+            new_values[iid] = values
+            new_order.append(iid)
+        
+        calls = 0
+        removed = [iid for iid in self._order if iid not in new_values]
+        if removed:
+            self.tree.delete(*removed)
+            calls += 1
+        
+        # Items that stay only need moving when their relative order changed
+        kept = [iid for iid in self._order if iid in new_values]
+        reorder = kept != [iid for iid in new_order if iid in self._values]
+        
+        for index, iid in enumerate(new_order):
+            values = new_values[iid]
+            old = self._values.get(iid)
+            if old is None:
+                self.tree.insert('', index, iid=iid, values=values)
+                calls += 1
+                continue
+            if old != values:
+                self.tree.item(iid, values=values)
+                calls += 1
+            if reorder:
+                self.tree.move(iid, '', index)
+                calls += 1
+        
+        self._values = new_values
+        self._order = new_order
+        return calls
+    
+    def clear(self):
+        """Remove every item from the tree."""
+        self.sync(())
+
+
+class KeysetQuery:
+    """
+    A table listing that can be read a window at a time.
+    
+    Pages are addressed by the (unique, indexed) sort key rather than by
+    OFFSET, so reading the next window costs the same at row 10 as at
+    row 1,000,000. Only jumping to an arbitrary position needs an OFFSET
+    probe, and that walks the key index alone.
+    """
+    
+    def __init__(self, db, columns, from_clause, key, where='', count_from=None):
+        """
+        Args:
+            db: DatabaseManager to read from
+            columns: SELECT list; the first column must be the key
+            from_clause: FROM clause including any joins
+            key: Qualified key column the listing is ordered by
+            where: Optional filter condition
+            count_from: Cheaper FROM clause for counting (defaults to from_clause)
+        """
+        self.db = db
+        self.columns = columns
+        self.from_clause = from_clause
+        self.key = key
+        self.where = where
+        self.count_from = count_from or from_clause
+    
+    def _filter(self, condition=''):
+        """Build the WHERE clause from the listing filter and a key condition."""
+        conditions = [c for c in (self.where, condition) if c]
+        return ' WHERE ' + ' AND '.join(conditions) if conditions else ''
+    
+    def count(self):
+        """Return the number of rows in the listing."""
+        return self.db.fetchvalue(
+            f'SELECT COUNT(*) FROM {self.count_from}{self._filter()}', default=0)
+    
+    def key_at(self, offset):
+        """
+        Find the key of the row at a position in the listing.
+        
+        Args:
+            offset: Zero-based row position
+        
+        Returns:
+            The key at that position, or None past the end
+        """
+        return self.db.fetchvalue(
+            f'SELECT {self.key} FROM {self.count_from}{self._filter()} '
+            f'ORDER BY {self.key} LIMIT 1 OFFSET ?', (offset,))
+    
+    def page(self, key, limit, inclusive=True):
+        """
+        Read rows after a key, in key order.
+        
+        Args:
+            key: Key to start from (None starts at the first row)
+            limit: Maximum number of rows
+            inclusive: Whether the row with this key is included
+        
+        Returns:
+            list: Up to limit rows
+        """
+        condition, params = '', ()
+        if key is not None:
+            condition = f"{self.key} {'>=' if inclusive else '>'} ?"
+            params = (key,)
+        return self.db.fetchall(
+            f'SELECT {self.columns} FROM {self.from_clause}{self._filter(condition)} '
+            f'ORDER BY {self.key} LIMIT ?', params + (limit,))
+    
+    def page_before(self, key, limit):
+        """
+        Read rows just before a key, in key order.
+        
+        Args:
+            key: Key the rows must precede
+            limit: Maximum number of rows
+        
+        Returns:
+            list: Up to limit rows
+        """
+        rows = self.db.fetchall(
+            f'SELECT {self.columns} FROM {self.from_clause}{self._filter(f"{self.key} < ?")} '
+            f'ORDER BY {self.key} DESC LIMIT ?', (key, limit))
+        rows.reverse()
+        return rows
+
+
+class VirtualTable:
+    """
+    Virtual scrolling for a flat Treeview.
+    
+    The Treeview only ever holds the rows that fit on screen. A buffer of
+    the visible window plus a prefetch margin on each side is read from a
+    KeysetQuery, and the scrollbar is driven from the listing's row count
+    instead of the Treeview's contents. Plain lists (search results) are
+    shown the same way without touching the database.
+    
+    With a TaskRunner, the count and the buffer reads run on its 'search'
+    lane and the rows are rendered when they arrive; until then the tree
+    keeps its current rows. Every show() starts a new generation and
+    reads for an older one are dropped, the way SearchScheduler drops
+    superseded searches. Without a runner everything is read inline.
+    """
+    
+    WHEEL_ROWS = 3
+    
+    def __init__(self, tree, scrollbar, format_row=tuple, margin=100, runner=None):
+        """
+        Args:
+            tree: ttk.Treeview to render into
+            scrollbar: Vertical scrollbar paired with the tree
+            format_row: Turns a raw row into the displayed values tuple
+            margin: Rows prefetched above and below the visible window
+            runner: TaskRunner for the database reads (None reads inline)
+        """
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.format_row = format_row
+        self.margin = margin
+        self.runner = runner
+        self.items = TreeviewSync(tree)
+        self.visible = int(tree.cget('height'))
+        self.source = None
+        self.rows = []
+        self.buffer_start = 0
+        self.total = 0
+        self.offset = 0
+        self._generation = 0
+        self._reading = False
+        self._read_for = None
+        self._focus_step = 0
+        
+        tree.configure(yscrollcommand='')
+        scrollbar.configure(command=self.yview)
+        tree.bind('<MouseWheel>', self._on_wheel)
+        tree.bind('<Button-4>', lambda e: self.scroll(-self.WHEEL_ROWS))
+        tree.bind('<Button-5>', lambda e: self.scroll(self.WHEEL_ROWS))
+        tree.bind('<Up>', lambda e: self._on_arrow(-1))
+        tree.bind('<Down>', lambda e: self._on_arrow(1))
+        tree.bind('<Prior>', lambda e: self.scroll(-self.visible) or 'break')
+        tree.bind('<Next>', lambda e: self.scroll(self.visible) or 'break')
+        tree.bind('<Configure>', self._on_resize)
+    
+    def show(self, result, total=None):
+        """
+        Display a listing or a fixed list of rows.
+        
+        Showing the same KeysetQuery again refreshes it in place and keeps
+        the scroll position; anything else starts from the top.
+        
+        Args:
+            result: KeysetQuery, or a list of raw rows
+            total: Row count of the KeysetQuery if already known (counted
+                on the worker otherwise)
+        """
+        self._generation += 1
+        self._reading = False
+        self._read_for = None
+        if isinstance(result, KeysetQuery):
+            if result is not self.source:
+                self.offset = 0
+            self.source = result
+            self.rows = []
+            self.buffer_start = 0
+            if total is None:
+                self._run(self._counted, result.count)
+                return
+            self.total = total
+        else:
+            self.source = None
+            self.rows = list(result)
+            self.buffer_start = 0
+            self.total = len(self.rows)
+            self.offset = 0
+        self._render()
+    
+    def scroll(self, rows):
+        """Move the visible window by a number of rows."""
+        self.offset += rows
+        self._render()
+    
+    def yview(self, *args):
+        """Scrollbar command: handles 'moveto' and 'scroll' requests."""
+        if args[0] == 'moveto':
+            self.offset = int(float(args[1]) * self.total)
+        elif args[0] == 'scroll':
+            step = self.visible if args[2] == 'pages' else 1
+            self.offset += int(args[1]) * step
+        self._render()
+    
+    def _run(self, deliver, func, *args):
+        """
+        Run a read on the 'search' lane and deliver its result if still current.
+        
+        Args:
+            deliver: Called on the Tk thread with func's return value
+            func: Database read; must not touch any widget
+            *args: Arguments for func
+        """
+        generation = self._generation
+        
+        def done(value):
+            if generation == self._generation:
+                deliver(value)
+        
+        if self.runner is None:
+            done(func(*args))
+        else:
+            self.runner.submit(func, *args, on_done=done, lane='search')
+    
+    def _counted(self, total):
+        """Tk side: the listing's row count arrived."""
+        self.total = total
+        self._render()
+    
+    def _render(self):
+        """Clamp the window, fetch the buffer if needed and update the tree."""
+        self.offset = max(0, min(self.offset, self.total - self.visible))
+        end = min(self.total, self.offset + self.visible)
+        
+        if self.total:
+            self.scrollbar.set(self.offset / self.total, end / self.total)
+        else:
+            self.scrollbar.set(0, 1)
+        
+        buffer_end = self.buffer_start + len(self.rows)
+        covered = self.buffer_start <= self.offset and end <= buffer_end
+        # A read that came back short (rows deleted since the count) is not retried
+        if self.source is not None and not covered and self._read_for != (self.offset, end):
+            if not self._reading:
+                self._reading = True
+                self._run(self._filled, self._read, self.source, self.rows, self.buffer_start, self.offset, end)
+            # The tree keeps its rows until the read lands; _filled renders again
+            return
+        
+        window = self.rows[self.offset - self.buffer_start:end - self.buffer_start]
+        self.items.sync(self.format_row(row) for row in window)
+        if self._focus_step:
+            self._move_focus()
+    
+    def _filled(self, result):
+        """Tk side: take the buffer read on the worker and render the current window."""
+        self._reading = False
+        self._read_for, self.buffer_start, self.rows = result
+        self._render()
+    
+    def _read(self, source, rows, buffer_start, start, end):
+        """
+        Worker side: read the rows from start to end plus the prefetch margin.
+        
+        Args:
+            source: KeysetQuery to read
+            rows: Current buffer, reused where it overlaps
+            buffer_start: Position of the buffer's first row
+            start: First visible position
+            end: Position after the last visible row
+        
+        Returns:
+            tuple: ((start, end), new buffer start, new buffer rows)
+        """
+        first = max(0, start - self.margin)
+        limit = end + self.margin - first
+        buffer_end = buffer_start + len(rows)
+        
+        if rows and buffer_start <= first < buffer_end:
+            # Scrolling down: continue from a key already in the buffer
+            new_rows = source.page(rows[first - buffer_start][0], limit)
+        elif rows and first < buffer_start < first + limit:
+            # Scrolling up: read the gap before the buffer and keep the overlap
+            before = source.page_before(rows[0][0], buffer_start - first)
+            first = buffer_start - len(before)
+            new_rows = before + rows[:limit - len(before)]
+        else:
+            # Jump: one index-only OFFSET probe, then a keyset page
+            key = source.key_at(first)
+            new_rows = source.page(key, limit) if key is not None else []
+        
+        return (start, end), first, new_rows
+    
+    def _on_wheel(self, event):
+        """Scroll on mouse wheel (Windows and macOS deltas)."""
+        notches = event.delta // 120 if abs(event.delta) >= 120 else (1 if event.delta > 0 else -1)
+        self.scroll(-notches * self.WHEEL_ROWS)
+    
+    def _on_arrow(self, step):
+        """Keep keyboard navigation going past the edge of the window."""
+        children = self.tree.get_children()
+        if not children:
+            return None
+        edge = children[-1] if step > 0 else children[0]
+        if self.tree.focus() != edge:
+            return None
+        
+        # Applied by _render, which may wait for rows from the worker
+        self._focus_step = step
+        self.scroll(step)
+        return 'break'
+    
+    def _move_focus(self):
+        """Focus and select the row at the edge an arrow key scrolled towards."""
+        step, self._focus_step = self._focus_step, 0
+        children = self.tree.get_children()
+        if children:
+            target = children[-1] if step > 0 else children[0]
+            self.tree.focus(target)
+            self.tree.selection_set(target)
+    
+    def _on_resize(self, event):
+        """Show as many rows as the tree's current height allows."""
+        row_height = int(ttk.Style().lookup('Treeview', 'rowheight') or 20)
+        # One row's worth of height goes to the column headings
+        visible = max(1, event.height // row_height - 1)
+        if visible != self.visible:
+            self.visible = visible
+            self._render()
+
+
+class ValidationError(ShopError):
+    """Raised when a service is given missing or malformed input."""
+
+
+class NotFoundError(ShopError):
+    """Raised when a referenced record does not exist."""
+
+
+class RecordInUseError(ShopError):
+    """Raised when a record cannot be deleted because other records refer to it."""
+
+
+def _to_number(value, message):
+    """
+    Convert form or script input to a float.
+    
+    Args:
+        value: Number or numeric string
+        message: ValidationError message if it is not a number
+    
+    Returns:
+        float: The value
+    """
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValidationError(message) from None
+
+
+def _to_quantity(value):
+    """
+    Convert form or script input to a positive whole quantity.
+    
+    Returns:
+        int: The quantity
+    """
+    try:
+        quantity = int(value)
+    except (TypeError, ValueError):
+        raise ValidationError("Please enter a valid quantity!") from None
+    if quantity <= 0:
+        raise ValidationError("Quantity must be positive!")
+    return quantity
+
+
+class ProductService:
+    """Product catalog operations. Plain arguments in, plain data out."""
+    
+    def __init__(self, db, catalog):
+        """
+        Args:
+            db: DatabaseManager to work against
+            catalog: CatalogCache invalidated after writes
+        """
+        self.db = db
+        self.catalog = catalog
+        # Full listing, paged by key so large tables load a screen at a time
+        self.listing = KeysetQuery(
+            db,
+            'p.product_id, p.product_name, p.brand, p.size, p.color, p.price, c.category_name',
+            'Products p LEFT JOIN Categories c ON p.category_id = c.category_id',
+            'p.product_id', count_from='Products p')
+    
+    def categories(self):
+        """
+        Returns:
+            list: Category names
+        """
+        return self.catalog.category_names()
+    
+    def get(self, product_id):
+        """
+        Fetch one product.
+        
+        Returns:
+            dict: product_id, product_name, category_name, brand, size, color,
+                gender, price, cost_price and description
+        
+        Raises:
+            NotFoundError: No such product
+        """
+        row = self.db.fetchone('''
+            SELECT p.product_id, p.product_name, c.category_name, p.brand, p.size, p.color,
+                   p.gender, p.price, p.cost_price, p.description
+            FROM Products p
+            LEFT JOIN Categories c ON p.category_id = c.category_id
+            WHERE p.product_id = ?
+        ''', (product_id,))
+        if row is None:
+            raise NotFoundError(f"Product #{product_id} not found!")
+        return dict(zip(('product_id', 'product_name', 'category_name', 'brand', 'size', 'color',
+                         'gender', 'price', 'cost_price', 'description'), row))
+    
+    def search(self, search_text):
+        """
+        Search products by name, brand or category using the FTS index.
+        
+        Args:
+            search_text: Free text, matched as word prefixes
+        
+        Returns:
+            (product_id, product_name, brand, size, color, price, category_name)
+            rows, best match first (see fts_result_order), or the full listing
+            when the text is empty
+        """
+        match = fts_prefix_query(search_text)
+        if match is None:
+            return self.listing
+        
+        order = fts_result_order(search_text)
+        return self.db.fetchall(f'''
+            SELECT p.product_id, p.product_name, p.brand, p.size, p.color, p.price, c.category_name
+            FROM (SELECT rowid, {order} AS position FROM products_fts WHERE products_fts MATCH ?
+                  ORDER BY {order} LIMIT ?) f
+            JOIN Products p ON p.product_id = f.rowid
+            LEFT JOIN Categories c ON p.category_id = c.category_id
+            ORDER BY f.position
+        ''', (match, SEARCH_RESULT_LIMIT))
+    
+    def _values(self, product_name, category_name, price, cost_price, brand, size, color, gender, description):
+        """Validate product fields and resolve the category to its ID."""
+        if not product_name:
+            raise ValidationError("Product name is required!")
+        price = _to_number(price, "Please enter valid numeric values for price!")
+        cost_price = _to_number(cost_price, "Please enter valid numeric values for price!")
+        
+        category_id = self.db.fetchvalue("SELECT category_id FROM Categories WHERE category_name = ?",
+                                         (category_name,))
+        if category_id is None:
+            raise NotFoundError("Category not found!")
+        return (product_name, category_id, brand, size, color, gender, price, cost_price, description)
+    
+    def add(self, product_name, category_name, price, cost_price,
+            brand='', size='', color='', gender='', description=''):
+        """
+        Add a product together with an empty Inventory row.
+        
+        Returns:
+            int: The new product_id
+        """
+        values = self._values(product_name, category_name, price, cost_price,
+                              brand, size, color, gender, description)
+        with self.db.transaction() as cursor:
+            cursor.execute('''
+                INSERT INTO Products (product_name, category_id, brand, size, color, gender, price, cost_price, description)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', values)
+            product_id = cursor.lastrowid
+            
+            cursor.execute('''
+                INSERT INTO Inventory (product_id, quantity, last_restocked, min_stock_level)
+                VALUES (?, 0, CURRENT_DATE, 10)
+            ''', (product_id,))
+        self.catalog.invalidate('products')
+        return product_id
+    
+    def update(self, product_id, product_name, category_name, price, cost_price,
+               brand='', size='', color='', gender='', description=''):
+        """Replace every editable field of a product."""
+        values = self._values(product_name, category_name, price, cost_price,
+                              brand, size, color, gender, description)
+        with self.db.transaction() as cursor:
+            cursor.execute('''
+                UPDATE Products 
+                SET product_name = ?, category_id = ?, brand = ?, size = ?, color = ?, 
+                    gender = ?, price = ?, cost_price = ?, description = ?
+                WHERE product_id = ?
+            ''', values + (product_id,))
+        self.catalog.invalidate('products')
+    
+    def delete(self, product_id):
+        """
+        Delete a product with its inventory.
+        
+        Raises:
+            RecordInUseError: The product appears on existing orders or is
+                held by an open cart
+        """
+        with self.db.transaction(immediate=True) as cursor:
+            if cursor.execute("SELECT 1 FROM OrderDetails WHERE product_id = ? LIMIT 1", (product_id,)).fetchone():
+                raise RecordInUseError("Cannot delete product with existing orders!")
+            # Deleting the hold would leave that cart with a line it can no longer check out
+            if cursor.execute("SELECT 1 FROM StockReservations WHERE product_id = ? LIMIT 1", (product_id,)).fetchone():
+                raise RecordInUseError("Cannot delete product while it is in an open cart!")
+            cursor.execute("DELETE FROM Inventory WHERE product_id = ?", (product_id,))
+            cursor.execute("DELETE FROM Products WHERE product_id = ?", (product_id,))
+        self.catalog.invalidate('products')
+
+
+class CustomerService:
+    """Customer records. Plain arguments in, plain data out."""
+    
+    def __init__(self, db, catalog):
+        """
+        Args:
+            db: DatabaseManager to work against
+            catalog: CatalogCache invalidated after writes
+        """
+        self.db = db
+        self.catalog = catalog
+        self.listing = KeysetQuery(
+            db,
+            'customer_id, first_name, last_name, email, phone, registration_date',
+            'Customers', 'customer_id')
+    
+    def get(self, customer_id):
+        """
+        Fetch one customer.
+        
+        Returns:
+            dict: customer_id, first_name, last_name, email, phone, address
+                and registration_date
+        
+        Raises:
+            NotFoundError: No such customer
+        """
+        row = self.db.fetchone('''
+            SELECT customer_id, first_name, last_name, email, phone, address, registration_date
+            FROM Customers WHERE customer_id = ?
+        ''', (customer_id,))
+        if row is None:
+            raise NotFoundError(f"Customer #{customer_id} not found!")
+        return dict(zip(('customer_id', 'first_name', 'last_name', 'email', 'phone', 'address',
+                         'registration_date'), row))
+    
+    def search(self, search_text):
+        """
+        Search customers by name or email using the FTS index.
+        
+        Args:
+            search_text: Free text, matched as word prefixes
+        
+        Returns:
+            (customer_id, first_name, last_name, email, phone, registration_date)
+            rows, best match first (see fts_result_order), or the full listing
+            when the text is empty
+        """
+        match = fts_prefix_query(search_text)
+        if match is None:
+            return self.listing
+        
+        order = fts_result_order(search_text)
+        return self.db.fetchall(f'''
+            SELECT c.customer_id, c.first_name, c.last_name, c.email, c.phone, c.registration_date
+            FROM (SELECT rowid, {order} AS position FROM customers_fts WHERE customers_fts MATCH ?
+                  ORDER BY {order} LIMIT ?) f
+            JOIN Customers c ON c.customer_id = f.rowid
+            ORDER BY f.position
+        ''', (match, SEARCH_RESULT_LIMIT))
+    
+    def add(self, first_name, last_name, email='', phone='', address=''):
+        """
+        Add a customer.
+        
+        Returns:
+            int: The new customer_id
+        """
+        if not first_name or not last_name:
+            raise ValidationError("First and last name are required!")
+        with self.db.transaction() as cursor:
+            cursor.execute('''
+                INSERT INTO Customers (first_name, last_name, email, phone, address)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (first_name, last_name, email, phone, address))
+            customer_id = cursor.lastrowid
+        self.catalog.invalidate('customers')
+        return customer_id
+    
+    def update(self, customer_id, first_name, last_name, email='', phone='', address=''):
+        """Replace every editable field of a customer."""
+        if not first_name or not last_name:
+            raise ValidationError("First and last name are required!")
+        with self.db.transaction() as cursor:
+            cursor.execute('''
+                UPDATE Customers 
+                SET first_name = ?, last_name = ?, email = ?, phone = ?, address = ?
+                WHERE customer_id = ?
+            ''', (first_name, last_name, email, phone, address, customer_id))
+        self.catalog.invalidate('customers')
+    
+    def delete(self, customer_id):
+        """
+        Delete a customer.
+        
+        Raises:
+            RecordInUseError: The customer has orders
+        """
+        with self.db.transaction() as cursor:
+            if cursor.execute("SELECT 1 FROM Orders WHERE customer_id = ? LIMIT 1", (customer_id,)).fetchone():
+                raise RecordInUseError("Cannot delete customer with existing orders!")
+            cursor.execute("DELETE FROM Customers WHERE customer_id = ?", (customer_id,))
+        self.catalog.invalidate('customers')
+
+
+class OrderService:
+    """Cart reservations, checkout and order history."""
+    
+    def __init__(self, db):
+        """
+        Args:
+            db: DatabaseManager to work against
+        """
+        self.db = db
+        self._default_employee_id = None
+    
+    def default_employee_id(self):
+        """
+        Return the employee recorded on new orders, looked up once.
+        
+        Returns:
+            int: First employee's ID (1 if there are no employees)
+        """
+        if self._default_employee_id is None:
+            self._default_employee_id = self.db.fetchvalue(
+                "SELECT employee_id FROM Employees ORDER BY employee_id LIMIT 1", default=1)
+        return self._default_employee_id
+    
+    def reserve(self, session_id, product_id, quantity):
+        """Hold units for a cart (see DatabaseManager.reserve_stock)."""
+        self.db.reserve_stock(session_id, product_id, _to_quantity(quantity))
+    
+    def resize(self, session_id, product_id, quantity):
+        """
+        Hold exactly `quantity` units of a product for a cart.
+        
+        The change is worked out from what the cart holds now, so a cart
+        that runs its changes in order ends up holding the last quantity.
+        
+        Returns:
+            bool: False if the cart holds none of the product (its line
+                was removed), in which case nothing is reserved
+        
+        Raises:
+            InsufficientStockError: Not enough units for the increase
+        """
+        quantity = _to_quantity(quantity)
+        held = self.db.fetchvalue("SELECT quantity FROM StockReservations WHERE session_id = ? AND product_id = ?",
+                                  (session_id, product_id))
+        if held is None:
+            return False
+        if quantity > held:
+            self.db.reserve_stock(session_id, product_id, quantity - held)
+        elif quantity < held:
+            self.db.release_stock(session_id, product_id, held - quantity)
+        return True
+    
+    def release(self, session_id, product_id=None, quantity=None):
+        """
+        Return a cart's held units (see DatabaseManager.release_stock).
+        
+        Returns:
+            int: Units released
+        """
+        return self.db.release_stock(session_id, product_id, quantity)
+    
+    def keep_alive(self, session_id):
+        """
+        Refresh an open cart's reservations (see DatabaseManager.touch_reservations).
+        
+        Returns:
+            int: Reservations refreshed
+        """
+        return self.db.touch_reservations(session_id)
+    
+    def line(self, product_id, quantity):
+        """
+        Build an order line at the product's current price.
+        
+        Returns:
+            dict: product_id, product_name, quantity, unit_price and subtotal
+        
+        Raises:
+            NotFoundError: No such product
+        """
+        quantity = _to_quantity(quantity)
+        row = self.db.fetchone("SELECT product_name, price FROM Products WHERE product_id = ?", (product_id,))
+        if row is None:
+            raise NotFoundError(f"Product #{product_id} not found!")
+        return {'product_id': product_id, 'product_name': row[0], 'quantity': quantity,
+                'unit_price': row[1], 'subtotal': row[1] * quantity}
+    
+    def place(self, customer_id, items, status='Pending', payment_method='Cash',
+              session_id=None, employee_id=None):
+        """
+        Save an order and take its stock.
+        
+        Args:
+            customer_id: Ordering customer
+            items: Dicts with product_id, quantity, unit_price and subtotal
+            status: Order status
+            payment_method: Payment method
+            session_id: Cart session whose reservations the order consumes
+            employee_id: Recording employee (default: default_employee_id())
+        
+        Returns:
+            int: The new order_id
+        
+        Raises:
+            ValidationError: No customer or no lines
+            NotFoundError: No such customer
+            InsufficientStockError: A product does not have enough stock
+        """
+        if customer_id is None:
+            raise ValidationError("Please select a customer!")
+        if not items:
+            raise ValidationError("Order must have at least one item!")
+        if employee_id is None:
+            employee_id = self.default_employee_id()
+        # The check and the order share a transaction, so the customer cannot vanish in between
+        with self.db.transaction(immediate=True) as cursor:
+            if cursor.execute("SELECT 1 FROM Customers WHERE customer_id = ?", (customer_id,)).fetchone() is None:
+                raise NotFoundError(f"Customer #{customer_id} not found!")
+            return self.db.place_order(customer_id, employee_id, items, status, payment_method,
+                                       session_id=session_id)
+    
+    def recent(self, limit=10):
+        """
+        Return the most recent orders.
+        
+        Returns:
+            list: (order_id, customer, order_date, total_amount, status) rows
+        """
+        return self.db.fetchall('''
+            SELECT o.order_id, 
+                   c.first_name || ' ' || c.last_name as customer,
+                   o.order_date,
+                   o.total_amount,
+                   o.status
+            FROM Orders o
+            JOIN Customers c ON o.customer_id = c.customer_id
+            ORDER BY o.order_date DESC, o.order_id DESC
+            LIMIT ?
+        ''', (limit,))
+
+
+class InventoryService:
+    """Stock levels, restocking and inventory search."""
+    
+    def __init__(self, db):
+        """
+        Args:
+            db: DatabaseManager to work against
+        """
+        self.db = db
+        # One paged listing per stock filter
+        self.listings = {
+            name: KeysetQuery(
+                db, INVENTORY_COLUMNS,
+                'Inventory i JOIN Products p ON i.product_id = p.product_id',
+                'i.inventory_id', where=where, count_from='Inventory i')
+            for name, where in INVENTORY_FILTERS.items()
+        }
+    
+    def search(self, search_text, filter_type='All'):
+        """
+        Search inventory by product name or brand with optional stock filtering.
+        
+        Args:
+            search_text: Free text, matched as word prefixes
+            filter_type: Key of INVENTORY_FILTERS
+        
+        Returns:
+            (inventory_id, product_name, brand, size, quantity, min_stock_level,
+            status) rows, best match first (see fts_result_order), or the
+            filtered listing when the text is empty
+        """
+        match = fts_prefix_query(search_text)
+        if match is None:
+            return self.listings[filter_type]
+        
+        # Inventory search only looks at product name and brand. The stock
+        # filter is part of the ranked query, so the limit counts only rows
+        # that pass it.
+        query = f'''
+            SELECT {INVENTORY_COLUMNS}
+            FROM products_fts
+            JOIN Products p ON p.product_id = products_fts.rowid
+            JOIN Inventory i ON i.product_id = p.product_id
+            WHERE products_fts MATCH ?
+        '''
+        if INVENTORY_FILTERS[filter_type]:
+            query += ' AND ' + INVENTORY_FILTERS[filter_type]
+        query += f' ORDER BY products_fts.{fts_result_order(search_text)} LIMIT ?'
+        
+        return self.db.fetchall(query, ('{product_name brand} : (' + match + ')', SEARCH_RESULT_LIMIT))
+    
+    def stock(self, product_id):
+        """
+        Return a product's stock levels.
+        
+        Returns:
+            dict: quantity, reserved, available and min_stock_level
+        
+        Raises:
+            NotFoundError: The product has no Inventory row
+        """
+        row = self.db.fetchone(
+            "SELECT quantity, reserved, min_stock_level FROM Inventory WHERE product_id = ?", (product_id,))
+        if row is None:
+            raise NotFoundError(f"No inventory for product #{product_id}!")
+        return {'quantity': row[0], 'reserved': row[1], 'available': row[0] - row[1],
+                'min_stock_level': row[2]}
+    
+    def restock(self, inventory_id, quantity):
+        """
+        Add units to one inventory item.
+        
+        Raises:
+            ValidationError: Quantity is not a positive whole number
+            NotFoundError: No such inventory item
+        """
+        quantity = _to_quantity(quantity)
+        with self.db.transaction() as cursor:
+            cursor.execute('''
+                UPDATE Inventory 
+                SET quantity = quantity + ?, last_restocked = CURRENT_DATE
+                WHERE inventory_id = ?
+            ''', (quantity, inventory_id))
+            if cursor.rowcount == 0:
+                raise NotFoundError(f"Inventory item #{inventory_id} not found!")
+    
+    def restock_low_stock(self, policy='min_plus', **options):
+        """
+        Top up every low-stock item (see DatabaseManager.restock_low_stock).
+        
+        Returns:
+            list: (inventory_id, product_id, new quantity) of restocked rows
+        """
+        return self.db.restock_low_stock(policy, **options)
+
+
+class ShopServices:
+    """
+    Everything the shop does, without a user interface.
+    
+    The Tkinter window, scripts and load tests all go through this facade:
+    every method takes plain arguments, returns plain data and reports
+    business-rule failures as ShopError subclasses.
+    """
+    
+    def __init__(self, db):
+        """
+        Args:
+            db: DatabaseManager with the schema already created
+        """
+        self.db = db
+        self.catalog = CatalogCache(db)
+        self.products = ProductService(db, self.catalog)
+        self.customers = CustomerService(db, self.catalog)
+        self.orders = OrderService(db)
+        self.inventory = InventoryService(db)
+    
+    @classmethod
+    def open(cls, db_name, storage_profile=DEFAULT_STORAGE_PROFILE, profiler=None):
+        """
+        Open a database for headless use, creating or migrating its schema.
+        
+        Args:
+            db_name: Path of the SQLite database file
+            storage_profile: Name from STORAGE_PROFILES, or a settings dict
+            profiler: Optional QueryProfiler for every statement
+        
+        Returns:
+            ShopServices: Services bound to the new DatabaseManager
+        """
+        db = DatabaseManager(db_name, storage_profile=storage_profile, profiler=profiler)
+        db.create_schema()
+        db.release_stale_reservations()
+        return cls(db)
+    
+    def dashboard(self):
+        """
+        Retrieve every dashboard KPI with a single query.
+        
+        Returns:
+            dict: total_products, total_customers, total_orders, low_stock,
+                total_revenue and avg_order_value
+        """
+        stats = self.db.dashboard_stats()
+        completed_orders = stats['completed_orders']
+        total_revenue = float(stats['completed_revenue'] or 0)
+        
+        return {
+            'total_products': stats['total_products'],
+            'total_customers': stats['total_customers'],
+            'total_orders': stats['total_orders'],
+            'low_stock': stats['low_stock'],
+            'total_revenue': total_revenue,
+            'avg_order_value': total_revenue / completed_orders if completed_orders else 0.0,
+        }
+    
+    def close(self):
+        """Close the database connections."""
+        self.db.close()
+
+
 class ShoeShopManagementSystem:
     """
     Main application class for Shoe Shop Management System.
@@ -11,13 +3355,20 @@ class ShoeShopManagementSystem:
     This class handles the complete GUI application including:
     - Database initialization and management
     - User interface creation and navigation
-    - Business logic for all shop operations
+    - Forms and tables over the ShopServices business logic
     - Real-time data visualization and reporting
     """
     
-    def __init__(self, root):
+    def __init__(self, root, storage_profile=DEFAULT_STORAGE_PROFILE,
+                 dashboard_refresh_ms=DASHBOARD_REFRESH_MS, profiler=None):
         """
         Initialize the application with main window and setup components.
+        
+        Args:
+            root: Tk root window
+            storage_profile: SQLite storage profile name or settings dict
+            dashboard_refresh_ms: Dashboard change-check interval (0 disables)
+            profiler: Optional QueryProfiler for every statement
         """
         self.root = root
         self.root.title("BARAKO KICKS - Shoe Shop Management System")
@@ -57,11 +3408,28 @@ class ShoeShopManagementSystem:
             'clear_hover': '#5a6268',
         }
         
+        # Tk callback timing, from startup when switched on; F12 shows the figures
+        self.ui_monitor = EventLoopMonitor.from_environment(self.root)
+        
         # Database setup
         self.db_name = "shoe_shop.db"
+        self.db = DatabaseManager(self.db_name, storage_profile=storage_profile, profiler=profiler)
         self.create_tables()
         self.insert_sample_data()
         
+        # All reads and writes go through the headless service layer
+        self.services = ShopServices(self.db)
+        
+        # Stock in this window's cart is reserved under its own session id
+        self.session_id = uuid.uuid4().hex
+        self.db.release_stale_reservations()
+        
+        # Database work from the handlers runs on worker threads
+        self.tasks = TaskRunner(self.root, on_busy=self.show_busy)
+        self.root.after(RESERVATION_HEARTBEAT_MINUTES * 60000, self.keep_cart_alive)
+        # CatalogVersions counter each paged table was last loaded at
+        self.shown_versions = {}
+        
         # Navigation state
         self.nav_buttons = []
         self.current_active_nav = 'Dashboard'
@@ -76,6 +3444,27 @@ class ShoeShopManagementSystem:
         self.content_frame = tk.Frame(self.main_container, bg=self.colors['background'])
         self.content_frame.pack(fill='both', expand=True, pady=20)
         
+        # Product, customer and category lists shared by every section
+        self.catalog = self.services.catalog
+        
+        # Search boxes query on a worker thread so typing never blocks Tk
+        self.product_search = SearchScheduler(
+            self.root, self.db, self.tasks,
+            lambda: (self.search_var.get(),), self.query_products, self.display_products)
+        self.customer_search = SearchScheduler(
+            self.root, self.db, self.tasks,
+            lambda: (self.customer_search_var.get(),), self.query_customers, self.display_customers)
+        self.inventory_search = SearchScheduler(
+            self.root, self.db, self.tasks,
+            lambda: (self.inventory_search_var.get(), self.inventory_filter_var.get()),
+            self.query_inventory, self.display_inventory)
+        
+        # The visible dashboard follows changes made by other terminals
+        self.dashboard_refresher = DashboardRefresher(
+            self.root, self.db, self.tasks,
+            self.fetch_dashboard, self.display_dashboard, dashboard_refresh_ms,
+            on_change=self.catalog.drop_changed)
+        
         self.sections = {}
         self.create_dashboard_section()
         self.create_products_section()
@@ -135,12 +3524,28 @@ class ShoeShopManagementSystem:
             
             nav_btn.pack(side='left', padx=2)
             self.nav_buttons.append(nav_btn)
+        
+        # Names the background task in progress (see show_busy)
+        self.busy_label = tk.Label(nav_frame, text='', font=('Arial', 10, 'italic'),
+                                   bg=self.colors['background'], fg=self.colors['text_light'])
+        self.busy_label.pack(side='right', padx=10)
+    
+    def show_busy(self, message):
+        """
+        Show or clear the busy indicator.
+        
+        Args:
+            message: Description of the running task, or None when idle
+        """
+        if hasattr(self, 'busy_label'):
+            self.busy_label.config(text=message or '')
+        self.root.config(cursor='watch' if message else '')
     
     def switch_to_section(self, section_name):
         """
         Switch to specified application section.
         """
-
+        
         self.current_active_nav = section_name
         
         for btn in self.nav_buttons:
@@ -164,235 +3569,141 @@ class ShoeShopManagementSystem:
             self.sections[section_name].pack(fill='both', expand=True)
         
         if section_name == "Dashboard":
-            self.refresh_dashboard()
-        elif section_name == "Products":
+            self.dashboard_refresher.start()
+        else:
+            self.dashboard_refresher.stop()
+        
+        if section_name == "Products":
             self.load_products()
         elif section_name == "Customers":
             self.load_customers()
         elif section_name == "Orders":
-            self.load_order_customers()
-            self.load_order_products()
+            self.load_order_choices()
         elif section_name == "Inventory":
             self.load_inventory()
     
+    def shutdown(self):
+        """Stop background work and close the database once the window has closed."""
+        try:
+            self.ui_monitor.stop()
+            self.dashboard_refresher.stop()
+        finally:
+            # The workers, the cart's reservations and the WAL checkpoint are
+            # always dealt with, even if the window was torn down first
+            self.tasks.shutdown()
+            try:
+                self.services.orders.release(self.session_id)
+            finally:
+                self.services.close()
+    
     def create_tables(self):
-        """Create SQLite database tables if they don't exist."""
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS Categories (
-                category_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                category_name VARCHAR(50) NOT NULL,
-                description TEXT
-            )
-        ''')
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS Suppliers (
-                supplier_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                supplier_name VARCHAR(100) NOT NULL,
-                contact_person VARCHAR(100),
-                phone VARCHAR(20),
-                email VARCHAR(100),
-                address TEXT
-            )
-        ''')
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS Products (
-                product_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                product_name VARCHAR(100) NOT NULL,
-                category_id INTEGER,
-                supplier_id INTEGER,
-                brand VARCHAR(50),
-                size DECIMAL(3,1),
-                color VARCHAR(30),
-                gender VARCHAR(10),
-                price DECIMAL(10,2) NOT NULL,
-                cost_price DECIMAL(10,2),
-                description TEXT,
-                FOREIGN KEY (category_id) REFERENCES Categories(category_id),
-                FOREIGN KEY (supplier_id) REFERENCES Suppliers(supplier_id)
-            )
-        ''')
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS Customers (
-                customer_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                first_name VARCHAR(50) NOT NULL,
-                last_name VARCHAR(50) NOT NULL,
-                email VARCHAR(100),
-                phone VARCHAR(20),
-                address TEXT,
-                registration_date DATE DEFAULT CURRENT_DATE
-            )
-        ''')
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS Employees (
-                employee_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                first_name VARCHAR(50) NOT NULL,
-                last_name VARCHAR(50) NOT NULL,
-                email VARCHAR(100),
-                phone VARCHAR(20),
-                position VARCHAR(50),
-                salary DECIMAL(10,2),
-                hire_date DATE DEFAULT CURRENT_DATE
-            )
-        ''')
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS Orders (
-                order_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                customer_id INTEGER,
-                employee_id INTEGER,
-                order_date DATE DEFAULT CURRENT_DATE,
-                total_amount DECIMAL(10,2),
-                status VARCHAR(20) DEFAULT 'Pending',
-                payment_method VARCHAR(30),
-                FOREIGN KEY (customer_id) REFERENCES Customers(customer_id),
-                FOREIGN KEY (employee_id) REFERENCES Employees(employee_id)
-            )
-        ''')
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS OrderDetails (
-                order_detail_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                order_id INTEGER,
-                product_id INTEGER,
-                quantity INTEGER NOT NULL,
-                unit_price DECIMAL(10,2) NOT NULL,
-                subtotal DECIMAL(10,2),
-                FOREIGN KEY (order_id) REFERENCES Orders(order_id),
-                FOREIGN KEY (product_id) REFERENCES Products(product_id)
-            )
-        ''')
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS Inventory (
-                inventory_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                product_id INTEGER UNIQUE,
-                quantity INTEGER DEFAULT 0,
-                last_restocked DATE,
-                min_stock_level INTEGER DEFAULT 10,
-                FOREIGN KEY (product_id) REFERENCES Products(product_id)
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        """Create SQLite database tables if they don't exist and apply migrations."""
+        self.db.create_schema()
     
     def insert_sample_data(self):
         """Insert sample data for demonstration purposes."""
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT COUNT(*) FROM Categories")
-        if cursor.fetchone()[0] == 0:
-            # Categories
-            categories = [
-                ('Running Shoes', 'Athletic shoes for running'),
-                ('Casual Shoes', 'Everyday casual footwear'),
-                ('Formal Shoes', 'Dress shoes for formal occasions'),
-                ('Sports Shoes', 'Shoes for various sports'),
-                ('Sandals', 'Open footwear for warm weather'),
-                ('Slippers', 'Comfortable indoor/outdoor footwear')
-            ]
-            cursor.executemany("INSERT INTO Categories (category_name, description) VALUES (?, ?)", categories)
-            
-            # Suppliers
-            suppliers = [
-                ('Nike Philippines', 'Juan Dela Cruz', '+63-2-8123-4567', 'juan.delacruz@nike.ph', '123 Bonifacio High Street, Taguig City, Metro Manila'),
-                ('Adidas Philippines', 'Maria Santos', '+63-917-123-4567', 'maria.santos@adidas.ph', '456 SM Megamall, Ortigas Center, Mandaluyong City'),
-                ('Puma Philippines', 'Roberto Reyes', '+63-2-8234-5678', 'roberto.reyes@puma.ph', '789 Ayala Center, Makati City, Metro Manila'),
-                ('Skechers Philippines', 'Lisa Tan', '+63-918-234-5678', 'lisa.tan@skechers.ph', '101 Robinsons Place, Ermita, Manila'),
-                ('World Balance', 'Carlos Lim', '+63-2-8765-4321', 'carlos.lim@worldbalance.ph', '555 Quezon Avenue, Quezon City'),
-                ('San Marino', 'Andrea Gomez', '+63-919-345-6789', 'andrea.gomez@sanmarino.ph', '777 Pioneer Street, Mandaluyong City')
-            ]
-            cursor.executemany("INSERT INTO Suppliers (supplier_name, contact_person, phone, email, address) VALUES (?, ?, ?, ?, ?)", suppliers)
-            
-            # Products
-            products = [
-                ('Air Max 270', 1, 1, 'Nike', 10.5, 'Black/White', 'Men', 5499.99, 3299.99, 'Running shoes with Max Air cushioning'),
-                ('Ultraboost 22', 1, 2, 'Adidas', 9.0, 'Blue', 'Women', 6799.99, 4099.99, 'Responsive running shoes'),
-                ('Classic Leather', 2, 3, 'Puma', 11.0, 'White', 'Men', 2999.99, 1799.99, 'Iconic casual shoes'),
-                ('Go Walk 5', 2, 4, 'Skechers', 8.5, 'Gray', 'Women', 2499.99, 1499.99, 'Comfortable walking shoes'),
-                ('Court Royale', 3, 1, 'Nike', 10.0, 'Black', 'Men', 2299.99, 1379.99, 'Classic court-style shoes'),
-                ('Predator Freak', 4, 2, 'Adidas', 9.5, 'Red/Black', 'Men', 8999.99, 5399.99, 'Soccer shoes with advanced grip'),
-                ('Comfort Slippers', 6, 5, 'World Balance', 9.0, 'Blue/White', 'Unisex', 499.99, 299.99, 'Comfortable everyday slippers'),
-                ('Leather Sandals', 5, 6, 'San Marino', 8.0, 'Brown', 'Men', 1299.99, 779.99, 'Premium leather sandals'),
-                ('Running Pro', 1, 5, 'World Balance', 10.5, 'Green', 'Men', 1899.99, 1139.99, 'Affordable running shoes'),
-                ('School Shoes', 3, 6, 'San Marino', 7.0, 'Black', 'Kids', 999.99, 599.99, 'Durable school shoes')
-            ]
-            cursor.executemany('''INSERT INTO Products (product_name, category_id, supplier_id, brand, size, color, gender, price, cost_price, description) 
-                               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''', products)
-            
-            # Customers
-            customers = [
-                ('Juan', 'Dela Cruz', 'juan.delacruz@email.com', '+63-917-111-2233', '123 Rizal Street, Barangay Poblacion, Makati City'),
-                ('Maria', 'Santos', 'maria.santos@email.com', '+63-918-222-3344', '456 Mabini Road, Cebu City, Cebu'),
-                ('Roberto', 'Reyes', 'roberto.reyes@email.com', '+63-919-333-4455', '789 Quezon Avenue, Quezon City'),
-                ('Ana', 'Garcia', 'ana.garcia@email.com', '+63-920-444-5566', '101 Bonifacio Street, Davao City'),
-                ('Michael', 'Tan', 'michael.tan@email.com', '+63-921-555-6677', '222 Ortigas Center, Pasig City'),
-                ('Sofia', 'Lim', 'sofia.lim@email.com', '+63-922-666-7788', '333 Alabang, Muntinlupa City'),
-                ('Jose', 'Gonzales', 'jose.gonzales@email.com', '+63-923-777-8899', '444 Taft Avenue, Manila'),
-                ('Carmen', 'Torres', 'carmen.torres@email.com', '+63-924-888-9900', '555 Pioneer Street, Mandaluyong'),
-                ('Pedro', 'Aquino', 'pedro.aquino@email.com', '+63-925-999-0011', '666 Commonwealth Avenue, Quezon City'),
-                ('Lourdes', 'Fernandez', 'lourdes.fernandez@email.com', '+63-926-000-1122', '777 Katipunan Avenue, Quezon City')
-            ]
-            cursor.executemany("INSERT INTO Customers (first_name, last_name, email, phone, address) VALUES (?, ?, ?, ?, ?)", customers)
-            
-            # Employees
-            employees = [
-                ('Alice', 'Cruz', 'alice@barakokicks.ph', '+63-917-123-4567', 'Store Manager', 35000.00),
-                ('Charlie', 'David', 'charlie@barakokicks.ph', '+63-918-234-5678', 'Sales Supervisor', 25000.00),
-                ('Bianca', 'Ramos', 'bianca@barakokicks.ph', '+63-919-345-6789', 'Sales Associate', 18000.00),
-                ('Daniel', 'Mendoza', 'daniel@barakokicks.ph', '+63-920-456-7890', 'Sales Associate', 18000.00),
-                ('Elena', 'Sison', 'elena@barakokicks.ph', '+63-921-567-8901', 'Inventory Clerk', 20000.00)
-            ]
-            cursor.executemany("INSERT INTO Employees (first_name, last_name, email, phone, position, salary) VALUES (?, ?, ?, ?, ?, ?)", employees)
-            
-            # Inventory
-            inventory_data = [
-                (1, 45, '2024-01-15', 10),
-                (2, 35, '2024-01-10', 8),
-                (3, 50, '2024-01-20', 12),
-                (4, 40, '2024-01-12', 10),
-                (5, 25, '2024-01-18', 8),
-                (6, 15, '2024-01-05', 5),
-                (7, 100, '2024-01-25', 20),
-                (8, 30, '2024-01-22', 10),
-                (9, 60, '2024-01-28', 15),
-                (10, 40, '2024-01-30', 12)
-            ]
-            cursor.executemany("INSERT INTO Inventory (product_id, quantity, last_restocked, min_stock_level) VALUES (?, ?, ?, ?)", inventory_data)
-            
-            # Orders
-            orders = [
-                (1, 2, '2024-01-20', 5499.99, 'Completed', 'Credit Card'),
-                (2, 3, '2024-01-22', 12999.98, 'Completed', 'GCash'),
-                (3, 4, '2024-01-25', 2999.99, 'Processing', 'Cash'),
-                (4, 2, '2024-01-26', 4999.98, 'Pending', 'Debit Card'),
-                (5, 3, '2024-01-28', 4499.98, 'Completed', 'GCash')
-            ]
-            cursor.executemany("INSERT INTO Orders (customer_id, employee_id, order_date, total_amount, status, payment_method) VALUES (?, ?, ?, ?, ?, ?)", orders)
-            
-            # Order details
-            order_details = [
-                (1, 1, 1, 5499.99, 5499.99),
-                (2, 2, 1, 6799.99, 6799.99),
-                (2, 6, 1, 8999.99, 8999.99),
-                (3, 3, 1, 2999.99, 2999.99),
-                (4, 1, 2, 5499.99, 10999.98),
-                (5, 9, 2, 1899.99, 3799.98),
-                (5, 7, 2, 499.99, 999.98)
-            ]
-            cursor.executemany("INSERT INTO OrderDetails (order_id, product_id, quantity, unit_price, subtotal) VALUES (?, ?, ?, ?, ?)", order_details)
-            
-            conn.commit()
-        
-        conn.close()
+        with self.db.transaction() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM Categories")
+            if cursor.fetchone()[0] == 0:
+                # Categories
+                categories = [
+                    ('Running Shoes', 'Athletic shoes for running'),
+                    ('Casual Shoes', 'Everyday casual footwear'),
+                    ('Formal Shoes', 'Dress shoes for formal occasions'),
+                    ('Sports Shoes', 'Shoes for various sports'),
+                    ('Sandals', 'Open footwear for warm weather'),
+                    ('Slippers', 'Comfortable indoor/outdoor footwear')
+                ]
+                cursor.executemany("INSERT INTO Categories (category_name, description) VALUES (?, ?)", categories)
+                
+                # Suppliers
+                suppliers = [
+                    ('Nike Philippines', 'Juan Dela Cruz', '+63-2-8123-4567', 'juan.delacruz@nike.ph', '123 Bonifacio High Street, Taguig City, Metro Manila'),
+                    ('Adidas Philippines', 'Maria Santos', '+63-917-123-4567', 'maria.santos@adidas.ph', '456 SM Megamall, Ortigas Center, Mandaluyong City'),
+                    ('Puma Philippines', 'Roberto Reyes', '+63-2-8234-5678', 'roberto.reyes@puma.ph', '789 Ayala Center, Makati City, Metro Manila'),
+                    ('Skechers Philippines', 'Lisa Tan', '+63-918-234-5678', 'lisa.tan@skechers.ph', '101 Robinsons Place, Ermita, Manila'),
+                    ('World Balance', 'Carlos Lim', '+63-2-8765-4321', 'carlos.lim@worldbalance.ph', '555 Quezon Avenue, Quezon City'),
+                    ('San Marino', 'Andrea Gomez', '+63-919-345-6789', 'andrea.gomez@sanmarino.ph', '777 Pioneer Street, Mandaluyong City')
+                ]
+                cursor.executemany("INSERT INTO Suppliers (supplier_name, contact_person, phone, email, address) VALUES (?, ?, ?, ?, ?)", suppliers)
+                
+                # Products
+                products = [
+                    ('Air Max 270', 1, 1, 'Nike', 10.5, 'Black/White', 'Men', 5499.99, 3299.99, 'Running shoes with Max Air cushioning'),
+                    ('Ultraboost 22', 1, 2, 'Adidas', 9.0, 'Blue', 'Women', 6799.99, 4099.99, 'Responsive running shoes'),
+                    ('Classic Leather', 2, 3, 'Puma', 11.0, 'White', 'Men', 2999.99, 1799.99, 'Iconic casual shoes'),
+                    ('Go Walk 5', 2, 4, 'Skechers', 8.5, 'Gray', 'Women', 2499.99, 1499.99, 'Comfortable walking shoes'),
+                    ('Court Royale', 3, 1, 'Nike', 10.0, 'Black', 'Men', 2299.99, 1379.99, 'Classic court-style shoes'),
+                    ('Predator Freak', 4, 2, 'Adidas', 9.5, 'Red/Black', 'Men', 8999.99, 5399.99, 'Soccer shoes with advanced grip'),
+                    ('Comfort Slippers', 6, 5, 'World Balance', 9.0, 'Blue/White', 'Unisex', 499.99, 299.99, 'Comfortable everyday slippers'),
+                    ('Leather Sandals', 5, 6, 'San Marino', 8.0, 'Brown', 'Men', 1299.99, 779.99, 'Premium leather sandals'),
+                    ('Running Pro', 1, 5, 'World Balance', 10.5, 'Green', 'Men', 1899.99, 1139.99, 'Affordable running shoes'),
+                    ('School Shoes', 3, 6, 'San Marino', 7.0, 'Black', 'Kids', 999.99, 599.99, 'Durable school shoes')
+                ]
+                cursor.executemany('''INSERT INTO Products (product_name, category_id, supplier_id, brand, size, color, gender, price, cost_price, description) 
+                                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''', products)
+                
+                # Customers
+                customers = [
+                    ('Juan', 'Dela Cruz', 'juan.delacruz@email.com', '+63-917-111-2233', '123 Rizal Street, Barangay Poblacion, Makati City'),
+                    ('Maria', 'Santos', 'maria.santos@email.com', '+63-918-222-3344', '456 Mabini Road, Cebu City, Cebu'),
+                    ('Roberto', 'Reyes', 'roberto.reyes@email.com', '+63-919-333-4455', '789 Quezon Avenue, Quezon City'),
+                    ('Ana', 'Garcia', 'ana.garcia@email.com', '+63-920-444-5566', '101 Bonifacio Street, Davao City'),
+                    ('Michael', 'Tan', 'michael.tan@email.com', '+63-921-555-6677', '222 Ortigas Center, Pasig City'),
+                    ('Sofia', 'Lim', 'sofia.lim@email.com', '+63-922-666-7788', '333 Alabang, Muntinlupa City'),
+                    ('Jose', 'Gonzales', 'jose.gonzales@email.com', '+63-923-777-8899', '444 Taft Avenue, Manila'),
+                    ('Carmen', 'Torres', 'carmen.torres@email.com', '+63-924-888-9900', '555 Pioneer Street, Mandaluyong'),
+                    ('Pedro', 'Aquino', 'pedro.aquino@email.com', '+63-925-999-0011', '666 Commonwealth Avenue, Quezon City'),
+                    ('Lourdes', 'Fernandez', 'lourdes.fernandez@email.com', '+63-926-000-1122', '777 Katipunan Avenue, Quezon City')
+                ]
+                cursor.executemany("INSERT INTO Customers (first_name, last_name, email, phone, address) VALUES (?, ?, ?, ?, ?)", customers)
+                
+                # Employees
+                employees = [
+                    ('Alice', 'Cruz', 'alice@barakokicks.ph', '+63-917-123-4567', 'Store Manager', 35000.00),
+                    ('Charlie', 'David', 'charlie@barakokicks.ph', '+63-918-234-5678', 'Sales Supervisor', 25000.00),
+                    ('Bianca', 'Ramos', 'bianca@barakokicks.ph', '+63-919-345-6789', 'Sales Associate', 18000.00),
+                    ('Daniel', 'Mendoza', 'daniel@barakokicks.ph', '+63-920-456-7890', 'Sales Associate', 18000.00),
+                    ('Elena', 'Sison', 'elena@barakokicks.ph', '+63-921-567-8901', 'Inventory Clerk', 20000.00)
+                ]
+                cursor.executemany("INSERT INTO Employees (first_name, last_name, email, phone, position, salary) VALUES (?, ?, ?, ?, ?, ?)", employees)
+                
+                # Inventory
+                inventory_data = [
+                    (1, 45, '2024-01-15', 10),
+                    (2, 35, '2024-01-10', 8),
+                    (3, 50, '2024-01-20', 12),
+                    (4, 40, '2024-01-12', 10),
+                    (5, 25, '2024-01-18', 8),
+                    (6, 15, '2024-01-05', 5),
+                    (7, 100, '2024-01-25', 20),
+                    (8, 30, '2024-01-22', 10),
+                    (9, 60, '2024-01-28', 15),
+                    (10, 40, '2024-01-30', 12)
+                ]
+                cursor.executemany("INSERT INTO Inventory (product_id, quantity, last_restocked, min_stock_level) VALUES (?, ?, ?, ?)", inventory_data)
+                
+                # Orders
+                orders = [
+                    (1, 2, '2024-01-20', 5499.99, 'Completed', 'Credit Card'),
+                    (2, 3, '2024-01-22', 12999.98, 'Completed', 'GCash'),
+                    (3, 4, '2024-01-25', 2999.99, 'Processing', 'Cash'),
+                    (4, 2, '2024-01-26', 4999.98, 'Pending', 'Debit Card'),
+                    (5, 3, '2024-01-28', 4499.98, 'Completed', 'GCash')
+                ]
+                cursor.executemany("INSERT INTO Orders (customer_id, employee_id, order_date, total_amount, status, payment_method) VALUES (?, ?, ?, ?, ?, ?)", orders)
+                
+                # Order details
+                order_details = [
+                    (1, 1, 1, 5499.99, 5499.99),
+                    (2, 2, 1, 6799.99, 6799.99),
+                    (2, 6, 1, 8999.99, 8999.99),
+                    (3, 3, 1, 2999.99, 2999.99),
+                    (4, 1, 2, 5499.99, 10999.98),
+                    (5, 9, 2, 1899.99, 3799.98),
+                    (5, 7, 2, 499.99, 999.98)
+                ]
+                cursor.executemany("INSERT INTO OrderDetails (order_id, product_id, quantity, unit_price, subtotal) VALUES (?, ?, ?, ?, ?)", order_details)
     
     def apply_styles(self):
         """Apply consistent styling to all UI components."""
@@ -441,9 +3752,10 @@ class ShoeShopManagementSystem:
         stats_frame_top = tk.Frame(dashboard_frame, bg=self.colors['background'])
         stats_frame_top.pack(fill='x', padx=20, pady=10)
         
-        total_products, total_customers, total_orders, low_stock = self.get_dashboard_stats()
-        total_revenue = self.get_total_revenue()
-        avg_order_value = self.get_avg_order_value()
+        stats = self.get_dashboard_snapshot()
+        total_products, total_customers = stats['total_products'], stats['total_customers']
+        total_orders, low_stock = stats['total_orders'], stats['low_stock']
+        total_revenue, avg_order_value = stats['total_revenue'], stats['avg_order_value']
         
         stats_data_top = [
             ("Total Products", f"{total_products}", "+12%", self.colors['chart1']),
@@ -535,111 +3847,78 @@ class ShoeShopManagementSystem:
         
         self.recent_tree.pack(side='left', fill='both', expand=True)
         scrollbar.pack(side='right', fill='y')
+        self.recent_rows = TreeviewSync(self.recent_tree)
         
         self.load_recent_orders()
     
-    def get_dashboard_stats(self):
+    def get_dashboard_snapshot(self):
         """
-        Retrieve key performance indicators for dashboard.
+        Retrieve every dashboard KPI with a single query.
         
         Returns:
-            tuple: (total_products, total_customers, total_orders, low_stock)
+            dict: KPIs as returned by ShopServices.dashboard
         """
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT COUNT(*) FROM Products")
-        total_products = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM Customers")
-        total_customers = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM Orders")
-        total_orders = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM Inventory WHERE quantity < min_stock_level")
-        low_stock = cursor.fetchone()[0]
-        
-        conn.close()
-        return total_products, total_customers, total_orders, low_stock
+        return self.services.dashboard()
+    
+    def load_recent_orders(self):
+        """Load the 10 most recent orders into dashboard table."""
+        self.tasks.submit(self.fetch_recent_orders, on_done=self.display_recent_orders, lane='dashboard')
     
-    def get_total_revenue(self):
+    def fetch_recent_orders(self):
         """
-        Calculate total revenue from completed orders.
+        Retrieve the 10 most recent orders.
         
         Returns:
-            float: Total revenue amount
+            list: (order_id, customer, order_date, total_amount, status) rows
         """
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT COALESCE(SUM(total_amount), 0) FROM Orders WHERE status = 'Completed'")
-        total_revenue = cursor.fetchone()[0] or 0
+        return self.services.orders.recent(10)
+    
+    def display_recent_orders(self, rows):
+        """
+        Show orders in the dashboard's recent orders table.
         
-        conn.close()
-        return float(total_revenue)
+        Args:
+            rows: Rows in the shape returned by fetch_recent_orders
+        """
+        self.recent_rows.sync(
+            (order_id, customer, date, f"₱{amount:,.2f}", status)
+            for order_id, customer, date, amount, status in rows
+        )
+    
+    def refresh_dashboard(self):
+        """Refresh all dashboard statistics and data displays."""
+        self.tasks.submit(self.fetch_dashboard, on_done=self.display_dashboard, lane='dashboard')
     
-    def get_avg_order_value(self):
+    def fetch_dashboard(self):
         """
-        Calculate average value of completed orders.
+        Retrieve everything the dashboard shows. Safe to call from a worker thread.
         
         Returns:
-            float: Average order value
+            tuple: (KPI dict from get_dashboard_snapshot, recent order rows)
         """
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT COALESCE(AVG(total_amount), 0) FROM Orders WHERE status = 'Completed'")
-        avg_value = cursor.fetchone()[0] or 0
-        
-        conn.close()
-        return float(avg_value)
+        return self.get_dashboard_snapshot(), self.fetch_recent_orders()
     
-    def load_recent_orders(self):
-        """Load the 10 most recent orders into dashboard table."""
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT o.order_id, 
-                   c.first_name || ' ' || c.last_name as customer,
-                   o.order_date,
-                   o.total_amount,
-                   o.status
-            FROM Orders o
-            JOIN Customers c ON o.customer_id = c.customer_id
-            ORDER BY o.order_date DESC
-            LIMIT 10
-        ''')
-        
-        for item in self.recent_tree.get_children():
-            self.recent_tree.delete(item)
-        
-        for row in cursor.fetchall():
-            order_id, customer, date, amount, status = row
-            self.recent_tree.insert('', 'end', values=(
-                order_id, customer, date, f"₱{amount:,.2f}", status
-            ))
+    def display_dashboard(self, data):
+        """
+        Update the KPI cards and recent orders table.
         
-        conn.close()
-    
-    def refresh_dashboard(self):
-        """Refresh all dashboard statistics and data displays."""
-        total_products, total_customers, total_orders, low_stock = self.get_dashboard_stats()
-        total_revenue = self.get_total_revenue()
-        avg_order_value = self.get_avg_order_value()
+        Args:
+            data: Tuple in the shape returned by fetch_dashboard
+        """
+        stats, recent_orders = data
         
         if hasattr(self, 'stats_value_labels'):
-            stats_values = [total_products, total_customers, total_orders, low_stock]
+            stats_values = [stats['total_products'], stats['total_customers'],
+                            stats['total_orders'], stats['low_stock']]
             for i, value in enumerate(stats_values):
                 self.stats_value_labels[i].config(text=str(value))
         
         if hasattr(self, 'revenue_label'):
-            self.revenue_label.config(text=f"₱{total_revenue:,.2f}")
+            self.revenue_label.config(text=f"₱{stats['total_revenue']:,.2f}")
         if hasattr(self, 'avg_order_label'):
-            self.avg_order_label.config(text=f"₱{avg_order_value:,.2f}")
+            self.avg_order_label.config(text=f"₱{stats['avg_order_value']:,.2f}")
         
-        self.load_recent_orders()
+        self.display_recent_orders(recent_orders)
     
     def create_products_section(self):
         """Create product management interface with CRUD operations."""
@@ -762,6 +4041,10 @@ class ShoeShopManagementSystem:
         self.product_tree.pack(fill='both', expand=True)
         
         self.product_tree.bind('<<TreeviewSelect>>', self.on_product_select)
+        self.product_table = VirtualTable(
+            self.product_tree, scrollbar,
+            lambda row: (row[0], row[1], row[2], row[3], row[4], f"₱{row[5]:,.2f}", row[6]),
+            runner=self.tasks)
     
     def get_categories(self):
         """
@@ -770,88 +4053,99 @@ class ShoeShopManagementSystem:
         Returns:
             list: Category names
         """
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute("SELECT category_name FROM Categories")
-        categories = [row[0] for row in cursor.fetchall()]
-        conn.close()
-        return categories
+        return self.services.products.categories()
+    
+    def show_listing(self, table, listing, list_name):
+        """
+        Show a paged listing unless the table already shows it unchanged.
+        
+        The write counters are read on the search lane first, so switching
+        back to a tab whose tables nobody wrote to costs that one read
+        instead of a count and a page.
+        
+        Args:
+            table: VirtualTable to fill
+            listing: KeysetQuery to show
+            list_name: CatalogVersions counter covering the listing's tables
+        """
+        shown = table.source
+        
+        def done(versions):
+            if table.source is not shown:
+                # Something else was shown meanwhile
+                return
+            version = versions.get(list_name)
+            if shown is listing and version is not None and self.shown_versions.get(list_name) == version:
+                return
+            # Read before the rows, so a write in between reloads next time
+            self.shown_versions[list_name] = version
+            table.show(listing)
+        
+        # Counted and paged on the search lane, so a search typed afterwards lands after it
+        self.tasks.submit(self.catalog.written_versions, on_done=done,
+                          on_error=lambda error: table.show(listing), lane='search')
     
     def load_products(self):
         """Load all products into the product management table."""
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
+        self.product_search.cancel()
+        self.show_listing(self.product_table, self.services.products.listing, 'products')
+    
+    def display_products(self, result):
+        """
+        Show the full product listing or a list of search results.
         
-        cursor.execute('''
-            SELECT p.product_id, p.product_name, p.brand, p.size, p.color, p.price, c.category_name
-            FROM Products p
-            LEFT JOIN Categories c ON p.category_id = c.category_id
-            ORDER BY p.product_id
-        ''')
+        Args:
+            result: KeysetQuery listing, or (product_id, product_name, brand,
+                size, color, price, category_name) rows
+        """
+        self.product_table.show(result)
+    
+    def show_error(self, error):
+        """
+        Report a failed operation to the user.
+        
+        Args:
+            error: ShopError from the service layer, or any other exception
+        """
+        if isinstance(error, InsufficientStockError):
+            messagebox.showerror("Insufficient Stock", str(error))
+        elif isinstance(error, ShopError):
+            messagebox.showerror("Error", str(error))
+        else:
+            messagebox.showerror("Error", f"An error occurred: {str(error)}")
+    
+    def product_form_values(self):
+        """
+        Read the product form.
         
-        if hasattr(self, 'product_tree'):
-            for item in self.product_tree.get_children():
-                self.product_tree.delete(item)
+        Returns:
+            dict: Keyword arguments for ProductService.add and update
+        """
+        return {
+            'product_name': self.product_vars['product_name'].get(),
+            'category_name': self.product_vars['category_id'].get(),
+            'brand': self.product_vars['brand'].get(),
+            'size': self.product_vars['size'].get(),
+            'color': self.product_vars['color'].get(),
+            'gender': self.product_vars['gender'].get(),
+            'price': self.product_vars['price'].get(),
+            'cost_price': self.product_vars['cost_price'].get(),
+            'description': self.product_vars['description'].get("1.0", "end-1c"),
+        }
+    
+    def add_product(self):
+        """Add new product to database with inventory initialization."""
+        values = self.product_form_values()
         
-        for row in cursor.fetchall():
-            self.product_tree.insert('', 'end', values=(
-                row[0], row[1], row[2], row[3], row[4], f"₱{row[5]:,.2f}", row[6]
-            ))
+        def done(product_id):
+            messagebox.showinfo("Success", "Product added successfully!")
+            self.clear_product_form()
+            self.load_products()
+            if self.current_active_nav == 'Dashboard':
+                self.refresh_dashboard()
         
-        conn.close()
-    
-    def add_product(self):
-        """Add new product to database with inventory initialization."""
-        try:
-            product_name = self.product_vars['product_name'].get()
-            category_name = self.product_vars['category_id'].get()
-            brand = self.product_vars['brand'].get()
-            size = self.product_vars['size'].get()
-            color = self.product_vars['color'].get()
-            gender = self.product_vars['gender'].get()
-            price = float(self.product_vars['price'].get())
-            cost_price = float(self.product_vars['cost_price'].get())
-            description = self.product_vars['description'].get("1.0", "end-1c")
-            
-            if not product_name:
-                messagebox.showerror("Error", "Product name is required!")
-                return
-            
-            conn = sqlite3.connect(self.db_name)
-            cursor = conn.cursor()
-            cursor.execute("SELECT category_id FROM Categories WHERE category_name = ?", (category_name,))
-            result = cursor.fetchone()
-            
-            if result:
-                category_id = result[0]
-                
-                cursor.execute('''
-                    INSERT INTO Products (product_name, category_id, brand, size, color, gender, price, cost_price, description)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (product_name, category_id, brand, size, color, gender, price, cost_price, description))
-                
-                product_id = cursor.lastrowid
-                
-                cursor.execute('''
-                    INSERT INTO Inventory (product_id, quantity, last_restocked, min_stock_level)
-                    VALUES (?, 0, CURRENT_DATE, 10)
-                ''', (product_id,))
-                
-                conn.commit()
-                conn.close()
-                
-                messagebox.showinfo("Success", "Product added successfully!")
-                self.clear_product_form()
-                self.load_products()
-                if self.current_active_nav == 'Dashboard':
-                    self.refresh_dashboard()
-            else:
-                messagebox.showerror("Error", "Category not found!")
-                
-        except ValueError:
-            messagebox.showerror("Error", "Please enter valid numeric values for price!")
-        except Exception as e:
-            messagebox.showerror("Error", f"An error occurred: {str(e)}")
+        self.tasks.submit(lambda: self.services.products.add(**values), on_done=done,
+                          on_error=self.show_error, busy="Saving product...", key='product')
     
     def on_product_select(self, event):
         """
@@ -874,24 +4168,18 @@ class ShoeShopManagementSystem:
             price_str = values[5].replace('₱', '').replace(',', '')
             self.product_vars['price'].set(price_str)
             
-            conn = sqlite3.connect(self.db_name)
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT c.category_name, p.gender, p.cost_price, p.description
-                FROM Products p
-                LEFT JOIN Categories c ON p.category_id = c.category_id
-                WHERE p.product_id = ?
-            ''', (values[0],))
-            
-            result = cursor.fetchone()
-            if result:
-                self.product_vars['category_id'].set(result[0])
-                self.product_vars['gender'].set(result[1])
-                self.product_vars['cost_price'].set(str(result[2]))
+            def done(product):
+                # Skip if another row was selected meanwhile
+                if self.product_tree.selection() != selected_item:
+                    return
+                self.product_vars['category_id'].set(product['category_name'])
+                self.product_vars['gender'].set(product['gender'])
+                self.product_vars['cost_price'].set(str(product['cost_price']))
                 self.product_vars['description'].delete("1.0", "end")
-                self.product_vars['description'].insert("1.0", result[3] if result[3] else "")
+                self.product_vars['description'].insert("1.0", product['description'] or "")
             
-            conn.close()
+            self.tasks.submit(self.services.products.get, values[0], on_done=done,
+                              on_error=lambda error: None if isinstance(error, NotFoundError) else self.show_error(error))
     
     def update_product(self):
         """Update selected product information in database."""
@@ -900,49 +4188,15 @@ class ShoeShopManagementSystem:
             messagebox.showerror("Error", "Please select a product to update!")
             return
         
-        try:
-            product_id = self.product_tree.item(selected_item[0], 'values')[0]
-            product_name = self.product_vars['product_name'].get()
-            category_name = self.product_vars['category_id'].get()
-            brand = self.product_vars['brand'].get()
-            size = self.product_vars['size'].get()
-            color = self.product_vars['color'].get()
-            gender = self.product_vars['gender'].get()
-            price = float(self.product_vars['price'].get())
-            cost_price = float(self.product_vars['cost_price'].get())
-            description = self.product_vars['description'].get("1.0", "end-1c")
-            
-            if not product_name:
-                messagebox.showerror("Error", "Product name is required!")
-                return
-            
-            conn = sqlite3.connect(self.db_name)
-            cursor = conn.cursor()
-            cursor.execute("SELECT category_id FROM Categories WHERE category_name = ?", (category_name,))
-            result = cursor.fetchone()
-            
-            if result:
-                category_id = result[0]
-                
-                cursor.execute('''
-                    UPDATE Products 
-                    SET product_name = ?, category_id = ?, brand = ?, size = ?, color = ?, 
-                        gender = ?, price = ?, cost_price = ?, description = ?
-                    WHERE product_id = ?
-                ''', (product_name, category_id, brand, size, color, gender, price, cost_price, description, product_id))
-                
-                conn.commit()
-                conn.close()
-                
-                messagebox.showinfo("Success", "Product updated successfully!")
-                self.load_products()
-            else:
-                messagebox.showerror("Error", "Category not found!")
-                
-        except ValueError:
-            messagebox.showerror("Error", "Please enter valid numeric values for price!")
-        except Exception as e:
-            messagebox.showerror("Error", f"An error occurred: {str(e)}")
+        product_id = self.product_tree.item(selected_item[0], 'values')[0]
+        values = self.product_form_values()
+        
+        def done(_):
+            messagebox.showinfo("Success", "Product updated successfully!")
+            self.load_products()
+        
+        self.tasks.submit(lambda: self.services.products.update(product_id, **values), on_done=done,
+                          on_error=self.show_error, busy="Saving product...", key='product')
     
     def delete_product(self):
         """Delete selected product from database with validation."""
@@ -954,26 +4208,15 @@ class ShoeShopManagementSystem:
         if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this product?"):
             product_id = self.product_tree.item(selected_item[0], 'values')[0]
             
-            conn = sqlite3.connect(self.db_name)
-            cursor = conn.cursor()
-            
-            try:
-                cursor.execute("DELETE FROM Inventory WHERE product_id = ?", (product_id,))
-                cursor.execute("DELETE FROM Products WHERE product_id = ?", (product_id,))
-                
-                conn.commit()
-                conn.close()
-                
+            def done(_):
                 messagebox.showinfo("Success", "Product deleted successfully!")
                 self.clear_product_form()
                 self.load_products()
                 if self.current_active_nav == 'Dashboard':
                     self.refresh_dashboard()
-                
-            except sqlite3.IntegrityError:
-                messagebox.showerror("Error", "Cannot delete product with existing orders!")
-                conn.rollback()
-                conn.close()
+            
+            self.tasks.submit(self.services.products.delete, product_id, on_done=done,
+                              on_error=self.show_error, busy="Deleting product...", key='product')
     
     def clear_product_form(self):
         """Clear all product form fields."""
@@ -984,29 +4227,22 @@ class ShoeShopManagementSystem:
                 var.delete("1.0", "end")
     
     def search_products(self):
-        """Search products based on user input."""
-        search_term = self.search_var.get().lower()
-        
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT p.product_id, p.product_name, p.brand, p.size, p.color, p.price, c.category_name
-            FROM Products p
-            LEFT JOIN Categories c ON p.category_id = c.category_id
-            WHERE LOWER(p.product_name) LIKE ? OR LOWER(p.brand) LIKE ? OR LOWER(c.category_name) LIKE ?
-            ORDER BY p.product_id
-        ''', (f'%{search_term}%', f'%{search_term}%', f'%{search_term}%'))
+        """Schedule a product search for the current search box text."""
+        self.product_search.schedule()
+    
+    def query_products(self, search_text):
+        """
+        Search products by name, brand or category using the FTS index.
         
-        for item in self.product_tree.get_children():
-            self.product_tree.delete(item)
+        Safe to call from the search worker thread.
         
-        for row in cursor.fetchall():
-            self.product_tree.insert('', 'end', values=(
-                row[0], row[1], row[2], row[3], row[4], f"₱{row[5]:,.2f}", row[6]
-            ))
+        Args:
+            search_text: Raw search box text
         
-        conn.close()
+        Returns:
+            Matching rows, best match first, or the full listing when empty
+        """
+        return self.services.products.search(search_text)
     
     def create_customers_section(self):
         """Create customer management interface with CRUD operations."""
@@ -1114,59 +4350,51 @@ class ShoeShopManagementSystem:
         self.customer_tree.pack(fill='both', expand=True)
         
         self.customer_tree.bind('<<TreeviewSelect>>', self.on_customer_select)
+        self.customer_table = VirtualTable(self.customer_tree, scrollbar, runner=self.tasks)
     
     def load_customers(self):
         """Load all customers into the customer management table."""
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT customer_id, first_name, last_name, email, phone, registration_date
-            FROM Customers
-            ORDER BY customer_id
-        ''')
-        
-        if hasattr(self, 'customer_tree'):
-            for item in self.customer_tree.get_children():
-                self.customer_tree.delete(item)
+        self.customer_search.cancel()
+        self.show_listing(self.customer_table, self.services.customers.listing, 'customers')
+    
+    def display_customers(self, result):
+        """
+        Show the full customer listing or a list of search results.
         
-        for row in cursor.fetchall():
-            self.customer_tree.insert('', 'end', values=row)
+        Args:
+            result: KeysetQuery listing, or (customer_id, first_name, last_name,
+                email, phone, registration_date) rows
+        """
+        self.customer_table.show(result)
+    
+    def customer_form_values(self):
+        """
+        Read the customer form.
         
-        conn.close()
+        Returns:
+            dict: Keyword arguments for CustomerService.add and update
+        """
+        return {
+            'first_name': self.customer_vars['first_name'].get(),
+            'last_name': self.customer_vars['last_name'].get(),
+            'email': self.customer_vars['email'].get(),
+            'phone': self.customer_vars['phone'].get(),
+            'address': self.customer_vars['address'].get("1.0", "end-1c"),
+        }
     
     def add_customer(self):
         """Add new customer to database."""
-        try:
-            first_name = self.customer_vars['first_name'].get()
-            last_name = self.customer_vars['last_name'].get()
-            email = self.customer_vars['email'].get()
-            phone = self.customer_vars['phone'].get()
-            address = self.customer_vars['address'].get("1.0", "end-1c")
-            
-            if not first_name or not last_name:
-                messagebox.showerror("Error", "First and last name are required!")
-                return
-            
-            conn = sqlite3.connect(self.db_name)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO Customers (first_name, last_name, email, phone, address)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (first_name, last_name, email, phone, address))
-            
-            conn.commit()
-            conn.close()
-            
+        values = self.customer_form_values()
+        
+        def done(customer_id):
             messagebox.showinfo("Success", "Customer added successfully!")
             self.clear_customer_form()
             self.load_customers()
             if self.current_active_nav == 'Dashboard':
                 self.refresh_dashboard()
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"An error occurred: {str(e)}")
+        
+        self.tasks.submit(lambda: self.services.customers.add(**values), on_done=done,
+                          on_error=self.show_error, busy="Saving customer...", key='customer')
     
     def on_customer_select(self, event):
         """
@@ -1186,16 +4414,15 @@ class ShoeShopManagementSystem:
             self.customer_vars['email'].set(values[3])
             self.customer_vars['phone'].set(values[4])
             
-            conn = sqlite3.connect(self.db_name)
-            cursor = conn.cursor()
-            cursor.execute("SELECT address FROM Customers WHERE customer_id = ?", (values[0],))
-            result = cursor.fetchone()
-            
-            if result and result[0]:
+            def done(customer):
+                # Skip if another row was selected meanwhile
+                if self.customer_tree.selection() != selected_item or not customer['address']:
+                    return
                 self.customer_vars['address'].delete("1.0", "end")
-                self.customer_vars['address'].insert("1.0", result[0])
+                self.customer_vars['address'].insert("1.0", customer['address'])
             
-            conn.close()
+            self.tasks.submit(self.services.customers.get, values[0], on_done=done,
+                              on_error=lambda error: None if isinstance(error, NotFoundError) else self.show_error(error))
     
     def update_customer(self):
         """Update selected customer information in database."""
@@ -1204,35 +4431,15 @@ class ShoeShopManagementSystem:
             messagebox.showerror("Error", "Please select a customer to update!")
             return
         
-        try:
-            customer_id = self.customer_tree.item(selected_item[0], 'values')[0]
-            first_name = self.customer_vars['first_name'].get()
-            last_name = self.customer_vars['last_name'].get()
-            email = self.customer_vars['email'].get()
-            phone = self.customer_vars['phone'].get()
-            address = self.customer_vars['address'].get("1.0", "end-1c")
-            
-            if not first_name or not last_name:
-                messagebox.showerror("Error", "First and last name are required!")
-                return
-            
-            conn = sqlite3.connect(self.db_name)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                UPDATE Customers 
-                SET first_name = ?, last_name = ?, email = ?, phone = ?, address = ?
-                WHERE customer_id = ?
-            ''', (first_name, last_name, email, phone, address, customer_id))
-            
-            conn.commit()
-            conn.close()
-            
+        customer_id = self.customer_tree.item(selected_item[0], 'values')[0]
+        values = self.customer_form_values()
+        
+        def done(_):
             messagebox.showinfo("Success", "Customer updated successfully!")
             self.load_customers()
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"An error occurred: {str(e)}")
+        
+        self.tasks.submit(lambda: self.services.customers.update(customer_id, **values), on_done=done,
+                          on_error=self.show_error, busy="Saving customer...", key='customer')
     
     def delete_customer(self):
         """Delete selected customer from database with order validation."""
@@ -1244,32 +4451,15 @@ class ShoeShopManagementSystem:
         if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this customer?"):
             customer_id = self.customer_tree.item(selected_item[0], 'values')[0]
             
-            conn = sqlite3.connect(self.db_name)
-            cursor = conn.cursor()
-            
-            try:
-                cursor.execute("SELECT COUNT(*) FROM Orders WHERE customer_id = ?", (customer_id,))
-                order_count = cursor.fetchone()[0]
-                
-                if order_count > 0:
-                    messagebox.showerror("Error", "Cannot delete customer with existing orders!")
-                    return
-                
-                cursor.execute("DELETE FROM Customers WHERE customer_id = ?", (customer_id,))
-                
-                conn.commit()
-                conn.close()
-                
+            def done(_):
                 messagebox.showinfo("Success", "Customer deleted successfully!")
                 self.clear_customer_form()
                 self.load_customers()
                 if self.current_active_nav == 'Dashboard':
                     self.refresh_dashboard()
-                
-            except Exception as e:
-                messagebox.showerror("Error", f"An error occurred: {str(e)}")
-                conn.rollback()
-                conn.close()
+            
+            self.tasks.submit(self.services.customers.delete, customer_id, on_done=done,
+                              on_error=self.show_error, busy="Deleting customer...", key='customer')
     
     def clear_customer_form(self):
         """Clear all customer form fields."""
@@ -1280,26 +4470,22 @@ class ShoeShopManagementSystem:
                 var.delete("1.0", "end")
     
     def search_customers(self):
-        """Search customers based on user input."""
-        search_term = self.customer_search_var.get().lower()
-        
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT customer_id, first_name, last_name, email, phone, registration_date
-            FROM Customers
-            WHERE LOWER(first_name) LIKE ? OR LOWER(last_name) LIKE ? OR LOWER(email) LIKE ?
-            ORDER BY customer_id
-        ''', (f'%{search_term}%', f'%{search_term}%', f'%{search_term}%'))
+        """Schedule a customer search for the current search box text."""
+        self.customer_search.schedule()
+    
+    def query_customers(self, search_text):
+        """
+        Search customers by name or email using the FTS index.
         
-        for item in self.customer_tree.get_children():
-            self.customer_tree.delete(item)
+        Safe to call from the search worker thread.
         
-        for row in cursor.fetchall():
-            self.customer_tree.insert('', 'end', values=row)
+        Args:
+            search_text: Raw search box text
         
-        conn.close()
+        Returns:
+            Matching rows, best match first, or the full listing when empty
+        """
+        return self.services.customers.search(search_text)
     
     def create_orders_section(self):
         """Create order management interface with cart functionality."""
@@ -1328,6 +4514,7 @@ class ShoeShopManagementSystem:
         self.order_customer_var = tk.StringVar()
         self.order_customer_combo = ttk.Combobox(form_frame, textvariable=self.order_customer_var, width=30)
         self.order_customer_combo.grid(row=0, column=1, padx=5, pady=5)
+        self.bind_typeahead(self.order_customer_combo, self.order_customer_var, self.catalog.customer_index)
         
         tk.Label(form_frame, text="Status:", bg=self.colors['card_bg'], 
                 fg=self.colors['text_dark']).grid(row=1, column=0, sticky='w', pady=5)
@@ -1356,6 +4543,7 @@ class ShoeShopManagementSystem:
         self.order_product_var = tk.StringVar()
         self.order_product_combo = ttk.Combobox(product_frame, textvariable=self.order_product_var, width=25)
         self.order_product_combo.grid(row=0, column=1, padx=5, pady=5)
+        self.bind_typeahead(self.order_product_combo, self.order_product_var, self.catalog.product_index)
         
         tk.Label(product_frame, text="Quantity:", bg=self.colors['card_bg'], 
                 fg=self.colors['text_dark']).grid(row=1, column=0, sticky='w', pady=5)
@@ -1410,6 +4598,7 @@ class ShoeShopManagementSystem:
         order_buttons = [
             ("Create Order", self.create_order, self.button_colors['add'], self.button_colors['add_hover']),
             ("Clear Order", self.clear_order, self.button_colors['clear'], self.button_colors['clear_hover']),
+            ("Set Quantity", self.change_order_item_quantity, self.button_colors['update'], self.button_colors['update_hover']),
             ("Remove Item", self.remove_order_item, self.button_colors['delete'], self.button_colors['delete_hover'])
         ]
         
@@ -1426,79 +4615,130 @@ class ShoeShopManagementSystem:
             
             btn.config(highlightbackground=color, highlightthickness=1)
         
-        self.order_items = []
-    
-    def load_order_customers(self):
-        """Load customer list for order creation dropdown."""
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute("SELECT first_name || ' ' || last_name FROM Customers")
-        customers = [row[0] for row in cursor.fetchall()]
-        conn.close()
-        if hasattr(self, 'order_customer_combo'):
-            self.order_customer_combo['values'] = customers
-    
-    def load_order_products(self):
-        """Load product list for order creation dropdown."""
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute("SELECT product_id, product_name, price FROM Products")
-        products = cursor.fetchall()
-        conn.close()
-        
-        self.product_info = {}
-        product_names = []
-        
-        for product_id, product_name, price in products:
-            display_name = f"{product_name} (₱{price:,.2f})"
-            product_names.append(display_name)
-            self.product_info[display_name] = (product_id, product_name, price)
-        
-        if hasattr(self, 'order_product_combo'):
-            self.order_product_combo['values'] = product_names
+        self.order_cart = OrderCart()
+    
+    def load_order_choices(self):
+        """Load the customer and product suggestions for the order form from the catalog cache."""
+        def load():
+            # One read of the write counters; unchanged lists come from memory
+            self.catalog.drop_changed()
+            return self.catalog.customer_index(), self.catalog.product_choices()[1], self.catalog.product_index()
+        
+        def done(result):
+            customer_index, self.product_info, product_index = result
+            if hasattr(self, 'order_customer_combo'):
+                self.order_customer_combo['values'] = customer_index.search(self.order_customer_var.get())
+                self.order_product_combo['values'] = product_index.search(self.order_product_var.get())
+        
+        # A stale cache is reloaded and indexed on the worker
+        self.tasks.submit(load, on_done=done)
+    
+    def bind_typeahead(self, combo, var, get_index):
+        """
+        Narrow a combobox's dropdown to the top matches as the user types.
+        
+        Args:
+            combo: ttk.Combobox to filter
+            var: StringVar bound to the combobox
+            get_index: Returns the current PrefixIndex of the choices; called
+                with load=False on the Tk thread, where it returns None when
+                the index is stale
+        """
+        navigation_keys = {'Up', 'Down', 'Return', 'KP_Enter', 'Escape', 'Tab'}
+        
+        def fill(index):
+            combo['values'] = index.search(var.get())
+        
+        def on_key(event):
+            if event.keysym in navigation_keys:
+                return
+            index = get_index(load=False)
+            if index is not None:
+                fill(index)
+            else:
+                # Rebuild on a worker; the dropdown follows whatever was typed meanwhile
+                self.tasks.submit(get_index, on_done=fill, key=('typeahead', str(combo)))
+        
+        combo.bind('<KeyRelease>', on_key)
     
     def add_product_to_order(self):
         """Add selected product to current order with quantity validation."""
         product_display = self.order_product_var.get()
-        quantity_str = self.order_quantity_var.get()
         
         if not product_display:
             messagebox.showerror("Error", "Please select a product!")
             return
         
         try:
-            quantity = int(quantity_str)
-            if quantity <= 0:
-                messagebox.showerror("Error", "Quantity must be positive!")
-                return
-            
-            product_id, product_name, unit_price = self.product_info[product_display]
-            subtotal = unit_price * quantity
-            
-            self.order_items.append({
-                'product_id': product_id,
-                'product_name': product_name,
-                'quantity': quantity,
-                'unit_price': unit_price,
-                'subtotal': subtotal
-            })
-            
-            self.order_items_tree.insert('', 'end', values=(
-                product_id, product_name, quantity, f"₱{unit_price:,.2f}", f"₱{subtotal:,.2f}"
-            ))
-            
+            quantity = _to_quantity(self.order_quantity_var.get())
+        except ShopError as e:
+            self.show_error(e)
+            return
+        
+        def reserve():
+            # The choices may need a reload, so they are resolved off the Tk thread
+            info = self.catalog.product_choices()[1]
+            if product_display not in info:
+                raise ValidationError("Please choose a product from the suggestions!")
+            product_id = info[product_display][0]
+            self.services.orders.reserve(self.session_id, product_id, quantity)
+            return info, info[product_display]
+        
+        def done(result):
+            self.product_info, (product_id, product_name, unit_price) = result
+            iid, line, merged = self.order_cart.add(product_id, product_name, unit_price, quantity)
+            self.show_order_line(iid, line, merged)
             self.update_order_total()
-            
             self.order_product_var.set('')
             self.order_quantity_var.set('1')
-            
-        except ValueError:
-            messagebox.showerror("Error", "Please enter a valid quantity!")
+        
+        # Cart tasks share the 'db' lane, so they reserve and land in click order
+        self.tasks.submit(reserve, on_done=done, on_error=self.show_error)
+    
+    def show_order_line(self, iid, line, existing=True):
+        """
+        Insert or refresh one cart line in the order items table.
+        
+        Args:
+            iid: Line's Treeview iid
+            line: Line dict from the cart
+            existing: Whether the row is already in the table
+        """
+        values = (line['product_id'], line['product_name'], line['quantity'],
+                  f"₱{line['unit_price']:,.2f}", f"₱{line['subtotal']:,.2f}")
+        if existing:
+            self.order_items_tree.item(iid, values=values)
+        else:
+            self.order_items_tree.insert('', 'end', iid=iid, values=values)
     
     def update_order_total(self):
-        """Recalculate and update order total amount."""
-        total = sum(item['subtotal'] for item in self.order_items)
-        self.order_total_var.set(f"Total: ₱{total:,.2f}")
+        """Show the cart's running total."""
+        self.order_total_var.set(f"Total: ₱{self.order_cart.total:,.2f}")
+    
+    def change_order_item_quantity(self):
+        """Set the selected line's quantity to the value in the quantity box."""
+        selected_item = self.order_items_tree.selection()
+        if not selected_item:
+            messagebox.showerror("Error", "Please select an item to change!")
+            return
+        
+        iid = selected_item[0]
+        product_id = self.order_cart.line(iid)['product_id']
+        try:
+            quantity = _to_quantity(self.order_quantity_var.get())
+        except ShopError as e:
+            self.show_error(e)
+            return
+        
+        def done(resized):
+            if resized and iid in self.order_cart:
+                self.show_order_line(iid, self.order_cart.set_quantity(iid, quantity))
+                self.update_order_total()
+        
+        # Cart tasks run in click order on the 'db' lane and the cart only
+        # changes in their callbacks, so the held units always match it
+        self.tasks.submit(self.services.orders.resize, self.session_id, product_id, quantity,
+                          on_done=done, on_error=self.show_error)
     
     def remove_order_item(self):
         """Remove selected item from current order."""
@@ -1507,82 +4747,62 @@ class ShoeShopManagementSystem:
             messagebox.showerror("Error", "Please select an item to remove!")
             return
         
-        index = self.order_items_tree.index(selected_item[0])
-        self.order_items.pop(index)
-        self.order_items_tree.delete(selected_item[0])
-        self.update_order_total()
+        iid = selected_item[0]
+        
+        def done(_):
+            if iid in self.order_cart:
+                self.order_cart.remove(iid)
+                self.order_items_tree.delete(iid)
+                self.update_order_total()
+        
+        # Queued behind any pending change to the line, so nothing it
+        # reserves is left held
+        self.tasks.submit(self.services.orders.release, self.session_id, self.order_cart.line(iid)['product_id'],
+                          on_done=done, on_error=self.show_error)
+    
+    def keep_cart_alive(self):
+        """Refresh the cart's reservations while it has lines, then reschedule."""
+        def failed(error):
+            # Locked or busy: the next heartbeat tries again
+            if not isinstance(error, sqlite3.Error):
+                raise error
+        
+        if len(self.order_cart):
+            self.tasks.submit(self.services.orders.keep_alive, self.session_id, on_error=failed)
+        self.root.after(RESERVATION_HEARTBEAT_MINUTES * 60000, self.keep_cart_alive)
     
     def clear_order(self):
-        """Clear current order and reset form."""
-        self.order_items = []
-        for item in self.order_items_tree.get_children():
-            self.order_items_tree.delete(item)
-        self.update_order_total()
+        """Clear current order, return its reserved stock and reset form."""
+        def done(_):
+            # After any pending add, so a line it brings is cleared as well
+            self.order_cart.clear()
+            self.order_items_tree.delete(*self.order_items_tree.get_children())
+            self.update_order_total()
+        
+        self.tasks.submit(self.services.orders.release, self.session_id, on_done=done, on_error=self.show_error)
         self.order_customer_var.set('')
         self.order_status_var.set('Pending')
         self.order_payment_var.set('Cash')
     
     def create_order(self):
         """Process and save complete order to database."""
-        if not self.order_customer_var.get():
-            messagebox.showerror("Error", "Please select a customer!")
-            return
-        
-        if not self.order_items:
-            messagebox.showerror("Error", "Order must have at least one item!")
-            return
-        
-        try:
-            customer_name = self.order_customer_var.get()
-            first_name, last_name = customer_name.split(' ', 1)
-            
-            conn = sqlite3.connect(self.db_name)
-            cursor = conn.cursor()
-            
-            cursor.execute("SELECT customer_id FROM Customers WHERE first_name = ? AND last_name = ?", 
-                         (first_name, last_name))
-            customer_result = cursor.fetchone()
-            
-            if not customer_result:
-                messagebox.showerror("Error", "Customer not found!")
-                return
-            
-            customer_id = customer_result[0]
-            
-            cursor.execute("SELECT employee_id FROM Employees LIMIT 1")
-            employee_result = cursor.fetchone()
-            employee_id = employee_result[0] if employee_result else 1
-            
-            total = sum(item['subtotal'] for item in self.order_items)
-            
-            cursor.execute('''
-                INSERT INTO Orders (customer_id, employee_id, total_amount, status, payment_method)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (customer_id, employee_id, total, self.order_status_var.get(), self.order_payment_var.get()))
-            
-            order_id = cursor.lastrowid
-            
-            for item in self.order_items:
-                cursor.execute('''
-                    INSERT INTO OrderDetails (order_id, product_id, quantity, unit_price, subtotal)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (order_id, item['product_id'], item['quantity'], item['unit_price'], item['subtotal']))
-                
-                cursor.execute('''
-                    UPDATE Inventory 
-                    SET quantity = quantity - ?
-                    WHERE product_id = ?
-                ''', (item['quantity'], item['product_id']))
-            
-            conn.commit()
-            conn.close()
-            
+        customer_display = self.order_customer_var.get()
+        items = self.order_cart.items()
+        status, payment = self.order_status_var.get(), self.order_payment_var.get()
+        
+        def place():
+            # The choices may need a reload, so they are resolved off the Tk thread
+            customer_id = self.catalog.customer_choices()[1].get(customer_display)
+            if customer_display and customer_id is None:
+                raise ValidationError("Please choose a customer from the suggestions!")
+            return self.services.orders.place(customer_id, items, status, payment, self.session_id)
+        
+        def done(order_id):
             messagebox.showinfo("Success", f"Order created successfully! Order ID: {order_id}")
             self.refresh_dashboard()
             self.clear_order()
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"An error occurred: {str(e)}")
+        
+        self.tasks.submit(place, on_done=done, on_error=self.show_error, busy="Placing order...", key='order')
     
     def create_inventory_section(self):
         """Create inventory management interface with stock controls."""
@@ -1665,6 +4885,7 @@ class ShoeShopManagementSystem:
         self.inventory_tree.configure(yscrollcommand=scrollbar.set)
         scrollbar.pack(side='right', fill='y')
         self.inventory_tree.pack(fill='both', expand=True)
+        self.inventory_table = VirtualTable(self.inventory_tree, scrollbar, runner=self.tasks)
         
         bottom_frame = tk.Frame(inventory_frame, bg=self.colors['background'])
         bottom_frame.pack(fill='x', padx=20, pady=10)
@@ -1685,6 +4906,13 @@ class ShoeShopManagementSystem:
         restock_selected_btn.bind("<Enter>", lambda e, b=restock_selected_btn: b.config(bg=self.button_colors['add_hover']))
         restock_selected_btn.bind("<Leave>", lambda e, b=restock_selected_btn: b.config(bg=self.button_colors['add']))
         restock_selected_btn.config(highlightbackground=self.button_colors['add'], highlightthickness=1)
+        
+        tk.Label(bottom_frame, text="Restock All Target:", bg=self.colors['background'], 
+                fg=self.colors['text_dark']).pack(side='left', padx=5)
+        self.restock_policy_var = tk.StringVar(value=next(iter(RESTOCK_POLICY_LABELS)))
+        policy_combo = ttk.Combobox(bottom_frame, textvariable=self.restock_policy_var, 
+                                   values=list(RESTOCK_POLICY_LABELS), width=20, state='readonly')
+        policy_combo.pack(side='left', padx=5)
     
     def refresh_inventory(self):
         """Refresh inventory view and reset filters."""
@@ -1695,74 +4923,41 @@ class ShoeShopManagementSystem:
     
     def load_inventory(self):
         """Load inventory data with stock status indicators."""
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT i.inventory_id, p.product_name, p.brand, p.size, 
-                   i.quantity, i.min_stock_level,
-                   CASE 
-                     WHEN i.quantity = 0 THEN 'Out of Stock'
-                     WHEN i.quantity < i.min_stock_level THEN 'Low Stock'
-                     ELSE 'In Stock'
-                   END as status
-            FROM Inventory i
-            JOIN Products p ON i.product_id = p.product_id
-            ORDER BY i.inventory_id
-        ''')
-        
-        if hasattr(self, 'inventory_tree'):
-            for item in self.inventory_tree.get_children():
-                self.inventory_tree.delete(item)
-        
-        for row in cursor.fetchall():
-            self.inventory_tree.insert('', 'end', values=row)
+        self.inventory_search.cancel()
+        self.show_listing(self.inventory_table, self.services.inventory.listings['All'], 'inventory')
+    
+    def display_inventory(self, result):
+        """
+        Show an inventory listing or a list of search results.
         
-        conn.close()
+        Args:
+            result: KeysetQuery listing, or (inventory_id, product_name, brand,
+                size, quantity, min_stock_level, status) rows
+        """
+        self.inventory_table.show(result)
     
     def search_inventory(self):
-        """Search inventory with optional stock level filtering."""
-        search_term = self.inventory_search_var.get().lower()
-        filter_type = self.inventory_filter_var.get()
-        
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        
-        query = '''
-            SELECT i.inventory_id, p.product_name, p.brand, p.size, 
-                   i.quantity, i.min_stock_level,
-                   CASE 
-                     WHEN i.quantity = 0 THEN 'Out of Stock'
-                     WHEN i.quantity < i.min_stock_level THEN 'Low Stock'
-                     ELSE 'In Stock'
-                   END as status
-            FROM Inventory i
-            JOIN Products p ON i.product_id = p.product_id
-            WHERE (LOWER(p.product_name) LIKE ? OR LOWER(p.brand) LIKE ?)
-        '''
-        
-        params = [f'%{search_term}%', f'%{search_term}%']
-        
-        if filter_type == 'Low Stock':
-            query += ' AND i.quantity < i.min_stock_level AND i.quantity > 0'
-        elif filter_type == 'Out of Stock':
-            query += ' AND i.quantity = 0'
-        
-        query += ' ORDER BY i.inventory_id'
-        
-        cursor.execute(query, params)
+        """Schedule an inventory search for the current search box text and filter."""
+        self.inventory_search.schedule()
+    
+    def query_inventory(self, search_text, filter_type):
+        """
+        Search inventory by product name or brand with optional stock filtering.
         
-        for item in self.inventory_tree.get_children():
-            self.inventory_tree.delete(item)
+        Safe to call from the search worker thread.
         
-        for row in cursor.fetchall():
-            self.inventory_tree.insert('', 'end', values=row)
+        Args:
+            search_text: Raw search box text
+            filter_type: 'All', 'Low Stock' or 'Out of Stock'
         
-        conn.close()
+        Returns:
+            Matching rows, best match first, or the filtered listing when empty
+        """
+        return self.services.inventory.search(search_text, filter_type)
     
     def filter_inventory(self):
         """Apply inventory filter based on selection."""
-        self.search_inventory()
+        self.inventory_search.schedule(delay_ms=0)
     
     def restock_selected(self):
         """Restock selected inventory item by specified quantity."""
@@ -1771,65 +4966,26 @@ class ShoeShopManagementSystem:
             messagebox.showerror("Error", "Please select an item to restock!")
             return
         
-        try:
-            quantity = int(self.restock_quantity_var.get())
-            if quantity <= 0:
-                messagebox.showerror("Error", "Quantity must be positive!")
-                return
-            
-            inventory_id = self.inventory_tree.item(selected_item[0], 'values')[0]
-            
-            conn = sqlite3.connect(self.db_name)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                UPDATE Inventory 
-                SET quantity = quantity + ?, last_restocked = CURRENT_DATE
-                WHERE inventory_id = ?
-            ''', (quantity, inventory_id))
-            
-            conn.commit()
-            conn.close()
-            
+        inventory_id = self.inventory_tree.item(selected_item[0], 'values')[0]
+        
+        def done(_):
             messagebox.showinfo("Success", "Inventory restocked successfully!")
             self.load_inventory()
-            
-        except ValueError:
-            messagebox.showerror("Error", "Please enter a valid quantity!")
+        
+        self.tasks.submit(self.services.inventory.restock, inventory_id, self.restock_quantity_var.get(),
+                          on_done=done, on_error=self.show_error, busy="Restocking...", key='restock')
     
     def restock_low_stock(self):
-        """Bulk restock all low stock items to safe levels."""
-        if messagebox.askyesno("Confirm Restock", "Restock all low stock items?"):
-            conn = sqlite3.connect(self.db_name)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT inventory_id, min_stock_level, quantity 
-                FROM Inventory 
-                WHERE quantity < min_stock_level
-            ''')
+        """Bulk restock all low stock items to the selected policy's target."""
+        label = self.restock_policy_var.get()
+        if messagebox.askyesno("Confirm Restock", f"Restock all low stock items to {label}?"):
+            def done(restocked):
+                messagebox.showinfo("Success", f"{len(restocked)} items restocked!")
+                self.load_inventory()
             
-            low_stock_items = cursor.fetchall()
-            restocked_count = 0
-            
-            for item in low_stock_items:
-                inventory_id, min_stock, current_qty = item
-                restock_qty = (min_stock + 20) - current_qty
-                
-                if restock_qty > 0:
-                    cursor.execute('''
-                        UPDATE Inventory 
-                        SET quantity = quantity + ?, last_restocked = CURRENT_DATE
-                        WHERE inventory_id = ?
-                    ''', (restock_qty, inventory_id))
-                    restocked_count += 1
-            
-            conn.commit()
-            conn.close()
-            
-            messagebox.showinfo("Success", f"{restocked_count} items restocked!")
-            self.load_inventory()
-
+            self.tasks.submit(self.services.inventory.restock_low_stock, RESTOCK_POLICY_LABELS[label],
+                              on_done=done, on_error=lambda e: messagebox.showerror("Error", f"Restock failed: {str(e)}"),
+                              busy="Restocking low stock items...", key='restock')
 
 def main():
     """
@@ -1838,8 +4994,9 @@ def main():
     Initializes the Tkinter main window and starts the application.
     """
     root = tk.Tk()
-    app = ShoeShopManagementSystem(root)
+    app = ShoeShopManagementSystem(root, profiler=QueryProfiler.from_environment())
     root.mainloop()
+    app.shutdown()
 
 
 if __name__ == "__main__":
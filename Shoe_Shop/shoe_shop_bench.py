@@ -0,0 +1,1060 @@
+"""
+Benchmarks for the Shoe Shop data layer.
+
+Every benchmark works on a scratch copy of the database so the shop's own
+shoe_shop.db is never modified. Results are printed as JSON.
+
+Usage (from the Shoe_Shop folder):
+    python shoe_shop_bench.py connection --iterations 2000
+    python shoe_shop_bench.py storage --seconds 3
+    python shoe_shop_bench.py indexes --orders 1000000
+    python shoe_shop_bench.py search --products 300000
+    python shoe_shop_bench.py paging --products 1000000
+    python shoe_shop_bench.py dashboard --orders 1000000
+    python shoe_shop_bench.py orders --lines 1 100 10000
+    python shoe_shop_bench.py restock --products 300000
+    python shoe_shop_bench.py checkout --terminals 8 --checkouts 200
+    python shoe_shop_bench.py server --clients 32 --seconds 10
+    python shoe_shop_bench.py import --rows 1000000
+    python shoe_shop_bench.py export --orders 1000000
+    python shoe_shop_bench.py suite --output suite.json --baseline previous.json
+"""
+import argparse
+import asyncio
+import csv
+import json
+import os
+import random
+import shutil
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from Shoe_Shop import (DASHBOARD_STATS_SNAPSHOT, RESTOCK_POLICIES, DatabaseManager, InsufficientStockError,
+                       KeysetQuery, SCHEMA_TABLES, SEARCH_RESULT_LIMIT, STORAGE_PROFILES,
+                       ShopServices, fts_prefix_query, fts_result_order)
+from shoe_shop_datagen import BRANDS, CATEGORIES, MODEL_WORDS, generate
+
+
+SHOP_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "shoe_shop.db")
+
+# The dashboard KPI queries, used as a representative read-only workload
+DASHBOARD_QUERIES = [
+    "SELECT COUNT(*) FROM Products",
+    "SELECT COUNT(*) FROM Customers",
+    "SELECT COUNT(*) FROM Orders",
+    "SELECT COUNT(*) FROM Inventory WHERE quantity < min_stock_level",
+]
+
+
+# Hot queries whose plans depend on the secondary indexes (name, SQL, params)
+INDEXED_QUERIES = [
+    ('load_recent_orders', '''
+        SELECT o.order_id, c.first_name || ' ' || c.last_name, o.order_date, o.total_amount, o.status
+        FROM Orders o
+        JOIN Customers c ON o.customer_id = c.customer_id
+        ORDER BY o.order_date DESC, o.order_id DESC
+        LIMIT 10
+    ''', ()),
+    ('get_total_revenue',
+     "SELECT COALESCE(SUM(total_amount), 0) FROM Orders WHERE status = 'Completed'", ()),
+    ('customer_by_name',
+     "SELECT customer_id FROM Customers WHERE first_name = ? AND last_name = ?", ('First77', 'Last77')),
+    ('customer_order_count',
+     "SELECT COUNT(*) FROM Orders WHERE customer_id = ?", (77,)),
+    ('order_details_by_order', '''
+        SELECT d.product_id, p.product_name, d.quantity, d.subtotal
+        FROM OrderDetails d
+        JOIN Products p ON d.product_id = p.product_id
+        WHERE d.order_id = ?
+    ''', (4242,)),
+    ('units_sold_by_product',
+     "SELECT COALESCE(SUM(quantity), 0) FROM OrderDetails WHERE product_id = ?", (42,)),
+]
+
+
+# Search box input as it grows one keystroke at a time
+KEYSTROKES = ['a', 'ai', 'air', 'air ', 'air m', 'air ma', 'air max', 'n', 'ni', 'nik', 'nike', 'zoom 12']
+
+
+def populate(db, orders, customers=None, products=None, seed=7):
+    """
+    Fill an empty schema with deterministic synthetic rows.
+    
+    Args:
+        db: DatabaseManager for the target database
+        orders: Number of orders (each gets one to four detail lines)
+        customers: Number of customers (default orders // 10)
+        products: Number of products (default orders // 100)
+        seed: Random seed
+    """
+    customers = customers or max(10, orders // 10)
+    products = products or max(10, orders // 100)
+    generate(db, products, customers, orders, seed)
+
+
+def query_plan(db, query, params):
+    """
+    Return the EXPLAIN QUERY PLAN details for a query as a list of strings.
+    """
+    return [row[3] for row in db.fetchall("EXPLAIN QUERY PLAN " + query, params)]
+
+
+def scratch_copy(source, workdir):
+    """
+    Copy a database into a working directory.
+    
+    Returns:
+        str: Path of the copy
+    """
+    target = os.path.join(workdir, "bench.db")
+    shutil.copyfile(source, target)
+    return target
+
+
+def time_calls(func, iterations):
+    """
+    Call a function repeatedly and summarise the per-call latency.
+    
+    Returns:
+        dict: iterations, total_s, mean_us and p50_us/p99_us percentiles
+    """
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return latency_summary(samples)
+
+
+def latency_summary(samples):
+    """Summarise per-call durations in seconds as time_calls reports them."""
+    iterations = len(samples)
+    samples = sorted(samples)
+    return {
+        'iterations': iterations,
+        'total_s': round(sum(samples), 6),
+        'mean_us': round(sum(samples) / len(samples) * 1e6, 2),
+        'p50_us': round(samples[len(samples) // 2] * 1e6, 2),
+        'p99_us': round(samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1e6, 2),
+    }
+
+
+def bench_connection(db_path, iterations):
+    """
+    Compare connect/close per call with the pooled DatabaseManager.
+    
+    Each call runs the four dashboard KPI queries, which is what the
+    application did on every switch to the Dashboard tab.
+    """
+    def connect_per_call():
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+        for query in DASHBOARD_QUERIES:
+            cursor.execute(query)
+            cursor.fetchone()
+        conn.close()
+    
+    db = DatabaseManager(db_path)
+    
+    def pooled():
+        for query in DASHBOARD_QUERIES:
+            db.fetchvalue(query)
+    
+    results = {
+        'connect_per_call': time_calls(connect_per_call, iterations),
+        'pooled': time_calls(pooled, iterations),
+    }
+    db.close()
+    results['speedup'] = round(results['connect_per_call']['mean_us'] / results['pooled']['mean_us'], 2)
+    return results
+
+
+def bench_storage(db_path, seconds):
+    """
+    Measure dashboard read latency while another thread writes orders.
+    
+    Runs once per storage profile on a fresh copy of the database, so the
+    rollback-journal defaults can be compared with WAL. The writer commits
+    an order roughly every millisecond; reads that give up waiting for a
+    lock are counted as busy errors.
+    """
+    workdir = os.path.dirname(db_path)
+    results = {}
+    
+    for name in STORAGE_PROFILES:
+        profile_db = os.path.join(workdir, f"storage_{name}.db")
+        shutil.copyfile(db_path, profile_db)
+        db = DatabaseManager(profile_db, storage_profile=name)
+        stop = threading.Event()
+        writes = [0]
+        busy_errors = [0]
+        
+        def writer():
+            while not stop.is_set():
+                try:
+                    with db.transaction() as cursor:
+                        cursor.execute('''
+                            INSERT INTO Orders (customer_id, employee_id, total_amount, status, payment_method)
+                            VALUES (1, 1, 999.99, 'Completed', 'Cash')
+                        ''')
+                    writes[0] += 1
+                except sqlite3.OperationalError:
+                    busy_errors[0] += 1
+                time.sleep(0.001)
+        
+        def read_dashboard():
+            for query in DASHBOARD_QUERIES:
+                db.fetchvalue(query)
+        
+        db.fetchvalue("SELECT 1")
+        thread = threading.Thread(target=writer)
+        thread.start()
+        samples = []
+        deadline = time.perf_counter() + seconds
+        try:
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    read_dashboard()
+                except sqlite3.OperationalError:
+                    busy_errors[0] += 1
+                    continue
+                samples.append(time.perf_counter() - start)
+        finally:
+            stop.set()
+            thread.join()
+            db.close()
+        
+        samples.sort()
+        results[name] = {
+            'reads': len(samples),
+            'writes': writes[0],
+            'busy_errors': busy_errors[0],
+            'read_p50_us': round(samples[len(samples) // 2] * 1e6, 2),
+            'read_p99_us': round(samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1e6, 2),
+            'read_max_us': round(samples[-1] * 1e6, 2),
+        }
+    return results
+
+
+def bench_indexes(workdir, orders, iterations):
+    """
+    Show query plans and timings before and after the index migration.
+    
+    Builds a database from the base tables only, fills it with synthetic
+    orders, measures every INDEXED_QUERIES entry, applies the schema
+    migrations and measures again.
+    """
+    db = DatabaseManager(os.path.join(workdir, "indexes.db"))
+    with db.transaction() as cursor:
+        for statement in SCHEMA_TABLES:
+            cursor.execute(statement)
+    
+    start = time.perf_counter()
+    populate(db, orders)
+    populate_s = time.perf_counter() - start
+    
+    def measure():
+        measured = {}
+        for name, query, params in INDEXED_QUERIES:
+            measured[name] = {
+                'plan': query_plan(db, query, params),
+                'timing': time_calls(lambda: db.fetchall(query, params), iterations),
+            }
+        return measured
+    
+    before = measure()
+    start = time.perf_counter()
+    db.migrate()
+    migrate_s = time.perf_counter() - start
+    after = measure()
+    db.close()
+    
+    return {
+        'orders': orders,
+        'populate_s': round(populate_s, 3),
+        'migrate_s': round(migrate_s, 3),
+        'queries': {
+            name: {
+                'before': before[name],
+                'after': after[name],
+                'speedup': round(before[name]['timing']['mean_us'] / after[name]['timing']['mean_us'], 1),
+            }
+            for name, _, _ in INDEXED_QUERIES
+        },
+    }
+
+
+def bench_search(workdir, products, iterations):
+    """
+    Compare the old LIKE scan with the FTS5 index, one keystroke at a time.
+    
+    The LIKE query is the one search_products used before the FTS index;
+    the FTS query is the current one, including its result limit.
+    """
+    db = DatabaseManager(os.path.join(workdir, "search.db"))
+    db.create_schema()
+    with db.bulk_load():
+        populate(db, orders=0, customers=10, products=products)
+    
+    like_query = '''
+        SELECT p.product_id, p.product_name, p.brand, p.size, p.color, p.price, c.category_name
+        FROM Products p
+        LEFT JOIN Categories c ON p.category_id = c.category_id
+        WHERE LOWER(p.product_name) LIKE ? OR LOWER(p.brand) LIKE ? OR LOWER(c.category_name) LIKE ?
+        ORDER BY p.product_id
+    '''
+    # Same statement as ProductService.search
+    fts_query = '''
+        SELECT p.product_id, p.product_name, p.brand, p.size, p.color, p.price, c.category_name
+        FROM (SELECT rowid, {order} AS position FROM products_fts WHERE products_fts MATCH ?
+              ORDER BY {order} LIMIT ?) f
+        JOIN Products p ON p.product_id = f.rowid
+        LEFT JOIN Categories c ON p.category_id = c.category_id
+        ORDER BY f.position
+    '''
+    
+    keystrokes = {}
+    for text in KEYSTROKES:
+        pattern = f'%{text.lower()}%'
+        like_params = (pattern, pattern, pattern)
+        fts_params = (fts_prefix_query(text), SEARCH_RESULT_LIMIT)
+        fts_text = fts_query.format(order=fts_result_order(text))
+        keystrokes[text] = {
+            'like_rows': len(db.fetchall(like_query, like_params)),
+            'fts_rows': len(db.fetchall(fts_text, fts_params)),
+            'like_ms': round(time_calls(lambda: db.fetchall(like_query, like_params), iterations)['mean_us'] / 1000, 3),
+            'fts_ms': round(time_calls(lambda: db.fetchall(fts_text, fts_params), iterations)['mean_us'] / 1000, 3),
+        }
+    db.close()
+    
+    return {'products': products, 'keystrokes': keystrokes}
+
+
+def bench_paging(workdir, products, iterations, window=220):
+    """
+    Compare loading the whole product table with reading one scroll window.
+    
+    The full load is what load_products did before virtual scrolling; the
+    window size matches a 20-row table with the default prefetch margin.
+    """
+    db = DatabaseManager(os.path.join(workdir, "paging.db"))
+    db.create_schema()
+    with db.bulk_load():
+        populate(db, orders=0, customers=10, products=products)
+    
+    columns = 'p.product_id, p.product_name, p.brand, p.size, p.color, p.price, c.category_name'
+    joins = 'Products p LEFT JOIN Categories c ON p.category_id = c.category_id'
+    listing = KeysetQuery(db, columns, joins, 'p.product_id', count_from='Products p')
+    middle_key = listing.key_at(products // 2)
+    
+    results = {
+        'products': products,
+        'window_rows': window,
+        'full_load_ms': round(time_calls(
+            lambda: db.fetchall(f'SELECT {columns} FROM {joins} ORDER BY p.product_id'),
+            iterations)['mean_us'] / 1000, 3),
+        'count': time_calls(listing.count, iterations),
+        'first_window': time_calls(lambda: listing.page(None, window), iterations),
+        'next_window': time_calls(lambda: listing.page(middle_key, window, inclusive=False), iterations),
+        'previous_window': time_calls(lambda: listing.page_before(middle_key, window), iterations),
+        'jump_to_middle': time_calls(
+            lambda: listing.page(listing.key_at(products // 2), window), iterations),
+        'jump_to_end': time_calls(
+            lambda: listing.page(listing.key_at(products - window), window), iterations),
+    }
+    db.close()
+    
+    return results
+
+
+def bench_dashboard(workdir, orders, iterations):
+    """
+    Compare the per-KPI dashboard queries with the snapshot and the stats row.
+    
+    The per-KPI list is what refresh_dashboard ran before the dashboard
+    stats table: four counts plus the revenue sum and average.
+    """
+    db = DatabaseManager(os.path.join(workdir, "dashboard.db"))
+    db.create_schema()
+    with db.bulk_load():
+        populate(db, orders=orders)
+    
+    per_kpi = DASHBOARD_QUERIES + [
+        "SELECT COALESCE(SUM(total_amount), 0) FROM Orders WHERE status = 'Completed'",
+        "SELECT COALESCE(AVG(total_amount), 0) FROM Orders WHERE status = 'Completed'",
+    ]
+    
+    def run_per_kpi():
+        for query in per_kpi:
+            db.fetchvalue(query)
+    
+    results = {
+        'orders': orders,
+        'per_kpi_queries': time_calls(run_per_kpi, iterations),
+        'snapshot_query': time_calls(lambda: db.fetchone(DASHBOARD_STATS_SNAPSHOT), iterations),
+        'stats_table': time_calls(db.dashboard_stats, iterations),
+    }
+    db.close()
+    
+    return results
+
+
+def place_order_per_line(db, customer_id, employee_id, items, status, payment_method):
+    """The row-at-a-time order write that create_order used before place_order."""
+    total = sum(item['subtotal'] for item in items)
+    with db.transaction() as cursor:
+        cursor.execute('''
+            INSERT INTO Orders (customer_id, employee_id, total_amount, status, payment_method)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (customer_id, employee_id, total, status, payment_method))
+        order_id = cursor.lastrowid
+        for item in items:
+            cursor.execute('''
+                INSERT INTO OrderDetails (order_id, product_id, quantity, unit_price, subtotal)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (order_id, item['product_id'], item['quantity'], item['unit_price'], item['subtotal']))
+            cursor.execute("UPDATE Inventory SET quantity = quantity - ? WHERE product_id = ?",
+                           (item['quantity'], item['product_id']))
+    return order_id
+
+
+def bench_orders(workdir, line_counts, iterations):
+    """
+    Time one order write per size, row-at-a-time vs place_order.
+    
+    Both variants write the same lines to the same database; the stock
+    check at the end confirms they decrement inventory identically.
+    """
+    db = DatabaseManager(os.path.join(workdir, "orders.db"))
+    db.create_schema()
+    products = max(line_counts)
+    with db.bulk_load():
+        populate(db, orders=1000, customers=100, products=products)
+    # place_order refuses to oversell, so stock has to cover every iteration
+    with db.transaction() as cursor:
+        cursor.execute("UPDATE Inventory SET quantity = 1000000")
+    
+    rng = random.Random(11)
+    results = {'products': products, 'orders': {}}
+    for lines in line_counts:
+        items = []
+        for _ in range(lines):
+            quantity = rng.randint(1, 3)
+            items.append({'product_id': rng.randint(1, products), 'quantity': quantity,
+                          'unit_price': 999.0, 'subtotal': 999.0 * quantity})
+        taken = sum(item['quantity'] for item in items)
+        
+        entry = {}
+        for name, writer in (('per_line', place_order_per_line), ('batched', db.place_order)):
+            stock_before = db.fetchvalue("SELECT SUM(quantity) FROM Inventory")
+            entry[name] = time_calls(lambda: writer(db, 1, 1, items, 'Completed', 'Cash')
+                                     if writer is place_order_per_line
+                                     else writer(1, 1, items, 'Completed', 'Cash'), iterations)
+            stock_after = db.fetchvalue("SELECT SUM(quantity) FROM Inventory")
+            entry[name]['stock_taken_ok'] = stock_before - stock_after == taken * iterations
+        entry['speedup_p50'] = round(entry['per_line']['p50_us'] / entry['batched']['p50_us'], 2)
+        results['orders'][lines] = entry
+    db.close()
+    
+    return results
+
+
+def restock_per_row(db, margin=20):
+    """The fetch-then-update-each-row restock the inventory section used before."""
+    restocked = 0
+    with db.transaction() as cursor:
+        cursor.execute("SELECT inventory_id, min_stock_level, quantity FROM Inventory WHERE quantity < min_stock_level")
+        for inventory_id, min_stock, quantity in cursor.fetchall():
+            if min_stock + margin - quantity > 0:
+                cursor.execute(
+                    "UPDATE Inventory SET quantity = quantity + ?, last_restocked = CURRENT_DATE WHERE inventory_id = ?",
+                    (min_stock + margin - quantity, inventory_id))
+                restocked += 1
+    return restocked
+
+
+def bench_restock(workdir, products, orders):
+    """
+    Time one full restock per policy, starting from the same stock each time.
+    
+    About an eighth of the synthetic SKUs start below their minimum level.
+    The per-row variant is the old loop; its result must match min_plus.
+    """
+    db = DatabaseManager(os.path.join(workdir, "restock.db"))
+    db.create_schema()
+    with db.bulk_load():
+        populate(db, orders=orders, customers=1000, products=products)
+    stock = db.fetchall("SELECT inventory_id, quantity FROM Inventory")
+    
+    def reset_stock():
+        with db.transaction() as cursor:
+            cursor.executemany("UPDATE Inventory SET quantity = ? WHERE inventory_id = ?",
+                               [(quantity, inventory_id) for inventory_id, quantity in stock])
+    
+    results = {'products': products, 'low_stock_before': db.fetchvalue(
+        "SELECT COUNT(*) FROM Inventory WHERE quantity < min_stock_level")}
+    
+    start = time.perf_counter()
+    per_row_count = restock_per_row(db)
+    results['per_row'] = {'rows': per_row_count, 'ms': round((time.perf_counter() - start) * 1000, 1)}
+    per_row_stock = db.fetchall("SELECT inventory_id, quantity FROM Inventory ORDER BY inventory_id")
+    
+    for policy in RESTOCK_POLICIES:
+        reset_stock()
+        start = time.perf_counter()
+        rows = db.restock_low_stock(policy)
+        results[policy] = {'rows': len(rows), 'ms': round((time.perf_counter() - start) * 1000, 1)}
+        if policy == 'min_plus':
+            results[policy]['matches_per_row'] = per_row_stock == db.fetchall(
+                "SELECT inventory_id, quantity FROM Inventory ORDER BY inventory_id")
+    db.close()
+    
+    return results
+
+
+def bench_checkout(workdir, terminals, checkouts, hot_products, stock):
+    """
+    Run concurrent checkouts from several terminals against a few hot SKUs.
+    
+    Every terminal is a thread with its own DatabaseManager (and so its own
+    connection). The unguarded variant is the old blind decrement; the
+    guarded variant reserves each line and then places the order with the
+    conditional decrement. Demand is about twice the stock, so both
+    variants run out; only the unguarded one may go below zero.
+    """
+    db_path = os.path.join(workdir, "checkout.db")
+    db = DatabaseManager(db_path)
+    db.create_schema()
+    with db.bulk_load():
+        populate(db, orders=1000, customers=100, products=max(hot_products, 10))
+    db.close()
+    
+    def run(guarded):
+        setup = DatabaseManager(db_path)
+        with setup.transaction() as cursor:
+            cursor.execute("UPDATE Inventory SET quantity = CASE WHEN product_id <= ? THEN ? ELSE 0 END, reserved = 0",
+                           (hot_products, stock))
+            cursor.execute("DELETE FROM StockReservations")
+            first_order = cursor.execute("SELECT COALESCE(MAX(order_id), 0) + 1 FROM Orders").fetchone()[0]
+        
+        counts = {'completed': 0, 'rejected': 0, 'busy_errors': 0}
+        samples = []
+        lock = threading.Lock()
+        
+        def terminal(number):
+            terminal_db = DatabaseManager(db_path)
+            rng = random.Random(number)
+            session_id = f"bench-{number}"
+            for _ in range(checkouts):
+                items = [{'product_id': product_id, 'quantity': rng.randint(1, 2), 'unit_price': 999.0}
+                         for product_id in rng.sample(range(1, hot_products + 1), rng.randint(1, 3))]
+                for item in items:
+                    item['subtotal'] = item['unit_price'] * item['quantity']
+                outcome = 'completed'
+                start = time.perf_counter()
+                try:
+                    if guarded:
+                        for item in items:
+                            terminal_db.reserve_stock(session_id, item['product_id'], item['quantity'])
+                        terminal_db.place_order(1, 1, items, 'Completed', 'Cash', session_id=session_id)
+                    else:
+                        place_order_per_line(terminal_db, 1, 1, items, 'Completed', 'Cash')
+                except InsufficientStockError:
+                    terminal_db.release_stock(session_id)
+                    outcome = 'rejected'
+                except sqlite3.OperationalError:
+                    terminal_db.release_stock(session_id)
+                    outcome = 'busy_errors'
+                elapsed = time.perf_counter() - start
+                with lock:
+                    counts[outcome] += 1
+                    samples.append(elapsed)
+            terminal_db.close()
+        
+        threads = [threading.Thread(target=terminal, args=(number,)) for number in range(terminals)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        
+        samples.sort()
+        final_stock = setup.fetchvalue("SELECT SUM(quantity) FROM Inventory WHERE product_id <= ?", (hot_products,))
+        sold = setup.fetchvalue("SELECT COALESCE(SUM(quantity), 0) FROM OrderDetails WHERE order_id >= ?",
+                                (first_order,))
+        result = dict(counts,
+                      checkouts_per_s=round(len(samples) / elapsed, 1),
+                      p50_ms=round(samples[len(samples) // 2] * 1000, 2),
+                      p99_ms=round(samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000, 2),
+                      units_sold=sold,
+                      min_stock=setup.fetchvalue("SELECT MIN(quantity) FROM Inventory WHERE product_id <= ?",
+                                                 (hot_products,)),
+                      oversold_units=-setup.fetchvalue(
+                          "SELECT COALESCE(SUM(MIN(quantity, 0)), 0) FROM Inventory WHERE product_id <= ?",
+                          (hot_products,)),
+                      stock_consistent=hot_products * stock - final_stock == sold,
+                      reservations_left=setup.fetchvalue("SELECT COUNT(*) FROM StockReservations"))
+        setup.close()
+        return result
+    
+    return {'terminals': terminals, 'checkouts_per_terminal': checkouts,
+            'hot_products': hot_products, 'stock_per_product': stock,
+            'unguarded': run(False), 'guarded': run(True)}
+
+
+# Request mix of the server load generator as (kind, weight)
+SERVER_MIX = [('search', 60), ('stock', 25), ('order', 15)]
+
+
+async def http_request(reader, writer, method, path, payload=None):
+    """
+    Send one request on a keep-alive connection and read the response.
+    
+    Returns:
+        tuple: (status code, decoded JSON body)
+    """
+    body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+                 f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode('latin-1') + body)
+    await writer.drain()
+    
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def load_client(port, seconds, seed, products, customers, samples):
+    """Send a mix of searches, stock reads and orders until time runs out."""
+    rng = random.Random(seed)
+    kinds, weights = zip(*SERVER_MIX)
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        kind = rng.choices(kinds, weights)[0]
+        if kind == 'search':
+            request = ('GET', f"/products?q={rng.choice(MODEL_WORDS)[:rng.randint(1, 4)]}", None)
+        elif kind == 'stock':
+            request = ('GET', f"/inventory/{rng.randint(1, products)}", None)
+        else:
+            request = ('POST', '/orders', {
+                'customer_id': rng.randint(1, customers), 'status': 'Completed', 'payment_method': 'Cash',
+                'items': [{'product_id': product_id, 'quantity': rng.randint(1, 2)}
+                          for product_id in rng.sample(range(1, products + 1), rng.randint(1, 3))]})
+        start = time.perf_counter()
+        status, _ = await http_request(reader, writer, *request)
+        samples.append((kind, status, time.perf_counter() - start))
+    writer.close()
+
+
+def run_server_load(db_path, port, clients, seconds, products, customers):
+    """
+    Drive a running server with concurrent keep-alive clients.
+    
+    Returns:
+        list: (request kind, status, seconds) per request
+    """
+    samples = []
+    
+    async def run():
+        await asyncio.gather(*(load_client(port, seconds, seed, products, customers, samples)
+                               for seed in range(clients)))
+    asyncio.run(run())
+    return samples
+
+
+def bench_server(workdir, clients, seconds, products, read_workers, write_batches):
+    """
+    Load-test the JSON server: p50/p99 latency per request kind.
+    
+    The server runs in its own process, as it would for real tills. It is
+    started once per writer batch size, so one-write-per-transaction can be
+    compared with group commit under the same load.
+    """
+    db_path = os.path.join(workdir, "server.db")
+    db = DatabaseManager(db_path)
+    db.create_schema()
+    customers = max(100, products // 10)
+    with db.bulk_load():
+        populate(db, orders=products * 2, customers=customers, products=products)
+    with db.transaction() as cursor:
+        cursor.execute("UPDATE Inventory SET quantity = 100000")
+    db.close()
+    
+    server_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "shoe_shop_server.py")
+    results = {'clients': clients, 'seconds': seconds, 'products': products,
+               'read_workers': read_workers, 'mix': dict(SERVER_MIX), 'runs': {}}
+    for write_batch in write_batches:
+        with socket.socket() as probe:
+            probe.bind(('127.0.0.1', 0))
+            port = probe.getsockname()[1]
+        server = subprocess.Popen(
+            [sys.executable, server_script, '--db', db_path, '--port', str(port),
+             '--read-workers', str(read_workers), '--write-batch', str(write_batch)],
+            cwd=os.path.dirname(server_script), stdout=subprocess.PIPE, text=True)
+        try:
+            server.stdout.readline()    # "Serving ..." once the socket is bound
+            samples = run_server_load(db_path, port, clients, seconds, products, customers)
+        finally:
+            server.terminate()
+            server.wait()
+        
+        run = {'requests_per_s': round(len(samples) / seconds, 1)}
+        for kind, _ in SERVER_MIX:
+            latencies = sorted(elapsed for sample_kind, _, elapsed in samples if sample_kind == kind)
+            statuses = {}
+            for sample_kind, status, _ in samples:
+                if sample_kind == kind:
+                    statuses[str(status)] = statuses.get(str(status), 0) + 1
+            if latencies:
+                run[kind] = {
+                    'requests': len(latencies),
+                    'statuses': statuses,
+                    'p50_ms': round(latencies[len(latencies) // 2] * 1000, 2),
+                    'p99_ms': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000, 2),
+                }
+        results['runs'][f"write_batch_{write_batch}"] = run
+    
+    check = sqlite3.connect(db_path)
+    results['min_stock'] = check.execute("SELECT MIN(quantity) FROM Inventory").fetchone()[0]
+    check.close()
+    return results
+
+
+def write_catalog_csv(path, rows, seed=5):
+    """Write a synthetic product catalog CSV, one row at a time."""
+    rng = random.Random(seed)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['product_name', 'category', 'supplier', 'brand', 'size', 'color', 'gender',
+                         'price', 'cost_price', 'quantity', 'min_stock_level'])
+        for i in range(rows):
+            price = 500 + rng.randint(0, 9000)
+            writer.writerow([f"{rng.choice(MODEL_WORDS)} {rng.choice(MODEL_WORDS)} {rng.randint(1, 999)}",
+                             rng.choice(CATEGORIES)[0], f"Supplier {i % 50}", rng.choice(BRANDS),
+                             6 + i % 8, rng.choice(['Black', 'White', 'Red', 'Blue']),
+                             rng.choice(['Men', 'Women', 'Unisex']), price, price * 0.6,
+                             rng.randint(0, 80), 10])
+
+
+def bench_import(workdir, rows, batch_size):
+    """
+    Stream a synthetic catalog CSV into an empty database.
+    
+    The time covers reading, validating and writing the rows plus the
+    search index and KPI rebuild at the end of the bulk load.
+    """
+    from shoe_shop_import import import_file
+    
+    path = os.path.join(workdir, "catalog.csv")
+    write_catalog_csv(path, rows)
+    db = DatabaseManager(os.path.join(workdir, "import.db"))
+    db.create_schema()
+    
+    start = time.perf_counter()
+    stats = import_file(db, 'products', path, batch_size=batch_size, create_missing=True)
+    elapsed = time.perf_counter() - start
+    
+    results = {
+        'rows': rows,
+        'file_mb': round(os.path.getsize(path) / 1e6, 1),
+        'batch_size': batch_size,
+        'imported': stats['imported'],
+        'rejected': stats['rejected'],
+        'rows_written_s': stats['seconds'],
+        'total_s': round(elapsed, 2),
+        'rows_per_s': round(rows / elapsed),
+        'inventory_rows': db.fetchvalue("SELECT COUNT(*) FROM Inventory"),
+        'suppliers': db.fetchvalue("SELECT COUNT(*) FROM Suppliers"),
+    }
+    db.close()
+    return results
+
+
+def bench_export(workdir, orders):
+    """
+    Export every order line with fetchall vs the streaming exporter.
+    
+    Peak Python memory is measured with tracemalloc: the fetchall variant
+    holds the whole result set, the streaming one a single chunk.
+    """
+    from shoe_shop_export import export_orders, order_line_query, write_csv
+    
+    db = DatabaseManager(os.path.join(workdir, "export.db"))
+    db.create_schema()
+    with db.bulk_load():
+        populate(db, orders=orders)
+    
+    def measure(func):
+        tracemalloc.start()
+        start = time.perf_counter()
+        rows = func()
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return {'rows': rows, 'seconds': round(elapsed, 2), 'peak_mb': round(peak / 1e6, 1)}
+    
+    def fetchall_csv():
+        rows = db.fetchall(*order_line_query())
+        write_csv([rows], os.path.join(workdir, "fetchall.csv"))
+        return len(rows)
+    
+    results = {'orders': orders, 'fetchall_csv': measure(fetchall_csv)}
+    for file_format in ('csv', 'jsonl', 'columnar'):
+        path = os.path.join(workdir, f"export.{file_format}")
+        results[f"streaming_{file_format}"] = measure(lambda: export_orders(db, path, file_format)['rows'])
+        results[f"streaming_{file_format}"]['file_mb'] = round(os.path.getsize(path) / 1e6, 1)
+    db.close()
+    return results
+
+
+def time_with_reset(func, reset, iterations):
+    """
+    Like time_calls, but run reset before every call without timing it.
+    
+    Used for writes that change the state they depend on.
+    """
+    samples = []
+    for _ in range(iterations):
+        reset()
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return latency_summary(samples)
+
+
+def git_revision():
+    """Return the current git commit, or None outside a checkout."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def suite_hot_paths(services, iterations, window=220, seed=3):
+    """
+    Time the shop's hot paths through the service layer.
+    
+    Each entry is named after the window method that drives it. Reads use
+    the same calls the UI makes; create_order places a three-line order
+    and restock_low_stock tops up the same low-stock rows every time.
+    """
+    db = services.db
+    rng = random.Random(seed)
+    products = db.fetchvalue("SELECT MAX(product_id) FROM Products")
+    customers = db.fetchvalue("SELECT MAX(customer_id) FROM Customers")
+    prices = dict(db.fetchall("SELECT product_id, price FROM Products"))
+    
+    def create_order():
+        items = []
+        for product_id in rng.sample(range(1, products + 1), 3):
+            items.append({'product_id': product_id, 'quantity': 1,
+                          'unit_price': prices[product_id], 'subtotal': prices[product_id]})
+        services.orders.place(rng.randint(1, customers), items, status='Completed')
+    
+    def load_products():
+        listing = services.products.listing
+        listing.count()
+        listing.page(None, window)
+    
+    searches = iter(KEYSTROKES * iterations)
+    inventory_searches = iter(KEYSTROKES * iterations)
+    stock = db.fetchall("SELECT inventory_id, quantity FROM Inventory")
+    
+    def reset_stock():
+        with db.transaction() as cursor:
+            cursor.executemany("UPDATE Inventory SET quantity = ?2 WHERE inventory_id = ?1", stock)
+    
+    # create_order runs last so the other paths all see the same data
+    results = {
+        'get_dashboard_stats': time_calls(services.dashboard, iterations),
+        'load_recent_orders': time_calls(services.orders.recent, iterations),
+        'load_products': time_calls(load_products, iterations),
+        'search_products': time_calls(lambda: services.products.search(next(searches)), iterations),
+        'search_inventory': time_calls(lambda: services.inventory.search(next(inventory_searches)), iterations),
+        'restock_low_stock': time_with_reset(services.inventory.restock_low_stock, reset_stock, iterations),
+    }
+    reset_stock()
+    with db.transaction() as cursor:
+        cursor.execute("UPDATE Inventory SET quantity = 1000000")
+    results['create_order'] = time_calls(create_order, iterations)
+    return results
+
+
+def bench_suite(workdir, sizes, iterations, baseline=None):
+    """
+    Run the hot-path suite on generated databases of increasing size.
+    
+    Args:
+        workdir: Scratch directory for the generated databases
+        sizes: Order counts to generate (products and customers scale along)
+        iterations: Calls per hot path
+        baseline: Earlier suite output to compare p50 latencies against
+    
+    Returns:
+        dict: Environment, per-size timings and, with a baseline, the
+            current/baseline p50 ratio of every hot path
+    """
+    results = {
+        'revision': git_revision(),
+        'python': sys.version.split()[0],
+        'sqlite': sqlite3.sqlite_version,
+        'iterations': iterations,
+        'sizes': {},
+    }
+    for orders in sizes:
+        db = DatabaseManager(os.path.join(workdir, f"suite_{orders}.db"))
+        db.create_schema()
+        start = time.perf_counter()
+        with db.bulk_load():
+            populate(db, orders=orders)
+        db.execute("ANALYZE")
+        generate_s = time.perf_counter() - start
+        
+        services = ShopServices(db)
+        results['sizes'][str(orders)] = {
+            'generate_s': round(generate_s, 2),
+            **suite_hot_paths(services, iterations),
+        }
+        services.close()
+        os.remove(os.path.join(workdir, f"suite_{orders}.db"))
+    
+    if baseline is not None:
+        comparison = {}
+        for size, paths in results['sizes'].items():
+            previous = baseline.get('sizes', {}).get(size, {})
+            comparison[size] = {
+                name: round(timing['p50_us'] / previous[name]['p50_us'], 2)
+                for name, timing in paths.items()
+                if isinstance(timing, dict) and previous.get(name, {}).get('p50_us')
+            }
+        results['baseline_revision'] = baseline.get('revision')
+        results['p50_ratio'] = comparison
+    return results
+
+
+def main():
+    """Parse the command line and run the selected benchmark."""
+    parser = argparse.ArgumentParser(description="Shoe Shop data layer benchmarks")
+    parser.add_argument('--db', default=SHOP_DB,
+                        help="Database to copy for the connection and storage benchmarks")
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+    
+    connection = subparsers.add_parser('connection', help="Connect/close per call vs pooled connection")
+    connection.add_argument('--iterations', type=int, default=2000)
+    
+    storage = subparsers.add_parser('storage', help="Read latency under a concurrent writer per storage profile")
+    storage.add_argument('--seconds', type=float, default=3.0)
+    
+    indexes = subparsers.add_parser('indexes', help="Query plans and timings before/after the index migration")
+    indexes.add_argument('--orders', type=int, default=1000000)
+    indexes.add_argument('--iterations', type=int, default=5)
+    
+    search = subparsers.add_parser('search', help="LIKE scan vs FTS5 search per keystroke")
+    search.add_argument('--products', type=int, default=300000)
+    search.add_argument('--iterations', type=int, default=5)
+    
+    paging = subparsers.add_parser('paging', help="Full table load vs keyset window reads")
+    paging.add_argument('--products', type=int, default=1000000)
+    paging.add_argument('--iterations', type=int, default=5)
+    
+    dashboard = subparsers.add_parser('dashboard', help="Per-KPI queries vs snapshot query vs stats table")
+    dashboard.add_argument('--orders', type=int, default=1000000)
+    dashboard.add_argument('--iterations', type=int, default=20)
+    
+    orders = subparsers.add_parser('orders', help="Row-at-a-time vs batched order writes")
+    orders.add_argument('--lines', type=int, nargs='+', default=[1, 100, 10000])
+    orders.add_argument('--iterations', type=int, default=20)
+    
+    restock = subparsers.add_parser('restock', help="Per-row restock loop vs set-based restock policies")
+    restock.add_argument('--products', type=int, default=300000)
+    restock.add_argument('--orders', type=int, default=1000000)
+    
+    checkout = subparsers.add_parser('checkout', help="Concurrent checkouts: blind vs conditional stock decrement")
+    checkout.add_argument('--terminals', type=int, default=8)
+    checkout.add_argument('--checkouts', type=int, default=200)
+    checkout.add_argument('--hot-products', type=int, default=20)
+    checkout.add_argument('--stock', type=int, default=120)
+    
+    server = subparsers.add_parser('server', help="Load-test the JSON server with concurrent clients")
+    server.add_argument('--clients', type=int, default=32)
+    server.add_argument('--seconds', type=float, default=10.0)
+    server.add_argument('--products', type=int, default=10000)
+    server.add_argument('--read-workers', type=int, default=4)
+    server.add_argument('--write-batch', type=int, nargs='+', default=[1, 64])
+    
+    bulk_import = subparsers.add_parser('import', help="Streaming CSV catalog import")
+    bulk_import.add_argument('--rows', type=int, default=1000000)
+    bulk_import.add_argument('--batch', type=int, default=10000)
+    
+    export = subparsers.add_parser('export', help="fetchall vs streaming order line export")
+    export.add_argument('--orders', type=int, default=1000000)
+    
+    suite = subparsers.add_parser('suite', help="Hot-path timings on generated databases of increasing size")
+    suite.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    suite.add_argument('--iterations', type=int, default=20)
+    suite.add_argument('--output', help="Also write the JSON results to this file")
+    suite.add_argument('--baseline', help="Earlier suite results to compare against")
+    
+    args = parser.parse_args()
+    # The other benchmarks generate their own databases
+    if args.benchmark in ('connection', 'storage') and not os.path.exists(args.db):
+        parser.error(f"{args.db} does not exist; run the application once or pass --db")
+    
+    with tempfile.TemporaryDirectory() as workdir:
+        if args.benchmark == 'connection':
+            results = bench_connection(scratch_copy(args.db, workdir), args.iterations)
+        elif args.benchmark == 'storage':
+            results = bench_storage(scratch_copy(args.db, workdir), args.seconds)
+        elif args.benchmark == 'indexes':
+            results = bench_indexes(workdir, args.orders, args.iterations)
+        elif args.benchmark == 'search':
+            results = bench_search(workdir, args.products, args.iterations)
+        elif args.benchmark == 'paging':
+            results = bench_paging(workdir, args.products, args.iterations)
+        elif args.benchmark == 'dashboard':
+            results = bench_dashboard(workdir, args.orders, args.iterations)
+        elif args.benchmark == 'orders':
+            results = bench_orders(workdir, args.lines, args.iterations)
+        elif args.benchmark == 'restock':
+            results = bench_restock(workdir, args.products, args.orders)
+        elif args.benchmark == 'checkout':
+            results = bench_checkout(workdir, args.terminals, args.checkouts, args.hot_products, args.stock)
+        elif args.benchmark == 'import':
+            results = bench_import(workdir, args.rows, args.batch)
+        elif args.benchmark == 'suite':
+            baseline = None
+            if args.baseline:
+                with open(args.baseline, encoding='utf-8') as f:
+                    baseline = json.load(f)['results']
+            results = bench_suite(workdir, args.sizes, args.iterations, baseline)
+        elif args.benchmark == 'export':
+            results = bench_export(workdir, args.orders)
+        elif args.benchmark == 'server':
+            results = bench_server(workdir, args.clients, args.seconds, args.products,
+                                   args.read_workers, args.write_batch)
+    
+    output = json.dumps({'benchmark': args.benchmark, 'results': results}, indent=2)
+    if getattr(args, 'output', None):
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""
+Deterministic synthetic data for the Shoe Shop database.
+
+Builds a shop of any size on the normal schema: N products, M customers
+and K orders with one to four lines each. The same arguments and seed
+always give the same rows. Distributions are chosen to look like a real
+shop rather than uniform noise:
+    
+    - product popularity follows a Zipf law, so a few hundred products
+      make up most of the order lines
+    - a smaller set of regular customers places most of the orders
+    - order dates follow a seasonal curve (December and the June
+      back-to-school rush peak, weekends are busier) with yearly growth
+    - order ids increase with the order date, as they would in a till
+    - line prices are the product's price and order totals add up
+
+Usage (from the Shoe_Shop folder):
+    python shoe_shop_datagen.py big_shop.db --products 100000 --customers 500000 --orders 1000000
+    python shoe_shop_datagen.py demo.db --orders 5000 --seed 11
+"""
+import argparse
+import datetime
+import itertools
+import json
+import os
+import random
+import time
+
+from Shoe_Shop import DatabaseManager
+
+
+# Vocabulary for product names
+MODEL_WORDS = ['Air', 'Ultra', 'Classic', 'Court', 'Runner', 'Zoom', 'Boost', 'Trail', 'Street', 'Flex',
+               'Glide', 'Pro', 'Comfort', 'Urban', 'Sprint', 'Leather', 'Canvas', 'Max', 'Lite', 'Elite']
+BRANDS = ['Nike', 'Adidas', 'Puma', 'Skechers', 'World Balance', 'San Marino', 'New Balance', 'Asics',
+          'Converse', 'Vans']
+COLORS = ['Black', 'White', 'Black/White', 'Gray', 'Blue', 'Red', 'Brown', 'Green', 'Navy', 'Beige']
+GENDERS = ['Men', 'Women', 'Unisex', 'Kids']
+
+# Category name with its (lowest, highest) list price
+CATEGORIES = [
+    ('Running Shoes', (1500, 9000)),
+    ('Casual Shoes', (1000, 6000)),
+    ('Formal Shoes', (1500, 8000)),
+    ('Sports Shoes', (2000, 10000)),
+    ('Sandals', (400, 2500)),
+    ('Slippers', (150, 900)),
+]
+
+FIRST_NAMES = ['Juan', 'Maria', 'Roberto', 'Ana', 'Michael', 'Sofia', 'Jose', 'Carmen', 'Pedro', 'Lourdes',
+               'Mark', 'Angelica', 'Paolo', 'Kristine', 'Rafael', 'Jasmine', 'Miguel', 'Patricia', 'Carlo',
+               'Bea', 'Luis', 'Camille', 'Antonio', 'Grace']
+LAST_NAMES = ['Dela Cruz', 'Santos', 'Reyes', 'Garcia', 'Tan', 'Lim', 'Gonzales', 'Torres', 'Aquino',
+              'Fernandez', 'Bautista', 'Villanueva', 'Ramos', 'Mendoza', 'Castillo', 'Navarro', 'Flores',
+              'Rivera', 'Domingo', 'Soriano']
+CITIES = ['Makati City', 'Quezon City', 'Pasig City', 'Manila', 'Cebu City', 'Davao City', 'Taguig City',
+          'Mandaluyong City', 'Muntinlupa City', 'Iloilo City']
+
+EMPLOYEES = [
+    ('Alice', 'Cruz', 'Store Manager', 35000.00),
+    ('Charlie', 'David', 'Sales Supervisor', 25000.00),
+    ('Bianca', 'Ramos', 'Sales Associate', 18000.00),
+    ('Daniel', 'Mendoza', 'Sales Associate', 18000.00),
+    ('Elena', 'Sison', 'Inventory Clerk', 20000.00),
+]
+PAYMENT_METHODS = [('Cash', 40), ('GCash', 25), ('Credit Card', 15), ('Debit Card', 10), ('PayMaya', 7),
+                   ('Bank Transfer', 3)]
+
+# Relative order volume by month (January first) and weekday (Monday first)
+MONTH_WEIGHTS = [0.8, 0.7, 0.8, 0.9, 1.0, 1.4, 1.0, 0.9, 0.9, 1.0, 1.3, 2.0]
+WEEKDAY_WEIGHTS = [0.8, 0.8, 0.85, 0.9, 1.1, 1.5, 1.4]
+YEARLY_GROWTH = 1.15
+
+# Zipf exponents for product and customer popularity
+PRODUCT_ZIPF = 1.1
+CUSTOMER_ZIPF = 0.7
+
+# Orders this many days before the last date are still open
+OPEN_ORDER_DAYS = 14
+
+# Rows per executemany batch and transaction
+BATCH_SIZE = 50000
+
+
+def zipf_weights(count, exponent, rng):
+    """
+    Cumulative Zipf weights over ids 1..count in a shuffled rank order.
+    
+    The most popular id is picked at random rather than always being 1,
+    so popularity does not line up with insertion order.
+    
+    Returns:
+        tuple: (ids, cumulative weights) for random.choices
+    """
+    ids = list(range(1, count + 1))
+    rng.shuffle(ids)
+    cum_weights = list(itertools.accumulate(1.0 / rank ** exponent for rank in range(1, count + 1)))
+    return ids, cum_weights
+
+
+def seasonal_days(start_year, end_year):
+    """
+    Every day of the range with its relative order volume.
+    
+    Returns:
+        tuple: (list of ISO dates, cumulative weights)
+    """
+    day = datetime.date(start_year, 1, 1)
+    last = datetime.date(end_year, 12, 31)
+    days, weights = [], []
+    while day <= last:
+        days.append(day.isoformat())
+        weights.append(MONTH_WEIGHTS[day.month - 1] * WEEKDAY_WEIGHTS[day.weekday()]
+                       * YEARLY_GROWTH ** (day.year - start_year))
+        day += datetime.timedelta(days=1)
+    return days, list(itertools.accumulate(weights))
+
+
+def orders_per_day(orders, start_year, end_year, rng):
+    """
+    Spread the orders over the days of the range by seasonal weight.
+    
+    Yields:
+        tuple: (ISO date, number of orders), in date order
+    """
+    days, cum_weights = seasonal_days(start_year, end_year)
+    counts = [0] * len(days)
+    indexes = range(len(days))
+    for start in range(0, orders, BATCH_SIZE):
+        for index in rng.choices(indexes, cum_weights=cum_weights, k=min(BATCH_SIZE, orders - start)):
+            counts[index] += 1
+    return zip(days, counts)
+
+
+def list_price(rng, low, high):
+    """A list price in the range, ending in .99 or .00 like shop tags."""
+    return round(rng.uniform(low, high), -2) - rng.choice((0.01, 0.01, 0.0))
+
+
+def generate(db, products, customers, orders, seed=7, start_year=2020, end_year=2025):
+    """
+    Fill an empty schema with deterministic synthetic rows.
+    
+    Rows are written with executemany in BATCH_SIZE transactions and get
+    explicit ids 1..N. Wrap the call in DatabaseManager.bulk_load() to
+    skip the per-row search and dashboard triggers.
+    
+    Args:
+        db: DatabaseManager for the target database
+        products: Number of products
+        customers: Number of customers
+        orders: Number of orders (each gets one to four detail lines)
+        seed: Random seed
+        start_year: First year of order dates
+        end_year: Last year of order dates
+    
+    Returns:
+        dict: Rows written per table
+    """
+    rng = random.Random(seed)
+    counts = {'products': products, 'customers': customers, 'orders': orders, 'order_lines': 0}
+    
+    with db.transaction() as cursor:
+        cursor.executemany(
+            "INSERT INTO Categories (category_id, category_name) VALUES (?, ?)",
+            ((i, name) for i, (name, _) in enumerate(CATEGORIES, start=1)))
+        cursor.executemany(
+            "INSERT INTO Suppliers (supplier_id, supplier_name) VALUES (?, ?)",
+            ((i, f"{brand} Philippines") for i, brand in enumerate(BRANDS, start=1)))
+        cursor.executemany(
+            "INSERT INTO Employees (employee_id, first_name, last_name, email, position, salary, hire_date) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            ((i, first, last, f"{first.lower()}@barakokicks.ph", position, salary, f"{start_year}-01-01")
+             for i, (first, last, position, salary) in enumerate(EMPLOYEES, start=1)))
+    
+    prices = [0.0]
+    for start in range(1, products + 1, BATCH_SIZE):
+        product_rows, inventory_rows = [], []
+        for product_id in range(start, min(start + BATCH_SIZE, products + 1)):
+            category_id = rng.randint(1, len(CATEGORIES))
+            brand_id = rng.randint(1, len(BRANDS))
+            gender = rng.choice(GENDERS)
+            price = list_price(rng, *CATEGORIES[category_id - 1][1])
+            prices.append(price)
+            product_rows.append((
+                product_id, f"{rng.choice(MODEL_WORDS)} {rng.choice(MODEL_WORDS)} {rng.randint(1, 999)}",
+                category_id, brand_id, BRANDS[brand_id - 1],
+                rng.randint(10, 16) / 2 if gender == 'Kids' else rng.randint(12, 24) / 2,
+                rng.choice(COLORS), gender, price, round(price * rng.uniform(0.45, 0.7), 2)))
+            inventory_rows.append((product_id, rng.randint(0, 80), rng.choice((5, 10, 10, 15, 20))))
+        with db.transaction() as cursor:
+            cursor.executemany(
+                "INSERT INTO Products (product_id, product_name, category_id, supplier_id, brand, size, color, gender, price, cost_price) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                product_rows)
+            cursor.executemany(
+                "INSERT INTO Inventory (product_id, quantity, min_stock_level) VALUES (?, ?, ?)",
+                inventory_rows)
+    
+    for start in range(1, customers + 1, BATCH_SIZE):
+        customer_rows = []
+        for customer_id in range(start, min(start + BATCH_SIZE, customers + 1)):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            customer_rows.append((
+                customer_id, first, last,
+                f"{first.lower()}.{last.lower().replace(' ', '')}{customer_id}@example.com",
+                f"+63-9{rng.randint(10, 99)}-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+                f"{rng.randint(1, 999)} {rng.choice(LAST_NAMES)} Street, {rng.choice(CITIES)}",
+                f"{rng.randint(start_year, end_year)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"))
+        with db.transaction() as cursor:
+            cursor.executemany(
+                "INSERT INTO Customers (customer_id, first_name, last_name, email, phone, address, registration_date) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                customer_rows)
+    
+    if not orders:
+        return counts
+    
+    product_ids, product_weights = zipf_weights(products, PRODUCT_ZIPF, rng)
+    customer_ids, customer_weights = zipf_weights(customers, CUSTOMER_ZIPF, rng)
+    methods = [method for method, _ in PAYMENT_METHODS]
+    method_weights = list(itertools.accumulate(weight for _, weight in PAYMENT_METHODS))
+    open_from = (datetime.date(end_year, 12, 31) - datetime.timedelta(days=OPEN_ORDER_DAYS)).isoformat()
+    
+    order_id = 0
+    order_rows, detail_rows = [], []
+    
+    def flush():
+        with db.transaction() as cursor:
+            cursor.executemany(
+                "INSERT INTO Orders (order_id, customer_id, employee_id, order_date, total_amount, status, payment_method) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                order_rows)
+            cursor.executemany(
+                "INSERT INTO OrderDetails (order_id, product_id, quantity, unit_price, subtotal) VALUES (?, ?, ?, ?, ?)",
+                detail_rows)
+        counts['order_lines'] += len(detail_rows)
+        order_rows.clear()
+        detail_rows.clear()
+    
+    for order_date, day_orders in orders_per_day(orders, start_year, end_year, rng):
+        for _ in range(day_orders):
+            order_id += 1
+            # A cart holds each product once
+            lines = {}
+            for product_id in rng.choices(product_ids, cum_weights=product_weights, k=rng.choice((1, 1, 1, 2, 2, 3, 4))):
+                lines[product_id] = lines.get(product_id, 0) + rng.choice((1, 1, 1, 2, 3))
+            total = 0.0
+            for product_id, quantity in lines.items():
+                subtotal = round(prices[product_id] * quantity, 2)
+                total += subtotal
+                detail_rows.append((order_id, product_id, quantity, prices[product_id], subtotal))
+            
+            if order_date >= open_from:
+                status = rng.choice(('Pending', 'Processing', 'Completed'))
+            else:
+                status = 'Cancelled' if rng.random() < 0.04 else 'Completed'
+            order_rows.append((order_id, rng.choices(customer_ids, cum_weights=customer_weights)[0],
+                               rng.randint(1, len(EMPLOYEES)), order_date, round(total, 2), status,
+                               rng.choices(methods, cum_weights=method_weights)[0]))
+            if len(order_rows) >= BATCH_SIZE:
+                flush()
+    if order_rows:
+        flush()
+    return counts
+
+
+def main():
+    """Parse the command line and generate a database."""
+    parser = argparse.ArgumentParser(description="Generate a synthetic Shoe Shop database")
+    parser.add_argument('db', help="Database file to create (must not exist)")
+    parser.add_argument('--products', type=int, default=10000)
+    parser.add_argument('--customers', type=int, default=50000)
+    parser.add_argument('--orders', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--start-year', type=int, default=2020)
+    parser.add_argument('--end-year', type=int, default=2025)
+    args = parser.parse_args()
+    
+    if os.path.exists(args.db):
+        parser.error(f"{args.db} already exists")
+    if args.products < 1 or args.customers < 1 or args.orders < 0:
+        parser.error("--products and --customers must be at least 1 and --orders not negative")
+    
+    db = DatabaseManager(args.db)
+    try:
+        db.create_schema()
+        start = time.perf_counter()
+        with db.bulk_load():
+            counts = generate(db, args.products, args.customers, args.orders, args.seed,
+                              args.start_year, args.end_year)
+        counts['seconds'] = round(time.perf_counter() - start, 2)
+        db.execute("ANALYZE")
+    finally:
+        db.close()
+    print(json.dumps(counts, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""
+Streaming export of order lines for reporting.
+
+Every order line is written with its order, customer and product, in
+order date order. Rows are pulled from an open cursor a chunk at a time
+and written straight out, so memory use does not grow with the size of
+the date range.
+
+Usage (from the Shoe_Shop folder):
+    python shoe_shop_export.py sales_2025.csv --since 2025-01-01 --until 2025-12-31
+    python shoe_shop_export.py sales.jsonl --status Completed
+    python shoe_shop_export.py sales.columns.jsonl --format columnar
+    python shoe_shop_export.py sales.parquet          (needs pyarrow)
+
+Formats:
+    csv       header line plus one line per order line
+    jsonl     one JSON object per order line
+    columnar  one JSON object per chunk holding a list of values per
+              column, a dependency-free stand-in for Parquet row groups
+    parquet   Parquet file with one row group per chunk (needs pyarrow)
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+from Shoe_Shop import DatabaseManager
+
+
+# Rows fetched from the cursor (and written as one columnar chunk) at a time
+EXPORT_CHUNK = 10000
+
+# Exported columns as (name, SQL expression)
+EXPORT_COLUMNS = [
+    ('order_id', 'o.order_id'),
+    ('order_date', 'o.order_date'),
+    ('status', 'o.status'),
+    ('payment_method', 'o.payment_method'),
+    ('order_total', 'o.total_amount'),
+    ('customer_id', 'o.customer_id'),
+    ('customer_name', "c.first_name || ' ' || c.last_name"),
+    ('customer_email', 'c.email'),
+    ('order_detail_id', 'd.order_detail_id'),
+    ('product_id', 'd.product_id'),
+    ('product_name', 'p.product_name'),
+    ('brand', 'p.brand'),
+    ('category', 'cat.category_name'),
+    ('quantity', 'd.quantity'),
+    ('unit_price', 'd.unit_price'),
+    ('subtotal', 'd.subtotal'),
+]
+EXPORT_FIELDS = [name for name, _ in EXPORT_COLUMNS]
+
+# Parquet type of each exported column, as a pyarrow type factory name
+PARQUET_TYPES = {
+    'order_id': 'int64',
+    'order_date': 'string',
+    'status': 'string',
+    'payment_method': 'string',
+    'order_total': 'float64',
+    'customer_id': 'int64',
+    'customer_name': 'string',
+    'customer_email': 'string',
+    'order_detail_id': 'int64',
+    'product_id': 'int64',
+    'product_name': 'string',
+    'brand': 'string',
+    'category': 'string',
+    'quantity': 'int64',
+    'unit_price': 'float64',
+    'subtotal': 'float64',
+}
+
+FORMAT_EXTENSIONS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl', '.parquet': 'parquet'}
+
+
+def order_line_query(since=None, until=None, status=None):
+    """
+    Build the export query for a date range.
+    
+    Args:
+        since: First order date to include (YYYY-MM-DD)
+        until: Last order date to include (YYYY-MM-DD)
+        status: Only orders with this status
+    
+    Returns:
+        tuple: (SQL, parameters)
+    """
+    conditions, params = [], []
+    if since:
+        conditions.append("o.order_date >= ?")
+        params.append(since)
+    if until:
+        conditions.append("o.order_date <= ?")
+        params.append(until)
+    if status:
+        conditions.append("o.status = ?")
+        params.append(status)
+    
+    # Orders walks idx_orders_order_date and each order's lines come from
+    # idx_order_details_order, so rows arrive in output order without a sort
+    sql = f'''
+        SELECT {', '.join(expression for _, expression in EXPORT_COLUMNS)}
+        FROM Orders o
+        CROSS JOIN OrderDetails d ON d.order_id = o.order_id
+        LEFT JOIN Customers c ON c.customer_id = o.customer_id
+        LEFT JOIN Products p ON p.product_id = d.product_id
+        LEFT JOIN Categories cat ON cat.category_id = p.category_id
+        {'WHERE ' + ' AND '.join(conditions) if conditions else ''}
+        ORDER BY o.order_date, o.order_id
+    '''
+    return sql, params
+
+
+def iter_order_lines(db, since=None, until=None, status=None, chunk_size=EXPORT_CHUNK):
+    """
+    Stream exported order lines in chunks.
+    
+    The query runs on its own cursor and rows are taken with fetchmany, so
+    at most one chunk is held in memory. In WAL mode the export reads a
+    consistent snapshot while tills keep writing.
+    
+    Yields:
+        list: Up to chunk_size rows in EXPORT_COLUMNS order
+    """
+    sql, params = order_line_query(since, until, status)
+    cursor = db.get_connection().cursor()
+    try:
+        cursor.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield rows
+    finally:
+        cursor.close()
+
+
+def write_csv(chunks, path):
+    """Write chunks as CSV with a header line."""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(EXPORT_FIELDS)
+        for rows in chunks:
+            writer.writerows(rows)
+
+
+def write_jsonl(chunks, path):
+    """Write chunks as one JSON object per row."""
+    with open(path, 'w', encoding='utf-8') as f:
+        for rows in chunks:
+            f.writelines(json.dumps(dict(zip(EXPORT_FIELDS, row))) + '\n' for row in rows)
+
+
+def write_columnar(chunks, path):
+    """Write each chunk as one JSON object of column lists."""
+    with open(path, 'w', encoding='utf-8') as f:
+        for rows in chunks:
+            columns = dict(zip(EXPORT_FIELDS, (list(values) for values in zip(*rows))))
+            f.write(json.dumps({'rows': len(rows), 'columns': columns}) + '\n')
+
+
+def write_parquet(chunks, path):
+    """Write chunks as Parquet row groups (needs pyarrow)."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow); "
+                           "use --format columnar for a dependency-free alternative") from None
+    
+    # A fixed schema, so an empty range still writes a file and a chunk
+    # whose column is all NULL does not change its type
+    schema = pa.schema([(name, getattr(pa, PARQUET_TYPES[name])()) for name in EXPORT_FIELDS])
+    with pq.ParquetWriter(path, schema) as writer:
+        for rows in chunks:
+            columns = dict(zip(EXPORT_FIELDS, (list(values) for values in zip(*rows))))
+            writer.write_table(pa.table(columns, schema=schema))
+
+
+WRITERS = {
+    'csv': write_csv,
+    'jsonl': write_jsonl,
+    'columnar': write_columnar,
+    'parquet': write_parquet,
+}
+
+
+def export_orders(db, path, file_format=None, since=None, until=None, status=None,
+                  chunk_size=EXPORT_CHUNK, progress=None):
+    """
+    Export order lines to a file.
+    
+    Args:
+        db: DatabaseManager to read
+        path: Output file
+        file_format: Key of WRITERS (default: from the file extension, else csv)
+        since: First order date to include (YYYY-MM-DD)
+        until: Last order date to include (YYYY-MM-DD)
+        status: Only orders with this status
+        chunk_size: Rows fetched and written at a time
+        progress: Called as progress(rows written so far) after every chunk
+    
+    Returns:
+        dict: path, format, rows and seconds
+    """
+    if file_format is None:
+        file_format = FORMAT_EXTENSIONS.get(os.path.splitext(path)[1].lower(), 'csv')
+    writer = WRITERS[file_format]
+    stats = {'path': path, 'format': file_format, 'rows': 0, 'seconds': 0.0}
+    
+    def counted(chunks):
+        for rows in chunks:
+            yield rows
+            stats['rows'] += len(rows)
+            if progress is not None:
+                progress(stats['rows'])
+    
+    start = time.perf_counter()
+    writer(counted(iter_order_lines(db, since, until, status, chunk_size)), path)
+    stats['seconds'] = round(time.perf_counter() - start, 2)
+    return stats
+
+
+def main():
+    """Parse the command line and run the export."""
+    parser = argparse.ArgumentParser(description="Export Shoe Shop order lines")
+    parser.add_argument('path', help="Output file")
+    parser.add_argument('--db', default="shoe_shop.db", help="Database to read")
+    parser.add_argument('--format', choices=sorted(WRITERS), help="Output format (default: from the extension)")
+    parser.add_argument('--since', help="First order date to include (YYYY-MM-DD)")
+    parser.add_argument('--until', help="Last order date to include (YYYY-MM-DD)")
+    parser.add_argument('--status', help="Only orders with this status")
+    parser.add_argument('--chunk', type=int, default=EXPORT_CHUNK, help="Rows fetched and written at a time")
+    args = parser.parse_args()
+    
+    db = DatabaseManager(args.db)
+    try:
+        stats = export_orders(db, args.path, args.format, args.since, args.until, args.status, args.chunk,
+                              progress=lambda rows: print(f"\r{rows:,} rows", end='', file=sys.stderr, flush=True))
+    except RuntimeError as e:
+        parser.error(str(e))
+    finally:
+        db.close()
+    print(file=sys.stderr)
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
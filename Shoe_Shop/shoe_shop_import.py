@@ -0,0 +1,495 @@
+"""
+Streaming bulk import of products, customers and inventory levels.
+
+Files are read a row at a time and written in batched transactions, so
+memory use stays flat however large the file is. Category and supplier
+names are resolved to IDs through an in-memory lookup that is loaded
+once. When the target table starts out empty, the search and dashboard
+triggers are suspended for the load and the derived data is rebuilt once
+at the end (DatabaseManager.bulk_load). Imports into a table that
+already has rows keep the triggers, so a shop that is trading while the
+file loads keeps current search results and KPIs.
+
+Usage (from the Shoe_Shop folder):
+    python shoe_shop_import.py products catalog.csv --create-missing
+    python shoe_shop_import.py customers customers.jsonl
+    python shoe_shop_import.py inventory stock_count.csv
+
+Columns (CSV header or JSONL keys):
+    products:  product_name, category, price are required; product_id,
+               supplier, brand, size, color, gender, cost_price,
+               description, quantity and min_stock_level are optional
+    customers: first_name and last_name are required; customer_id, email,
+               phone, address and registration_date are optional
+    inventory: product_id and quantity are required; min_stock_level is
+               optional
+
+Rows with an ID column update the existing record; rows without one are
+added with new IDs, numbered above every ID already in the table or
+given in the same batch. Rows that fail validation are skipped and
+reported with their line number.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+from Shoe_Shop import DatabaseManager
+
+
+# Rows written per transaction
+IMPORT_BATCH = 10000
+
+# Table each import type writes to
+ENTITY_TABLES = {'products': 'Products', 'customers': 'Customers', 'inventory': 'Inventory'}
+
+# Rejected rows whose messages are kept for the report
+MAX_REPORTED_ERRORS = 20
+
+# Alternative column names accepted in import files
+FIELD_ALIASES = {
+    'category_name': 'category',
+    'supplier_name': 'supplier',
+    'stock': 'quantity',
+}
+ALIASED_FIELDS = frozenset(FIELD_ALIASES)
+
+
+class RowError(ValueError):
+    """Raised for an import row that cannot be loaded."""
+
+
+def read_csv(path):
+    """
+    Stream the rows of a CSV file with a header line.
+    
+    Yields:
+        tuple: (line number, {column: value}); empty cells are ''
+    """
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        header = [FIELD_ALIASES.get(name.strip(), name.strip()) for name in next(reader, [])]
+        for values in reader:
+            if values:
+                yield reader.line_num, dict(zip(header, values))
+
+
+def read_jsonl(path):
+    """
+    Stream the objects of a JSON Lines file.
+    
+    Yields:
+        tuple: (line number, {key: value}); a line that is not a JSON
+            object yields a RowError instead of a dict
+    """
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, RowError(f"invalid JSON: {e.msg}")
+                continue
+            if not isinstance(row, dict):
+                yield line_number, RowError("line is not a JSON object")
+                continue
+            if not ALIASED_FIELDS.isdisjoint(row):
+                row = {FIELD_ALIASES.get(name, name): value for name, value in row.items()}
+            yield line_number, row
+
+
+def read_rows(path, file_format=None):
+    """
+    Stream rows from a CSV or JSONL file.
+    
+    Args:
+        path: File to read
+        file_format: 'csv' or 'jsonl' (default: from the file extension)
+    """
+    if file_format is None:
+        file_format = 'jsonl' if os.path.splitext(path)[1].lower() in ('.jsonl', '.ndjson', '.json') else 'csv'
+    return read_jsonl(path) if file_format == 'jsonl' else read_csv(path)
+
+
+def _text(row, name, required=False):
+    """Read a text column; a missing or blank value is None."""
+    value = row.get(name)
+    if value is not None:
+        value = str(value).strip()
+    if not value:
+        if required:
+            raise RowError(f"{name} is required")
+        return None
+    return value
+
+
+def _number(row, name, convert=float, required=False):
+    """Read a numeric column; a missing or empty value is None."""
+    value = row.get(name)
+    if value is None or value == '':
+        if required:
+            raise RowError(f"{name} is required")
+        return None
+    try:
+        return convert(value)
+    except (TypeError, ValueError):
+        raise RowError(f"{name} is not a valid number: {value!r}") from None
+
+
+class NameLookup:
+    """
+    Name-to-ID map for a small reference table such as Categories.
+    
+    The whole table is read once; names are matched case-insensitively.
+    Unknown names are either added to the table or rejected.
+    """
+    
+    def __init__(self, db, table, id_column, name_column, create_missing=False):
+        """
+        Args:
+            db: DatabaseManager to read and write
+            table: Reference table
+            id_column: Its ID column
+            name_column: Its name column
+            create_missing: Add unknown names instead of rejecting the row
+        """
+        self.db = db
+        self.table = table
+        self.id_column = id_column
+        self.name_column = name_column
+        self.create_missing = create_missing
+        self.created = 0
+        self._load()
+    
+    def _load(self):
+        """Read the whole table; where a name repeats, the lowest ID wins."""
+        self._ids = {}
+        for row_id, name in self.db.fetchall(
+                f"SELECT {self.id_column}, {self.name_column} FROM {self.table} ORDER BY {self.id_column} DESC"):
+            self._ids[name.strip().casefold()] = row_id
+    
+    def check(self, name):
+        """
+        Reject a name that resolve() would not accept, without adding anything.
+        
+        Args:
+            name: Name from the import row, or None
+        
+        Raises:
+            RowError: The name is unknown and may not be added
+        """
+        if name is not None and not self.create_missing and name.casefold() not in self._ids:
+            raise RowError(f"unknown {self.name_column.replace('_', ' ')}: {name!r}")
+    
+    def resolve(self, cursor, name):
+        """
+        Return the ID for a name, adding it if allowed.
+        
+        Args:
+            cursor: Cursor of the open batch transaction
+            name: Name from the import row, or None
+        
+        Returns:
+            int: The ID, or None when the name is None
+        """
+        if name is None:
+            return None
+        self.check(name)
+        key = name.casefold()
+        row_id = self._ids.get(key)
+        if row_id is None:
+            cursor.execute(f"INSERT INTO {self.table} ({self.name_column}) VALUES (?)", (name,))
+            row_id = self._ids[key] = cursor.lastrowid
+            self.created += 1
+        return row_id
+    
+    def forget_created(self, created_before):
+        """Reload after a rolled-back batch so names it added (never saved) are dropped."""
+        if self.created != created_before:
+            self._load()
+            self.created = created_before
+
+
+class Importer:
+    """
+    Batched writer for one kind of import row.
+    
+    Rows are validated and converted as they stream in and written
+    IMPORT_BATCH at a time with executemany, one transaction per batch.
+    """
+    
+    ENTITIES = ('products', 'customers', 'inventory')
+    
+    def __init__(self, db, entity, batch_size=IMPORT_BATCH, create_missing=False, progress=None):
+        """
+        Args:
+            db: DatabaseManager to load into
+            entity: 'products', 'customers' or 'inventory'
+            batch_size: Rows per transaction
+            create_missing: Add unknown category and supplier names
+            progress: Called as progress(stats) after every batch
+        """
+        if entity not in self.ENTITIES:
+            raise ValueError(f"Unknown import type {entity!r}; expected one of {', '.join(self.ENTITIES)}")
+        self.db = db
+        self.entity = entity
+        self.batch_size = batch_size
+        self.progress = progress
+        self.stats = {'rows': 0, 'imported': 0, 'rejected': 0, 'errors': [], 'seconds': 0.0}
+        if entity == 'products':
+            self.categories = NameLookup(db, 'Categories', 'category_id', 'category_name', create_missing)
+            self.suppliers = NameLookup(db, 'Suppliers', 'supplier_id', 'supplier_name', create_missing)
+    
+    def run(self, rows):
+        """
+        Import every row.
+        
+        Args:
+            rows: Iterable of (line number, dict or RowError)
+        
+        Returns:
+            dict: rows, imported, rejected, errors (first few as
+                "line N: message") and seconds
+        """
+        start = time.perf_counter()
+        batch = []
+        for line_number, row in rows:
+            self.stats['rows'] += 1
+            if isinstance(row, RowError):
+                self._reject(line_number, row)
+                continue
+            batch.append((line_number, row))
+            if len(batch) >= self.batch_size:
+                self._write(batch)
+                batch = []
+                self._report(start)
+        if batch:
+            self._write(batch)
+        self._report(start)
+        return self.stats
+    
+    def _report(self, start):
+        """Update the elapsed time and call the progress callback."""
+        self.stats['seconds'] = round(time.perf_counter() - start, 2)
+        if self.progress is not None:
+            self.progress(self.stats)
+    
+    def _reject(self, line_number, error):
+        """Count a rejected row and keep its message if there is room."""
+        self.stats['rejected'] += 1
+        if len(self.stats['errors']) < MAX_REPORTED_ERRORS:
+            self.stats['errors'].append(f"line {line_number}: {error}")
+    
+    def _write(self, batch):
+        """Convert and write one batch in a single transaction."""
+        write = getattr(self, f"_write_{self.entity}")
+        lookups = [self.categories, self.suppliers] if self.entity == 'products' else []
+        created_before = [lookup.created for lookup in lookups]
+        try:
+            with self.db.transaction(immediate=True) as cursor:
+                self.stats['imported'] += write(cursor, batch)
+        except BaseException:
+            # The batch was rolled back, including any names it added
+            for lookup, created in zip(lookups, created_before):
+                lookup.forget_created(created)
+            raise
+    
+    def _assign_ids(self, cursor, table, id_column, rows):
+        """
+        Give the rows without an ID new ones, in place.
+        
+        IDs are handed out in the batch to pair related rows. They start
+        above the table's highest ID and above every ID given explicitly
+        in the batch, so a later row carrying an ID cannot overwrite a row
+        that was just added.
+        
+        Args:
+            cursor: Cursor of the open batch transaction
+            table: Table the rows go to
+            id_column: Its ID column
+            rows: Lists whose first item is the row's ID or None
+        """
+        next_id = cursor.execute(f"SELECT COALESCE(MAX({id_column}), 0) + 1 FROM {table}").fetchone()[0]
+        next_id = max([next_id] + [row[0] + 1 for row in rows if row[0] is not None])
+        for row in rows:
+            if row[0] is None:
+                row[0] = next_id
+                next_id += 1
+    
+    def _write_products(self, cursor, batch):
+        """Upsert products and their Inventory rows."""
+        parsed = []
+        for line_number, row in batch:
+            try:
+                product_id = _number(row, 'product_id', int)
+                product_name = _text(row, 'product_name', required=True)
+                category = _text(row, 'category', required=True)
+                supplier = _text(row, 'supplier')
+                details = (
+                    _text(row, 'brand'),
+                    _number(row, 'size'),
+                    _text(row, 'color'),
+                    _text(row, 'gender'),
+                    _number(row, 'price', required=True),
+                    _number(row, 'cost_price'),
+                    _text(row, 'description'),
+                )
+                quantity = _number(row, 'quantity', int)
+                min_stock_level = _number(row, 'min_stock_level', int)
+                self.categories.check(category)
+                self.suppliers.check(supplier)
+            except RowError as e:
+                self._reject(line_number, e)
+                continue
+            # Only a row that is otherwise valid may add a category or supplier
+            values = (product_name, self.categories.resolve(cursor, category),
+                      self.suppliers.resolve(cursor, supplier)) + details
+            parsed.append([product_id, values, quantity, min_stock_level])
+        
+        self._assign_ids(cursor, 'Products', 'product_id', parsed)
+        products = [(product_id,) + values for product_id, values, _, _ in parsed]
+        stock = [(product_id, quantity, min_stock_level) for product_id, _, quantity, min_stock_level in parsed]
+        
+        cursor.executemany('''
+            INSERT INTO Products (product_id, product_name, category_id, supplier_id, brand, size, color,
+                                  gender, price, cost_price, description)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (product_id) DO UPDATE SET
+                product_name = excluded.product_name, category_id = excluded.category_id,
+                supplier_id = excluded.supplier_id, brand = excluded.brand, size = excluded.size,
+                color = excluded.color, gender = excluded.gender, price = excluded.price,
+                cost_price = excluded.cost_price, description = excluded.description
+        ''', products)
+        cursor.executemany('''
+            INSERT INTO Inventory (product_id, quantity, min_stock_level, last_restocked)
+            VALUES (?1, COALESCE(?2, 0), COALESCE(?3, 10), CURRENT_DATE)
+            ON CONFLICT (product_id) DO UPDATE SET
+                quantity = COALESCE(?2, quantity),
+                min_stock_level = COALESCE(?3, min_stock_level)
+        ''', stock)
+        return len(products)
+    
+    def _write_customers(self, cursor, batch):
+        """Upsert customers."""
+        customers = []
+        for line_number, row in batch:
+            try:
+                customer_id = _number(row, 'customer_id', int)
+                values = (
+                    _text(row, 'first_name', required=True),
+                    _text(row, 'last_name', required=True),
+                    _text(row, 'email'),
+                    _text(row, 'phone'),
+                    _text(row, 'address'),
+                    _text(row, 'registration_date'),
+                )
+            except RowError as e:
+                self._reject(line_number, e)
+                continue
+            customers.append([customer_id, *values])
+        
+        self._assign_ids(cursor, 'Customers', 'customer_id', customers)
+        
+        cursor.executemany('''
+            INSERT INTO Customers (customer_id, first_name, last_name, email, phone, address, registration_date)
+            VALUES (?1, ?2, ?3, ?4, ?5, ?6, COALESCE(?7, CURRENT_DATE))
+            ON CONFLICT (customer_id) DO UPDATE SET
+                first_name = excluded.first_name, last_name = excluded.last_name, email = excluded.email,
+                phone = excluded.phone, address = excluded.address,
+                registration_date = COALESCE(?7, registration_date)
+        ''', customers)
+        return len(customers)
+    
+    def _write_inventory(self, cursor, batch):
+        """Set stock levels of existing products."""
+        levels = []
+        for line_number, row in batch:
+            try:
+                levels.append((line_number, _number(row, 'product_id', int, required=True),
+                               _number(row, 'quantity', int, required=True), _number(row, 'min_stock_level', int)))
+            except RowError as e:
+                self._reject(line_number, e)
+        
+        cursor.execute("CREATE TEMP TABLE IF NOT EXISTS import_products (product_id INTEGER PRIMARY KEY)")
+        cursor.execute("DELETE FROM temp.import_products")
+        cursor.executemany("INSERT OR IGNORE INTO temp.import_products SELECT product_id FROM Products WHERE product_id = ?",
+                           [(product_id,) for _, product_id, _, _ in levels])
+        known = {row[0] for row in cursor.execute("SELECT product_id FROM temp.import_products")}
+        
+        rows = []
+        for line_number, product_id, quantity, min_stock_level in levels:
+            if product_id in known:
+                rows.append((product_id, quantity, min_stock_level))
+            else:
+                self._reject(line_number, RowError(f"unknown product_id: {product_id}"))
+        cursor.executemany('''
+            INSERT INTO Inventory (product_id, quantity, min_stock_level, last_restocked)
+            VALUES (?1, ?2, COALESCE(?3, 10), CURRENT_DATE)
+            ON CONFLICT (product_id) DO UPDATE SET
+                quantity = ?2,
+                min_stock_level = COALESCE(?3, min_stock_level),
+                last_restocked = CURRENT_DATE
+        ''', rows)
+        return len(rows)
+
+
+def import_file(db, entity, path, file_format=None, batch_size=IMPORT_BATCH, create_missing=False, progress=None):
+    """
+    Import one file, suspending the derived-data triggers for a first load.
+    
+    Args:
+        db: DatabaseManager to load into
+        entity: 'products', 'customers' or 'inventory'
+        path: CSV or JSONL file
+        file_format: 'csv' or 'jsonl' (default: from the file extension)
+        batch_size: Rows per transaction
+        create_missing: Add unknown category and supplier names
+        progress: Called as progress(stats) after every batch
+    
+    Returns:
+        dict: Import statistics (see Importer.run)
+    """
+    importer = Importer(db, entity, batch_size, create_missing, progress)
+    # bulk_load is for offline first loads; a table that already has rows
+    # may be in use by the shop, so its triggers stay in place
+    if db.fetchvalue(f"SELECT EXISTS (SELECT 1 FROM {ENTITY_TABLES[entity]})"):
+        return importer.run(read_rows(path, file_format))
+    with db.bulk_load():
+        return importer.run(read_rows(path, file_format))
+
+
+def print_progress(stats):
+    """Show a one-line running count on stderr."""
+    rate = stats['rows'] / stats['seconds'] if stats['seconds'] else 0
+    print(f"\r{stats['rows']:,} rows read, {stats['imported']:,} imported, {stats['rejected']:,} rejected "
+          f"({rate:,.0f} rows/s)", end='', file=sys.stderr, flush=True)
+
+
+def main():
+    """Parse the command line and run the import."""
+    parser = argparse.ArgumentParser(description="Bulk import into the Shoe Shop database")
+    parser.add_argument('entity', choices=Importer.ENTITIES, help="What the file contains")
+    parser.add_argument('path', help="CSV or JSONL file")
+    parser.add_argument('--db', default="shoe_shop.db", help="Database to load into")
+    parser.add_argument('--format', choices=('csv', 'jsonl'), help="File format (default: from the extension)")
+    parser.add_argument('--batch', type=int, default=IMPORT_BATCH, help="Rows per transaction")
+    parser.add_argument('--create-missing', action='store_true',
+                        help="Add unknown category and supplier names instead of rejecting the rows")
+    args = parser.parse_args()
+    
+    db = DatabaseManager(args.db)
+    db.create_schema()
+    try:
+        stats = import_file(db, args.entity, args.path, args.format, args.batch, args.create_missing,
+                            progress=print_progress)
+    finally:
+        db.close()
+    print(file=sys.stderr)
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,469 @@
+"""
+Local HTTP/JSON server for the Shoe Shop database.
+
+Several tills on one host can share one server instead of each opening
+shoe_shop.db directly. Reads run on a pool of worker threads, each with
+its own SQLite connection. Every write goes through a single writer
+task, which takes the queued requests in batches and commits each batch
+as one transaction. A request that fails is rolled back to its own
+savepoint, so one rejected order never undoes the others in its batch.
+
+Usage (from the Shoe_Shop folder):
+    python shoe_shop_server.py --port 8765
+
+Endpoints (JSON in, JSON out):
+    GET  /health
+    GET  /dashboard
+    GET  /products?q=air+max            search, or ?after=<id>&limit=<n> to page
+    GET  /products/<product_id>
+    POST /products                      ProductService.add fields
+    GET  /customers?q=...               search, or ?after=<id>&limit=<n> to page
+    POST /customers                     CustomerService.add fields
+    GET  /inventory?q=...&filter=Low+Stock
+    GET  /inventory/<product_id>        stock levels
+    POST /inventory/<inventory_id>/restock   {"quantity": 10}
+    GET  /orders/recent?limit=10
+    POST /orders                        {"customer_id": 1, "items": [{"product_id": 2, "quantity": 1}],
+                                         "status": "Completed", "payment_method": "Cash"}
+"""
+import argparse
+import asyncio
+import json
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from Shoe_Shop import (DEFAULT_STORAGE_PROFILE, INVENTORY_FILTERS, SLOW_QUERY_LOG, STORAGE_PROFILES,
+                       InsufficientStockError, NotFoundError, QueryProfiler, RecordInUseError, ShopError,
+                       ShopServices, ValidationError)
+
+
+# Most write requests committed together by the single writer
+WRITE_BATCH = 64
+
+# Rows returned by a listing page when the client gives no limit
+PAGE_SIZE = 50
+
+# Field names of the rows each list endpoint returns
+PRODUCT_FIELDS = ('product_id', 'product_name', 'brand', 'size', 'color', 'price', 'category_name')
+CUSTOMER_FIELDS = ('customer_id', 'first_name', 'last_name', 'email', 'phone', 'registration_date')
+INVENTORY_FIELDS = ('inventory_id', 'product_name', 'brand', 'size', 'quantity', 'min_stock_level', 'status')
+ORDER_FIELDS = ('order_id', 'customer', 'order_date', 'total_amount', 'status')
+
+# HTTP status for each kind of business-rule failure
+ERROR_STATUS = [
+    (InsufficientStockError, 409),
+    (RecordInUseError, 409),
+    (NotFoundError, 404),
+    (ValidationError, 400),
+    (ShopError, 400),
+]
+
+REASONS = {200: 'OK', 201: 'Created', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           409: 'Conflict', 413: 'Payload Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+MAX_BODY = 1024 * 1024
+
+
+class HTTPError(Exception):
+    """Raised by a handler to answer with an error status."""
+    
+    def __init__(self, status, message):
+        """
+        Args:
+            status: HTTP status code
+            message: Error text returned to the client
+        """
+        super().__init__(message)
+        self.status = status
+
+
+def rows_to_dicts(fields, rows):
+    """
+    Turn result rows into JSON objects.
+    
+    Returns:
+        list: One dict per row
+    """
+    return [dict(zip(fields, row)) for row in rows]
+
+
+class ShopServer:
+    """
+    asyncio HTTP server over ShopServices.
+    
+    Reads are run on a thread pool; DatabaseManager keeps one connection
+    per thread, so the pool doubles as the connection pool. Writes are
+    queued to a single writer so clients never race each other for the
+    SQLite write lock.
+    """
+    
+    def __init__(self, services, read_workers=4, write_batch=WRITE_BATCH):
+        """
+        Args:
+            services: ShopServices to serve
+            read_workers: Reader threads (and so reader connections)
+            write_batch: Most write requests committed per transaction
+        """
+        self.services = services
+        self.write_batch = write_batch
+        self.read_pool = ThreadPoolExecutor(max_workers=read_workers, thread_name_prefix='shop-read')
+        self.write_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='shop-write')
+        self.write_queue = None
+        self.server = None
+        self._writer_task = None
+        self.routes = [
+            ('GET', ('health',), self.health),
+            ('GET', ('dashboard',), self.dashboard),
+            ('GET', ('products',), self.list_products),
+            ('GET', ('products', int), self.get_product),
+            ('POST', ('products',), self.add_product),
+            ('GET', ('customers',), self.list_customers),
+            ('POST', ('customers',), self.add_customer),
+            ('GET', ('inventory',), self.list_inventory),
+            ('GET', ('inventory', int), self.get_stock),
+            ('POST', ('inventory', int, 'restock'), self.restock),
+            ('GET', ('orders', 'recent'), self.recent_orders),
+            ('POST', ('orders',), self.place_order),
+        ]
+    
+    async def start(self, host='127.0.0.1', port=8765):
+        """
+        Start listening and start the writer.
+        
+        Returns:
+            int: The port actually bound (useful with port 0)
+        """
+        self.write_queue = asyncio.Queue()
+        self._writer_task = asyncio.create_task(self._writer())
+        self.server = await asyncio.start_server(self._client, host, port)
+        return self.server.sockets[0].getsockname()[1]
+    
+    async def close(self):
+        """Stop accepting clients, finish queued writes and close the database."""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self._writer_task is not None:
+            await self.write_queue.join()
+            self._writer_task.cancel()
+        self.read_pool.shutdown(wait=True)
+        self.write_pool.shutdown(wait=True)
+        self.services.close()
+    
+    async def read(self, func, *args):
+        """Run a read-only service call on the reader pool."""
+        return await asyncio.get_running_loop().run_in_executor(self.read_pool, func, *args)
+    
+    async def write(self, func, *args):
+        """Queue a service call for the single writer and wait for its result."""
+        future = asyncio.get_running_loop().create_future()
+        await self.write_queue.put((func, args, future))
+        return await future
+    
+    async def _writer(self):
+        """Take queued writes in batches and commit each batch on the writer thread."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.write_queue.get()]
+            while len(batch) < self.write_batch and not self.write_queue.empty():
+                batch.append(self.write_queue.get_nowait())
+            try:
+                results = await loop.run_in_executor(self.write_pool, self._commit_batch, batch)
+            except Exception as e:
+                # The commit itself failed, so none of the batch was saved
+                results = [(False, e)] * len(batch)
+            for (_, _, future), (ok, value) in zip(batch, results):
+                if future.done():
+                    continue
+                if ok:
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+            for _ in batch:
+                self.write_queue.task_done()
+    
+    def _commit_batch(self, batch):
+        """
+        Run a batch of write requests in one transaction.
+        
+        Each request gets its own savepoint; the service methods' own
+        transactions join the outer one.
+        
+        Returns:
+            list: (succeeded, result or exception) per request
+        """
+        results = []
+        with self.services.db.transaction(immediate=True) as cursor:
+            for func, args, _ in batch:
+                cursor.execute("SAVEPOINT request")
+                try:
+                    results.append((True, func(*args)))
+                except Exception as e:
+                    cursor.execute("ROLLBACK TO request")
+                    results.append((False, e))
+                cursor.execute("RELEASE request")
+        # A reader may have reloaded a list between a write and the commit;
+        # drop just the lists whose tables the batch wrote
+        self.services.catalog.drop_changed()
+        return results
+    
+    async def _client(self, reader, writer):
+        """Serve one keep-alive connection until the client closes it."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    break
+                
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                
+                try:
+                    length = int(headers.get('content-length') or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    # The body cannot be framed, so the connection cannot be reused
+                    await self._respond(writer, 400, {'error': "Invalid Content-Length"}, keep_alive=False)
+                    break
+                if length > MAX_BODY:
+                    await self._respond(writer, 413, {'error': "Request body too large"}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+                
+                status, payload = await self._dispatch(method, target, body)
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              and version == 'HTTP/1.1')
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+    
+    async def _respond(self, writer, status, payload, keep_alive):
+        """Write one JSON response."""
+        body = json.dumps(payload).encode('utf-8')
+        writer.write(
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + body)
+        await writer.drain()
+    
+    async def _dispatch(self, method, target, body):
+        """
+        Route a request to its handler.
+        
+        Returns:
+            tuple: (HTTP status, JSON-serialisable payload)
+        """
+        url = urlsplit(target)
+        parts = tuple(part for part in url.path.split('/') if part)
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        
+        allowed = False
+        for route_method, pattern, handler in self.routes:
+            args = self._match(pattern, parts)
+            if args is None:
+                continue
+            allowed = True
+            if route_method != method:
+                continue
+            try:
+                data = json.loads(body) if body else {}
+                if not isinstance(data, dict):
+                    raise HTTPError(400, "Request body must be a JSON object")
+                return await handler(query, data, *args)
+            except json.JSONDecodeError:
+                return 400, {'error': "Request body is not valid JSON"}
+            except HTTPError as e:
+                return e.status, {'error': str(e)}
+            except ShopError as e:
+                status = next(code for kind, code in ERROR_STATUS if isinstance(e, kind))
+                return status, {'error': str(e)}
+            except sqlite3.OperationalError as e:
+                return 503, {'error': str(e)}
+            except Exception as e:
+                return 500, {'error': f"{type(e).__name__}: {e}"}
+        
+        if allowed:
+            return 405, {'error': f"{method} is not supported here"}
+        return 404, {'error': f"No such endpoint: {url.path}"}
+    
+    @staticmethod
+    def _match(pattern, parts):
+        """
+        Match path segments against a route pattern.
+        
+        Returns:
+            list: Converted path arguments, or None if the path does not match
+        """
+        if len(pattern) != len(parts):
+            return None
+        args = []
+        for expected, part in zip(pattern, parts):
+            if expected is int:
+                if not part.isdigit():
+                    return None
+                args.append(int(part))
+            elif expected != part:
+                return None
+        return args
+    
+    @staticmethod
+    def _int_param(query, name, default):
+        """Read an integer query parameter."""
+        try:
+            return int(query.get(name, default))
+        except ValueError:
+            raise HTTPError(400, f"{name} must be a whole number") from None
+    
+    def _page(self, result, fields, query):
+        """Turn a search result or listing into JSON rows."""
+        if isinstance(result, list):
+            return rows_to_dicts(fields, result)
+        limit = min(self._int_param(query, 'limit', PAGE_SIZE), 1000)
+        after = self._int_param(query, 'after', 0)
+        return rows_to_dicts(fields, result.page(after, limit, inclusive=False))
+    
+    async def health(self, query, data):
+        """Report that the server is up and how many writes are queued."""
+        return 200, {'status': 'ok', 'queued_writes': self.write_queue.qsize()}
+    
+    async def dashboard(self, query, data):
+        """Return the dashboard KPIs."""
+        return 200, await self.read(self.services.dashboard)
+    
+    async def list_products(self, query, data):
+        """Search products, or page through all of them when q is empty."""
+        def run():
+            return self._page(self.services.products.search(query.get('q', '')), PRODUCT_FIELDS, query)
+        return 200, await self.read(run)
+    
+    async def get_product(self, query, data, product_id):
+        """Return one product."""
+        return 200, await self.read(self.services.products.get, product_id)
+    
+    async def add_product(self, query, data):
+        """Add a product."""
+        fields = self._fields(data, ('product_name', 'category_name', 'price', 'cost_price'),
+                              ('brand', 'size', 'color', 'gender', 'description'))
+        product_id = await self.write(lambda: self.services.products.add(**fields))
+        return 201, {'product_id': product_id}
+    
+    async def list_customers(self, query, data):
+        """Search customers, or page through all of them when q is empty."""
+        def run():
+            return self._page(self.services.customers.search(query.get('q', '')), CUSTOMER_FIELDS, query)
+        return 200, await self.read(run)
+    
+    async def add_customer(self, query, data):
+        """Add a customer."""
+        fields = self._fields(data, ('first_name', 'last_name'), ('email', 'phone', 'address'))
+        customer_id = await self.write(lambda: self.services.customers.add(**fields))
+        return 201, {'customer_id': customer_id}
+    
+    async def list_inventory(self, query, data):
+        """Search or page inventory, optionally filtered by stock status."""
+        filter_type = query.get('filter', 'All')
+        if filter_type not in INVENTORY_FILTERS:
+            raise HTTPError(400, f"filter must be one of {', '.join(INVENTORY_FILTERS)}")
+        
+        def run():
+            return self._page(self.services.inventory.search(query.get('q', ''), filter_type),
+                              INVENTORY_FIELDS, query)
+        return 200, await self.read(run)
+    
+    async def get_stock(self, query, data, product_id):
+        """Return a product's stock levels."""
+        return 200, await self.read(self.services.inventory.stock, product_id)
+    
+    async def restock(self, query, data, inventory_id):
+        """Add units to one inventory item."""
+        await self.write(self.services.inventory.restock, inventory_id, data.get('quantity'))
+        return 200, {'inventory_id': inventory_id}
+    
+    async def recent_orders(self, query, data):
+        """Return the most recent orders."""
+        limit = min(self._int_param(query, 'limit', 10), 100)
+        return 200, rows_to_dicts(ORDER_FIELDS, await self.read(self.services.orders.recent, limit))
+    
+    async def place_order(self, query, data):
+        """Place an order; lines are priced from the current catalog."""
+        items = data.get('items')
+        if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+            raise HTTPError(400, "items must be a list of {product_id, quantity} objects")
+        
+        def run():
+            # Prices are read inside the write transaction, so they match what is charged
+            lines = [self.services.orders.line(item.get('product_id'), item.get('quantity')) for item in items]
+            order_id = self.services.orders.place(
+                data.get('customer_id'), lines,
+                data.get('status', 'Pending'), data.get('payment_method', 'Cash'),
+                session_id=data.get('session_id'))
+            return order_id, sum(line['subtotal'] for line in lines)
+        
+        order_id, total = await self.write(run)
+        return 201, {'order_id': order_id, 'total_amount': total}
+    
+    @staticmethod
+    def _fields(data, required, optional):
+        """
+        Pick keyword arguments for a service call out of a request body.
+        
+        Raises:
+            HTTPError: A required field is missing
+        """
+        missing = [name for name in required if name not in data]
+        if missing:
+            raise HTTPError(400, f"Missing field(s): {', '.join(missing)}")
+        return {name: data[name] for name in required + optional if name in data}
+
+
+async def serve(db_name, host, port, read_workers, write_batch, storage_profile, profiler=None):
+    """Open the database and serve until interrupted."""
+    server = ShopServer(ShopServices.open(db_name, storage_profile=storage_profile, profiler=profiler),
+                        read_workers=read_workers, write_batch=write_batch)
+    bound_port = await server.start(host, port)
+    print(f"Serving {db_name} on http://{host}:{bound_port}", flush=True)
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main():
+    """Parse the command line and run the server."""
+    parser = argparse.ArgumentParser(description="Shoe Shop local JSON server")
+    parser.add_argument('--db', default="shoe_shop.db", help="Database file to serve")
+    parser.add_argument('--host', default='127.0.0.1', help="Interface to listen on")
+    parser.add_argument('--port', type=int, default=8765, help="Port to listen on (0 picks a free one)")
+    parser.add_argument('--read-workers', type=int, default=4, help="Reader threads/connections")
+    parser.add_argument('--write-batch', type=int, default=WRITE_BATCH, help="Most writes per transaction")
+    parser.add_argument('--storage-profile', default=DEFAULT_STORAGE_PROFILE, choices=sorted(STORAGE_PROFILES))
+    parser.add_argument('--slow-ms', type=float, help="Profile queries and log those taking at least this long")
+    parser.add_argument('--slow-log', default=SLOW_QUERY_LOG, help="Slow-query log file")
+    args = parser.parse_args()
+    
+    profiler = QueryProfiler(args.slow_ms, args.slow_log) if args.slow_ms is not None else None
+    try:
+        asyncio.run(serve(args.db, args.host, args.port, args.read_workers, args.write_batch,
+                          args.storage_profile, profiler))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Unit tests; run `python -m pytest` or `python -m unittest` from the Shoe_Shop directory."""
@@ -0,0 +1,111 @@
+"""Tests for CatalogCache versioning and cross-connection invalidation."""
+
+import os
+import tempfile
+import unittest
+
+from Shoe_Shop import CatalogCache, DatabaseManager
+
+
+def write(db, query, params=()):
+    """Run one write in its own transaction, as the services do."""
+    with db.transaction() as cursor:
+        cursor.execute(query, params)
+
+
+class CatalogCacheTest(unittest.TestCase):
+    
+    def setUp(self):
+        # A file, so a second manager can play another terminal
+        self.dir = tempfile.TemporaryDirectory()
+        path = os.path.join(self.dir.name, 'shop.db')
+        self.db = DatabaseManager(path)
+        self.db.create_schema()
+        self.other = DatabaseManager(path)
+        with self.db.transaction() as cursor:
+            cursor.execute("INSERT INTO Categories (category_id, category_name) VALUES (1, 'Running')")
+            cursor.executemany("INSERT INTO Products (product_id, product_name, category_id, price) VALUES (?, ?, 1, ?)",
+                               [(1, 'Air', 100), (2, 'Zoom', 200)])
+            cursor.executemany("INSERT INTO Customers (customer_id, first_name, last_name) VALUES (?, ?, ?)",
+                               [(1, 'Ana', 'Cruz'), (2, 'Ben', 'Reyes')])
+        self.cache = CatalogCache(self.db)
+    
+    def tearDown(self):
+        self.db.close()
+        self.other.close()
+        self.dir.cleanup()
+    
+    def names(self):
+        return [row[1] for row in self.cache.rows('products')]
+    
+    def test_rows_are_served_from_memory(self):
+        first = self.cache.rows('products')
+        write(self.db, "UPDATE Products SET product_name = 'Changed' WHERE product_id = 1")
+        self.assertIs(self.cache.rows('products'), first)
+    
+    def test_invalidate_reloads_and_bumps_the_version(self):
+        self.names()
+        version = self.cache.versions['products']
+        write(self.db, "UPDATE Products SET product_name = 'Pegasus' WHERE product_id = 1")
+        self.cache.invalidate('products')
+        self.assertEqual(self.cache.versions['products'], version + 1)
+        self.assertEqual(self.names(), ['Pegasus', 'Zoom'])
+    
+    def test_invalidating_categories_drops_products(self):
+        self.names()
+        self.cache.invalidate('categories')
+        self.assertNotIn('products', self.cache._rows)
+    
+    def test_derived_value_is_memoised_per_version(self):
+        builds = []
+        
+        def build(rows):
+            builds.append(len(rows))
+            return len(rows)
+        
+        self.assertEqual(self.cache.derived('count', 'products', build), 2)
+        self.assertEqual(self.cache.derived('count', 'products', build), 2)
+        self.assertEqual(builds, [2])
+        self.cache.invalidate('products')
+        self.assertIsNone(self.cache.derived('count', 'products', build, load=False))
+        self.assertEqual(self.cache.derived('count', 'products', build), 2)
+        self.assertEqual(builds, [2, 2])
+    
+    def test_drop_changed_sees_writes_from_another_connection(self):
+        self.names()
+        self.cache.rows('customers')
+        self.assertEqual(self.cache.drop_changed(), [])
+        
+        write(self.other, "UPDATE Products SET price = 150 WHERE product_id = 1")
+        self.assertEqual(self.cache.drop_changed(), ['products'])
+        self.assertIn('customers', self.cache._rows)
+        self.assertEqual(self.cache.rows('products')[0][5], 150)
+    
+    def test_drop_changed_ignores_stock_changes(self):
+        self.names()
+        write(self.other, "INSERT INTO Inventory (product_id, quantity) VALUES (1, 5)")
+        self.assertEqual(self.cache.drop_changed(), [])
+    
+    def test_category_rename_drops_products(self):
+        self.names()
+        self.cache.rows('categories')
+        write(self.other, "UPDATE Categories SET category_name = 'Trail' WHERE category_id = 1")
+        self.assertEqual(sorted(self.cache.drop_changed()), ['categories', 'products'])
+        self.assertEqual(self.cache.rows('products')[0][6], 'Trail')
+    
+    
+    def test_written_versions_count_listing_writes(self):
+        before = self.cache.written_versions()
+        write(self.other, "INSERT INTO Inventory (product_id, quantity) VALUES (1, 5)")
+        after_stock = self.cache.written_versions()
+        self.assertEqual(after_stock['inventory'], before['inventory'] + 1)
+        self.assertEqual(after_stock['products'], before['products'])
+        # The inventory listing shows product names
+        write(self.other, "UPDATE Products SET product_name = 'Pegasus' WHERE product_id = 1")
+        after_rename = self.cache.written_versions()
+        self.assertEqual(after_rename['inventory'], after_stock['inventory'] + 1)
+        self.assertEqual(after_rename['customers'], before['customers'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+"""Tests for the order line exporter."""
+
+import csv
+import importlib.util
+import os
+import tempfile
+import unittest
+
+from Shoe_Shop import DatabaseManager
+from shoe_shop_export import EXPORT_FIELDS, export_orders
+
+
+class ExportTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.db = DatabaseManager(':memory:')
+        self.db.create_schema()
+        with self.db.transaction() as cursor:
+            cursor.execute("INSERT INTO Customers (customer_id, first_name, last_name) VALUES (1, 'Ana', 'Cruz')")
+            cursor.execute("INSERT INTO Products (product_id, product_name, price) VALUES (1, 'Air', 100)")
+            cursor.execute("INSERT INTO Orders (order_id, customer_id, order_date, total_amount, status) "
+                           "VALUES (1, 1, '2025-03-01', 200, 'Completed')")
+            cursor.execute("INSERT INTO OrderDetails (order_id, product_id, quantity, unit_price, subtotal) "
+                           "VALUES (1, 1, 2, 100, 200)")
+    
+    def tearDown(self):
+        self.db.close()
+        self.dir.cleanup()
+    
+    def path(self, name):
+        return os.path.join(self.dir.name, name)
+    
+    def test_csv_has_a_header_and_one_line_per_order_line(self):
+        stats = export_orders(self.db, self.path('sales.csv'))
+        with open(self.path('sales.csv'), newline='', encoding='utf-8') as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(stats['rows'], 1)
+        self.assertEqual(rows[0], EXPORT_FIELDS)
+        self.assertEqual(rows[1][EXPORT_FIELDS.index('customer_name')], 'Ana Cruz')
+    
+    def test_empty_range_still_writes_the_header(self):
+        stats = export_orders(self.db, self.path('none.csv'), since='2026-01-01')
+        self.assertEqual(stats['rows'], 0)
+        with open(self.path('none.csv'), newline='', encoding='utf-8') as f:
+            self.assertEqual(list(csv.reader(f)), [EXPORT_FIELDS])
+    
+    @unittest.skipUnless(importlib.util.find_spec('pyarrow'), "needs pyarrow")
+    def test_empty_range_still_writes_a_parquet_file(self):
+        import pyarrow.parquet as pq
+        export_orders(self.db, self.path('none.parquet'), since='2026-01-01')
+        table = pq.read_table(self.path('none.parquet'))
+        self.assertEqual((table.num_rows, table.schema.names), (0, EXPORT_FIELDS))
+
+
+if __name__ == '__main__':
+    unittest.main()
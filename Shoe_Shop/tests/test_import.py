@@ -0,0 +1,185 @@
+"""Tests for the bulk importer's validation and upserts."""
+
+import os
+import tempfile
+import unittest
+
+from Shoe_Shop import DatabaseManager
+from shoe_shop_import import Importer, RowError, import_file
+
+
+def numbered(rows):
+    """Give rows the (line number, row) shape the readers yield."""
+    return list(enumerate(rows, 2))
+
+
+class ImporterTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.db = DatabaseManager(':memory:')
+        self.db.create_schema()
+        with self.db.transaction() as cursor:
+            cursor.execute("INSERT INTO Categories (category_id, category_name) VALUES (1, 'Running')")
+    
+    def tearDown(self):
+        self.db.close()
+    
+    def run_import(self, entity, rows, **options):
+        return Importer(self.db, entity, **options).run(numbered(rows))
+    
+    def product(self, product_id):
+        return self.db.fetchone('''
+            SELECT p.product_name, p.price, i.quantity, i.min_stock_level
+            FROM Products p LEFT JOIN Inventory i ON i.product_id = p.product_id
+            WHERE p.product_id = ?
+        ''', (product_id,))
+    
+    def test_products_are_inserted_with_their_stock(self):
+        stats = self.run_import('products', [
+            {'product_name': 'Air', 'category': 'running', 'price': '100', 'quantity': '4'},
+            {'product_name': 'Zoom', 'category': 'Running', 'price': 250.5},
+        ])
+        self.assertEqual((stats['rows'], stats['imported'], stats['rejected']), (2, 2, 0))
+        self.assertEqual(self.product(1), ('Air', 100, 4, 10))
+        self.assertEqual(self.product(2), ('Zoom', 250.5, 0, 10))
+    
+    def test_invalid_rows_are_rejected_with_their_line(self):
+        stats = self.run_import('products', [
+            {'product_name': 'Air', 'category': 'Running', 'price': '100'},
+            {'product_name': '', 'category': 'Running', 'price': '100'},
+            {'product_name': 'Zoom', 'category': 'Trail', 'price': '100'},
+            {'product_name': 'Max', 'category': 'Running', 'price': 'cheap'},
+            {'product_name': 'Max', 'category': 'Running'},
+        ])
+        self.assertEqual((stats['imported'], stats['rejected']), (1, 4))
+        self.assertEqual(stats['errors'], [
+            "line 3: product_name is required",
+            "line 4: unknown category name: 'Trail'",
+            "line 5: price is not a valid number: 'cheap'",
+            "line 6: price is required",
+        ])
+        self.assertEqual(self.db.fetchvalue("SELECT COUNT(*) FROM Products"), 1)
+    
+    def test_reader_errors_are_rejected(self):
+        stats = Importer(self.db, 'customers').run([(1, RowError("invalid JSON: Expecting value"))])
+        self.assertEqual((stats['rows'], stats['rejected']), (1, 1))
+        self.assertEqual(stats['errors'], ["line 1: invalid JSON: Expecting value"])
+    
+    def test_create_missing_adds_categories(self):
+        stats = self.run_import('products', [
+            {'product_name': 'Zoom', 'category': 'Trail', 'price': '100'},
+            {'product_name': 'Peak', 'category': 'trail', 'price': '100'},
+        ], create_missing=True)
+        self.assertEqual(stats['imported'], 2)
+        self.assertEqual(self.db.fetchall("SELECT category_name FROM Categories ORDER BY category_id"),
+                         [('Running',), ('Trail',)])
+    
+    def test_rejected_rows_add_no_categories_or_suppliers(self):
+        stats = self.run_import('products', [
+            {'product_name': 'Zoom', 'category': 'Trail', 'supplier': 'Acme', 'price': 'cheap'},
+            {'product_name': 'Peak', 'category': 'Hiking', 'price': '100', 'quantity': 'lots'},
+        ], create_missing=True)
+        self.assertEqual((stats['imported'], stats['rejected']), (0, 2))
+        self.assertEqual(self.db.fetchvalue("SELECT COUNT(*) FROM Categories"), 1)
+        self.assertEqual(self.db.fetchvalue("SELECT COUNT(*) FROM Suppliers"), 0)
+    
+    def test_product_with_an_id_is_updated_in_place(self):
+        self.run_import('products', [{'product_id': 5, 'product_name': 'Air', 'category': 'Running',
+                                      'price': '100', 'quantity': '4', 'min_stock_level': '2'}])
+        self.run_import('products', [{'product_id': 5, 'product_name': 'Air 2', 'category': 'Running',
+                                      'price': '120'}])
+        self.assertEqual(self.db.fetchvalue("SELECT COUNT(*) FROM Products"), 1)
+        # Blank stock columns keep the current levels
+        self.assertEqual(self.product(5), ('Air 2', 120, 4, 2))
+    
+    def test_new_rows_do_not_take_ids_given_later_in_the_batch(self):
+        self.run_import('products', [
+            {'product_name': 'New', 'category': 'Running', 'price': '1'},
+            {'product_id': 1, 'product_name': 'Explicit', 'category': 'Running', 'price': '2'},
+        ])
+        self.assertEqual(self.db.fetchall("SELECT product_id, product_name FROM Products ORDER BY product_id"),
+                         [(1, 'Explicit'), (2, 'New')])
+    
+    def test_ids_continue_across_batches(self):
+        rows = [{'product_name': f'P{i}', 'category': 'Running', 'price': '1'} for i in range(7)]
+        stats = self.run_import('products', rows, batch_size=3)
+        self.assertEqual(stats['imported'], 7)
+        self.assertEqual(self.db.fetchvalue("SELECT MAX(product_id) FROM Products"), 7)
+    
+    def test_customers_upsert_keeps_the_registration_date(self):
+        self.run_import('customers', [{'customer_id': 3, 'first_name': 'Ana', 'last_name': 'Cruz',
+                                       'registration_date': '2024-01-02'}])
+        stats = self.run_import('customers', [
+            {'customer_id': 3, 'first_name': 'Ana', 'last_name': 'Reyes'},
+            {'first_name': 'Ben'},
+        ])
+        self.assertEqual((stats['imported'], stats['rejected']), (1, 1))
+        self.assertEqual(self.db.fetchone(
+            "SELECT last_name, registration_date FROM Customers WHERE customer_id = 3"), ('Reyes', '2024-01-02'))
+    
+    def test_inventory_rejects_unknown_products(self):
+        self.run_import('products', [{'product_name': 'Air', 'category': 'Running', 'price': '1', 'quantity': '1'}])
+        stats = self.run_import('inventory', [
+            {'product_id': 1, 'quantity': 9},
+            {'product_id': 42, 'quantity': 9},
+            {'product_id': 1},
+        ])
+        self.assertEqual((stats['imported'], stats['rejected']), (1, 2))
+        self.assertEqual(sorted(stats['errors']), ["line 3: unknown product_id: 42", "line 4: quantity is required"])
+        self.assertEqual(self.product(1)[2], 9)
+
+
+class ImportFileTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.db = DatabaseManager(os.path.join(self.dir.name, 'shop.db'))
+        self.db.create_schema()
+        with self.db.transaction() as cursor:
+            cursor.execute("INSERT INTO Categories (category_id, category_name) VALUES (1, 'Running')")
+    
+    def tearDown(self):
+        self.db.close()
+        self.dir.cleanup()
+    
+    def write_file(self, name, text):
+        path = os.path.join(self.dir.name, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return path
+    
+    def search(self, text):
+        return self.db.fetchall("SELECT rowid FROM products_fts WHERE products_fts MATCH ? ORDER BY rowid", (text,))
+    
+    def test_csv_with_aliased_columns(self):
+        path = self.write_file('products.csv', "product_name,category_name,price,stock\nAir Max,Running,100,3\n")
+        stats = import_file(self.db, 'products', path)
+        self.assertEqual(stats['imported'], 1)
+        self.assertEqual(self.db.fetchvalue("SELECT quantity FROM Inventory WHERE product_id = 1"), 3)
+    
+    def test_jsonl_rejects_bad_lines(self):
+        path = self.write_file('customers.jsonl', '{"first_name": "Ana", "last_name": "Cruz"}\n'
+                                                  'not json\n[1, 2]\n\n{"first_name": "Ben", "last_name": "Lim"}\n')
+        stats = import_file(self.db, 'customers', path)
+        self.assertEqual((stats['imported'], stats['rejected']), (2, 2))
+        self.assertEqual([error.split(':')[0] for error in stats['errors']], ['line 2', 'line 3'])
+    
+    def test_first_load_leaves_search_index_and_triggers_in_place(self):
+        path = self.write_file('products.csv', "product_name,category,price\nAir Max,Running,100\n")
+        import_file(self.db, 'products', path)
+        self.assertEqual(self.search('air'), [(1,)])
+        # Triggers are back, so later edits reach the index
+        with self.db.transaction() as cursor:
+            cursor.execute("INSERT INTO Products (product_name, price) VALUES ('Air Zoom', 90)")
+        self.assertEqual(self.search('air'), [(1,), (2,)])
+    
+    def test_import_into_a_live_table_keeps_the_index_current(self):
+        first = self.write_file('first.csv', "product_name,category,price\nAir Max,Running,100\n")
+        second = self.write_file('second.csv', "product_name,category,price\nAir Zoom,Running,90\n")
+        import_file(self.db, 'products', first)
+        import_file(self.db, 'products', second)
+        self.assertEqual(self.search('zoom'), [(2,)])
+
+
+if __name__ == '__main__':
+    unittest.main()
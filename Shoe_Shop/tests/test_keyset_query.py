@@ -0,0 +1,74 @@
+"""Tests for KeysetQuery paging at the edges of a listing."""
+
+import unittest
+
+from Shoe_Shop import DatabaseManager, KeysetQuery
+
+
+class KeysetQueryTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.db = DatabaseManager(':memory:')
+        self.db.create_schema()
+        # Gaps in the keys, as left by deleted rows
+        self.ids = list(range(2, 52, 2))
+        with self.db.transaction() as cursor:
+            cursor.executemany("INSERT INTO Customers (customer_id, first_name, last_name) VALUES (?, ?, ?)",
+                               [(i, f'First{i}', 'Even' if i % 4 == 0 else 'Odd') for i in self.ids])
+        self.query = KeysetQuery(self.db, 'customer_id, first_name', 'Customers', 'customer_id')
+    
+    def tearDown(self):
+        self.db.close()
+    
+    def keys(self, rows):
+        return [row[0] for row in rows]
+    
+    def test_count(self):
+        self.assertEqual(self.query.count(), len(self.ids))
+    
+    def test_key_at_first_last_and_past_the_end(self):
+        self.assertEqual(self.query.key_at(0), self.ids[0])
+        self.assertEqual(self.query.key_at(len(self.ids) - 1), self.ids[-1])
+        self.assertIsNone(self.query.key_at(len(self.ids)))
+    
+    def test_page_from_the_start(self):
+        self.assertEqual(self.keys(self.query.page(None, 5)), self.ids[:5])
+    
+    def test_page_inclusive_and_exclusive(self):
+        self.assertEqual(self.keys(self.query.page(10, 3)), [10, 12, 14])
+        self.assertEqual(self.keys(self.query.page(10, 3, inclusive=False)), [12, 14, 16])
+    
+    def test_page_between_keys(self):
+        self.assertEqual(self.keys(self.query.page(11, 2)), [12, 14])
+    
+    def test_page_at_the_end_is_short(self):
+        self.assertEqual(self.keys(self.query.page(self.ids[-2], 10)), self.ids[-2:])
+        self.assertEqual(self.query.page(self.ids[-1], 10, inclusive=False), [])
+    
+    def test_page_before(self):
+        self.assertEqual(self.keys(self.query.page_before(10, 3)), [4, 6, 8])
+        self.assertEqual(self.keys(self.query.page_before(6, 10)), [2, 4])
+        self.assertEqual(self.query.page_before(self.ids[0], 10), [])
+    
+    def test_pages_join_without_gaps_or_overlap(self):
+        seen, key = [], None
+        while True:
+            rows = self.query.page(key, 7, inclusive=False) if key is not None else self.query.page(None, 7)
+            if not rows:
+                break
+            seen.extend(self.keys(rows))
+            key = rows[-1][0]
+        self.assertEqual(seen, self.ids)
+    
+    def test_where_filter_applies_to_every_method(self):
+        query = KeysetQuery(self.db, 'customer_id, first_name', 'Customers', 'customer_id',
+                            where="last_name = 'Even'")
+        evens = [i for i in self.ids if i % 4 == 0]
+        self.assertEqual(query.count(), len(evens))
+        self.assertEqual(query.key_at(1), evens[1])
+        self.assertEqual(self.keys(query.page(None, 3)), evens[:3])
+        self.assertEqual(self.keys(query.page_before(evens[3], 2)), evens[1:3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+"""Tests for OrderCart line merging and the running total."""
+
+import unittest
+
+from Shoe_Shop import OrderCart
+
+
+class OrderCartTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.cart = OrderCart()
+    
+    def test_add_creates_a_line_keyed_by_product(self):
+        iid, line, merged = self.cart.add(7, 'Air', 100.5, 2)
+        self.assertEqual((iid, merged), ('7', False))
+        self.assertEqual(line, {'product_id': 7, 'product_name': 'Air', 'quantity': 2,
+                                'unit_price': 100.5, 'subtotal': 201.0})
+        self.assertIn('7', self.cart)
+        self.assertEqual(len(self.cart), 1)
+    
+    def test_adding_the_same_product_merges(self):
+        self.cart.add(7, 'Air', 100, 2)
+        iid, line, merged = self.cart.add(7, 'Air', 100, 3)
+        self.assertTrue(merged)
+        self.assertEqual((line['quantity'], line['subtotal']), (5, 500))
+        self.assertEqual(len(self.cart), 1)
+        self.assertEqual(self.cart.total, 500)
+    
+    def test_items_keep_insertion_order(self):
+        for product_id in (3, 1, 2):
+            self.cart.add(product_id, f'P{product_id}', 10, 1)
+        self.cart.add(3, 'P3', 10, 1)
+        self.assertEqual([item['product_id'] for item in self.cart.items()], [3, 1, 2])
+    
+    def test_remove_and_set_quantity_adjust_the_total(self):
+        self.cart.add(1, 'A', 250, 2)
+        self.cart.add(2, 'B', 99.99, 1)
+        self.cart.set_quantity('2', 3)
+        self.assertAlmostEqual(self.cart.total, 799.97)
+        removed = self.cart.remove('1')
+        self.assertEqual(removed['product_id'], 1)
+        self.assertAlmostEqual(self.cart.total, 299.97)
+        self.assertNotIn('1', self.cart)
+    
+    def test_total_is_exact_in_centavos(self):
+        # 0.1 + 0.2 drifts as a float sum; the centavo total does not
+        for product_id in range(1000):
+            self.cart.add(product_id, 'Sock', 0.1, 1)
+            self.cart.add(product_id + 1000, 'Lace', 0.2, 1)
+        self.assertEqual(self.cart.total, 300.0)
+        for product_id in range(1000):
+            self.cart.remove(str(product_id))
+        self.assertEqual(self.cart.total, 200.0)
+    
+    def test_removing_every_line_returns_to_zero(self):
+        self.cart.add(1, 'A', 19.99, 3)
+        self.cart.add(2, 'B', 0.01, 7)
+        self.cart.remove('1')
+        self.cart.remove('2')
+        self.assertEqual(self.cart.total, 0)
+    
+    def test_clear(self):
+        self.cart.add(1, 'A', 10, 1)
+        self.cart.clear()
+        self.assertEqual((len(self.cart), self.cart.total, self.cart.items()), (0, 0, []))
+    
+    def test_unknown_line_raises_key_error(self):
+        with self.assertRaises(KeyError):
+            self.cart.remove('99')
+
+
+if __name__ == '__main__':
+    unittest.main()
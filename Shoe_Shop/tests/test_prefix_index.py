@@ -0,0 +1,58 @@
+"""Tests for PrefixIndex word-prefix lookups."""
+
+import unittest
+
+from Shoe_Shop import PrefixIndex, TYPEAHEAD_LIMIT
+
+
+class PrefixIndexTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.index = PrefixIndex([
+            'Nike Air Max (₱5,000.00)',
+            'Adidas Ultraboost (₱7,500.00)',
+            'Nike Pegasus (₱4,200.00)',
+            'Air Jordan 1 (₱9,000.00)',
+            'New Balance 574 (₱3,800.00)',
+        ])
+    
+    def test_empty_text_returns_the_first_names(self):
+        self.assertEqual(self.index.search(''), self.index.names)
+        self.assertEqual(self.index.search('  ', limit=2), self.index.names[:2])
+    
+    def test_prefix_of_any_word_matches(self):
+        self.assertEqual(self.index.search('ultra'), ['Adidas Ultraboost (₱7,500.00)'])
+        self.assertEqual(self.index.search('57'), ['New Balance 574 (₱3,800.00)'])
+    
+    def test_matches_keep_preference_order(self):
+        self.assertEqual(self.index.search('air'), ['Nike Air Max (₱5,000.00)', 'Air Jordan 1 (₱9,000.00)'])
+    
+    def test_case_is_ignored(self):
+        self.assertEqual(self.index.search('NIKE'), self.index.search('nike'))
+    
+    def test_every_typed_word_must_match(self):
+        self.assertEqual(self.index.search('nike air'), ['Nike Air Max (₱5,000.00)'])
+        self.assertEqual(self.index.search('air nike'), ['Nike Air Max (₱5,000.00)'])
+        self.assertEqual(self.index.search('nike jordan'), [])
+    
+    def test_prefix_must_start_a_word(self):
+        self.assertEqual(self.index.search('ike'), [])
+    
+    def test_unknown_text_matches_nothing(self):
+        self.assertEqual(self.index.search('zzz'), [])
+    
+    def test_name_with_a_repeated_word_is_returned_once(self):
+        index = PrefixIndex(['Run Run Runner', 'Running Shoe'])
+        self.assertEqual(index.search('run'), ['Run Run Runner', 'Running Shoe'])
+    
+    def test_limit(self):
+        index = PrefixIndex([f'Shoe {i}' for i in range(TYPEAHEAD_LIMIT + 10)])
+        self.assertEqual(len(index.search('shoe')), TYPEAHEAD_LIMIT)
+        self.assertEqual(index.search('shoe', limit=3), ['Shoe 0', 'Shoe 1', 'Shoe 2'])
+    
+    def test_empty_index(self):
+        self.assertEqual(PrefixIndex([]).search('air'), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+"""Tests for the FTS5 search boxes."""
+
+import unittest
+
+from Shoe_Shop import DatabaseManager, ShopServices, fts_prefix_query, fts_result_order
+
+
+class FtsQueryTest(unittest.TestCase):
+    
+    def test_prefix_query_quotes_every_word(self):
+        self.assertEqual(fts_prefix_query('Air "ma'), '"air"* "ma"*')
+        self.assertIsNone(fts_prefix_query(' -- '))
+    
+    def test_short_prefixes_are_not_ranked(self):
+        self.assertEqual(fts_result_order('a'), 'rowid')
+        self.assertEqual(fts_result_order('ai ma'), 'rowid')
+        self.assertEqual(fts_result_order('air'), 'rank')
+        self.assertEqual(fts_result_order('a max'), 'rank')
+
+
+class ProductSearchTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.db = DatabaseManager(':memory:')
+        self.db.create_schema()
+        self.products = ShopServices(self.db).products
+        with self.db.transaction() as cursor:
+            # Brand matches rank below name matches
+            cursor.executemany("INSERT INTO Products (product_id, product_name, brand, price) VALUES (?, ?, ?, 1)",
+                               [(1, 'Court Classic', 'Airwalk'), (2, 'Pegasus', 'Nike'), (3, 'Air Max', 'Nike')])
+    
+    def tearDown(self):
+        self.db.close()
+    
+    def ids(self, text):
+        return [row[0] for row in self.products.search(text)]
+    
+    def test_short_prefix_lists_matches_in_id_order(self):
+        self.assertEqual(self.ids('a'), [1, 3])
+    
+    def test_longer_prefix_lists_the_best_match_first(self):
+        self.assertEqual(self.ids('air'), [3, 1])
+    
+    def test_every_word_must_match(self):
+        self.assertEqual(self.ids('nike ma'), [3])
+    
+    def test_empty_text_returns_the_listing(self):
+        self.assertIs(self.products.search(''), self.products.listing)
+
+
+if __name__ == '__main__':
+    unittest.main()
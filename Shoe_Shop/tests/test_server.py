@@ -0,0 +1,77 @@
+"""Tests for the JSON server's write path."""
+
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+from Shoe_Shop import ShopServices
+from shoe_shop_server import ShopServer
+
+
+class ShopServerTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.services = ShopServices.open(os.path.join(self.dir.name, 'shop.db'))
+        with self.services.db.transaction() as cursor:
+            cursor.execute("INSERT INTO Categories (category_id, category_name) VALUES (1, 'Running')")
+            cursor.execute("INSERT INTO Customers (customer_id, first_name, last_name) VALUES (1, 'Ana', 'Cruz')")
+            cursor.execute("INSERT INTO Products (product_id, product_name, category_id, price) VALUES (1, 'Air', 1, 100)")
+            cursor.execute("INSERT INTO Inventory (product_id, quantity) VALUES (1, 5)")
+    
+    def tearDown(self):
+        self.dir.cleanup()
+    
+    def serve(self, requests):
+        """Start a server, send (method, path, body) requests in turn and return the (status, payload) replies."""
+        async def run():
+            server = ShopServer(self.services, read_workers=2)
+            port = await server.start(port=0)
+            replies = []
+            try:
+                for method, path, payload in requests:
+                    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+                    body = json.dumps(payload).encode() if payload is not None else b''
+                    writer.write(f"{method} {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\n"
+                                 f"Connection: close\r\n\r\n".encode() + body)
+                    response = await reader.read()
+                    writer.close()
+                    head, _, content = response.partition(b'\r\n\r\n')
+                    replies.append((int(head.split()[1]), json.loads(content)))
+            finally:
+                await server.close()
+            return replies
+        return asyncio.run(run())
+    
+    def order(self, customer_id):
+        return ('POST', '/orders', {'customer_id': customer_id, 'items': [{'product_id': 1, 'quantity': 1}]})
+    
+    def test_order_for_unknown_customer_is_not_found(self):
+        (status, payload), = self.serve([self.order(99)])
+        self.assertEqual(status, 404)
+        self.assertIn('Customer #99', payload['error'])
+        self.assertEqual(self.services.db.fetchvalue("SELECT COUNT(*) FROM Orders"), 0)
+        self.assertEqual(self.services.db.fetchvalue("SELECT quantity FROM Inventory WHERE product_id = 1"), 5)
+    
+    def test_order_writes_keep_the_cached_lists(self):
+        catalog = self.services.catalog
+        catalog.rows('products')
+        catalog.rows('customers')
+        (status, _), = self.serve([self.order(1)])
+        self.assertEqual(status, 201)
+        self.assertEqual(set(catalog._rows), {'products', 'customers'})
+    
+    def test_product_writes_drop_the_product_list(self):
+        catalog = self.services.catalog
+        catalog.rows('products')
+        catalog.rows('customers')
+        (status, _), = self.serve([('POST', '/products', {'product_name': 'Zoom', 'category_name': 'Running',
+                                                          'price': 120, 'cost_price': 60})])
+        self.assertEqual(status, 201)
+        self.assertEqual(set(catalog._rows), {'customers'})
+
+
+if __name__ == '__main__':
+    unittest.main()
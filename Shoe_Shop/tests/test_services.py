@@ -0,0 +1,75 @@
+"""Tests for the service layer's business rules."""
+
+import unittest
+
+from Shoe_Shop import DatabaseManager, RecordInUseError, ShopServices
+
+
+class ProductDeleteTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.db = DatabaseManager(':memory:')
+        self.db.create_schema()
+        self.services = ShopServices(self.db)
+        with self.db.transaction() as cursor:
+            cursor.execute("INSERT INTO Customers (customer_id, first_name, last_name) VALUES (1, 'Ana', 'Cruz')")
+            cursor.executemany("INSERT INTO Products (product_id, product_name, price) VALUES (?, ?, 100)",
+                               [(1, 'Air'), (2, 'Zoom')])
+            cursor.executemany("INSERT INTO Inventory (product_id, quantity) VALUES (?, 5)", [(1,), (2,)])
+    
+    def tearDown(self):
+        self.db.close()
+    
+    def count(self, table, product_id):
+        return self.db.fetchvalue(f"SELECT COUNT(*) FROM {table} WHERE product_id = ?", (product_id,))
+    
+    def test_delete_removes_the_product_and_its_inventory(self):
+        self.services.products.delete(2)
+        self.assertEqual((self.count('Products', 2), self.count('Inventory', 2)), (0, 0))
+    
+    def test_product_on_an_order_is_kept(self):
+        self.services.orders.place(1, [self.services.orders.line(1, 1)])
+        with self.assertRaises(RecordInUseError):
+            self.services.products.delete(1)
+        self.assertEqual((self.count('Products', 1), self.count('Inventory', 1), self.count('OrderDetails', 1)),
+                         (1, 1, 1))
+    
+    def test_product_in_an_open_cart_is_kept(self):
+        self.services.orders.reserve('cart', 1, 2)
+        with self.assertRaises(RecordInUseError):
+            self.services.products.delete(1)
+        self.assertEqual(self.count('StockReservations', 1), 1)
+
+
+
+class CartResizeTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.db = DatabaseManager(':memory:')
+        self.db.create_schema()
+        self.orders = ShopServices(self.db).orders
+        with self.db.transaction() as cursor:
+            cursor.execute("INSERT INTO Products (product_id, product_name, price) VALUES (1, 'Air', 100)")
+            cursor.execute("INSERT INTO Inventory (product_id, quantity) VALUES (1, 5)")
+    
+    def tearDown(self):
+        self.db.close()
+    
+    def held(self):
+        return self.db.fetchvalue("SELECT reserved FROM Inventory WHERE product_id = 1")
+    
+    def test_changes_are_worked_out_from_what_is_held(self):
+        self.orders.reserve('cart', 1, 2)
+        self.assertTrue(self.orders.resize('cart', 1, 5))
+        self.assertTrue(self.orders.resize('cart', 1, 3))
+        self.assertEqual(self.held(), 3)
+    
+    def test_removed_line_is_not_reserved_again(self):
+        self.orders.reserve('cart', 1, 2)
+        self.orders.release('cart', 1)
+        self.assertFalse(self.orders.resize('cart', 1, 4))
+        self.assertEqual(self.held(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+"""Tests for cart reservations and oversell refusal at checkout."""
+
+import unittest
+
+from Shoe_Shop import DatabaseManager, InsufficientStockError
+
+
+class StockTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.db = DatabaseManager(':memory:')
+        self.db.create_schema()
+        with self.db.transaction() as cursor:
+            cursor.execute("INSERT INTO Customers (customer_id, first_name, last_name) VALUES (1, 'Ana', 'Cruz')")
+            cursor.execute("INSERT INTO Employees (employee_id, first_name, last_name) VALUES (1, 'Eve', 'Lim')")
+            cursor.executemany("INSERT INTO Products (product_id, product_name, price) VALUES (?, ?, 100)",
+                               [(1, 'Air'), (2, 'Zoom')])
+            cursor.executemany("INSERT INTO Inventory (product_id, quantity) VALUES (?, ?)", [(1, 5), (2, 2)])
+    
+    def tearDown(self):
+        self.db.close()
+    
+    def stock(self, product_id):
+        return self.db.fetchone("SELECT quantity, reserved FROM Inventory WHERE product_id = ?", (product_id,))
+    
+    def order_count(self):
+        return self.db.fetchvalue("SELECT COUNT(*) FROM Orders")
+    
+    def line(self, product_id, quantity):
+        return {'product_id': product_id, 'quantity': quantity, 'unit_price': 100, 'subtotal': 100 * quantity}
+    
+    def place(self, items, session_id=None):
+        return self.db.place_order(1, 1, items, 'Completed', 'Cash', session_id=session_id)
+    
+    def test_reserve_holds_units(self):
+        self.db.reserve_stock('a', 1, 3)
+        self.db.reserve_stock('a', 1, 1)
+        self.assertEqual(self.stock(1), (5, 4))
+        self.assertEqual(self.db.fetchvalue(
+            "SELECT quantity FROM StockReservations WHERE session_id = 'a' AND product_id = 1"), 4)
+    
+    def test_reserve_refuses_units_held_by_another_cart(self):
+        self.db.reserve_stock('a', 1, 4)
+        with self.assertRaises(InsufficientStockError) as caught:
+            self.db.reserve_stock('b', 1, 2)
+        self.assertEqual((caught.exception.requested, caught.exception.available), (2, 1))
+        self.assertEqual(self.stock(1), (5, 4))
+    
+    def test_reserve_unknown_product_has_nothing_available(self):
+        with self.assertRaises(InsufficientStockError) as caught:
+            self.db.reserve_stock('a', 99, 1)
+        self.assertEqual(caught.exception.available, 0)
+    
+    def test_release_returns_units(self):
+        self.db.reserve_stock('a', 1, 3)
+        self.db.reserve_stock('a', 2, 2)
+        self.assertEqual(self.db.release_stock('a', 1, 1), 1)
+        self.assertEqual(self.stock(1), (5, 2))
+        self.assertEqual(self.db.release_stock('a'), 4)
+        self.assertEqual((self.stock(1), self.stock(2)), ((5, 0), (2, 0)))
+        self.assertEqual(self.db.fetchvalue("SELECT COUNT(*) FROM StockReservations"), 0)
+    
+    def test_order_takes_stock(self):
+        self.place([self.line(1, 2), self.line(2, 2)])
+        self.assertEqual((self.stock(1), self.stock(2)), ((3, 0), (0, 0)))
+        self.assertEqual(self.order_count(), 1)
+    
+    def test_order_refuses_to_oversell_and_writes_nothing(self):
+        with self.assertRaises(InsufficientStockError) as caught:
+            self.place([self.line(1, 1), self.line(2, 3)])
+        self.assertEqual((caught.exception.product_id, caught.exception.available), (2, 2))
+        self.assertEqual((self.stock(1), self.stock(2)), ((5, 0), (2, 0)))
+        self.assertEqual(self.order_count(), 0)
+    
+    def test_order_sums_repeated_lines_of_a_product(self):
+        with self.assertRaises(InsufficientStockError):
+            self.place([self.line(2, 1), self.line(2, 2)])
+        self.assertEqual(self.stock(2), (2, 0))
+    
+    def test_order_cannot_take_units_another_cart_holds(self):
+        self.db.reserve_stock('a', 2, 2)
+        with self.assertRaises(InsufficientStockError):
+            self.place([self.line(2, 1)], session_id='b')
+        self.assertEqual(self.stock(2), (2, 2))
+    
+    def test_order_consumes_its_own_reservation(self):
+        self.db.reserve_stock('a', 2, 2)
+        self.place([self.line(2, 2)], session_id='a')
+        self.assertEqual(self.stock(2), (0, 0))
+        self.assertEqual(self.db.fetchvalue("SELECT COUNT(*) FROM StockReservations"), 0)
+    
+    def test_stale_reservations_are_released(self):
+        self.db.reserve_stock('a', 1, 3)
+        with self.db.transaction() as cursor:
+            cursor.execute("UPDATE StockReservations SET reserved_at = datetime('now', '-1 day')")
+        self.assertEqual(self.db.release_stale_reservations(), 1)
+        self.assertEqual(self.stock(1), (5, 0))
+    
+    def test_touched_reservations_are_kept(self):
+        self.db.reserve_stock('a', 1, 3)
+        with self.db.transaction() as cursor:
+            cursor.execute("UPDATE StockReservations SET reserved_at = datetime('now', '-1 day')")
+        self.assertEqual(self.db.touch_reservations('a'), 1)
+        self.assertEqual(self.db.release_stale_reservations(), 0)
+        self.assertEqual(self.stock(1), (5, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""Tests for TreeviewSync's keyed diffing."""
+
+import unittest
+
+from Shoe_Shop import TreeviewSync
+
+
+class FakeTree:
+    """Records the item calls a Treeview would receive and keeps the item order."""
+    
+    def __init__(self):
+        self.order = []
+        self.values = {}
+        self.calls = []
+    
+    def insert(self, parent, index, iid, values):
+        self.calls.append(('insert', iid))
+        self.order.insert(index, iid)
+        self.values[iid] = values
+    
+    def item(self, iid, values):
+        self.calls.append(('item', iid))
+        self.values[iid] = values
+    
+    def move(self, iid, parent, index):
+        self.calls.append(('move', iid))
+        self.order.remove(iid)
+        self.order.insert(index, iid)
+    
+    def delete(self, *iids):
+        self.calls.append(('delete',) + iids)
+        for iid in iids:
+            self.order.remove(iid)
+            del self.values[iid]
+
+
+class TreeviewSyncTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.tree = FakeTree()
+        self.sync = TreeviewSync(self.tree)
+        self.sync.sync([(1, 'a'), (2, 'b'), (3, 'c')])
+        self.tree.calls.clear()
+    
+    def assertShows(self, rows):
+        self.assertEqual(self.tree.order, [str(row[0]) for row in rows])
+        self.assertEqual([self.tree.values[str(row[0])] for row in rows], rows)
+    
+    def test_initial_sync_inserts_every_row(self):
+        self.assertShows([(1, 'a'), (2, 'b'), (3, 'c')])
+    
+    def test_unchanged_rows_need_no_calls(self):
+        self.assertEqual(self.sync.sync([(1, 'a'), (2, 'b'), (3, 'c')]), 0)
+        self.assertEqual(self.tree.calls, [])
+    
+    def test_changed_row_is_updated_in_place(self):
+        self.assertEqual(self.sync.sync([(1, 'a'), (2, 'B'), (3, 'c')]), 1)
+        self.assertEqual(self.tree.calls, [('item', '2')])
+        self.assertShows([(1, 'a'), (2, 'B'), (3, 'c')])
+    
+    def test_removed_rows_are_deleted_in_one_call(self):
+        self.assertEqual(self.sync.sync([(2, 'b')]), 1)
+        self.assertEqual(self.tree.calls, [('delete', '1', '3')])
+        self.assertShows([(2, 'b')])
+    
+    def test_new_row_is_inserted_at_its_position(self):
+        self.assertEqual(self.sync.sync([(1, 'a'), (4, 'd'), (2, 'b'), (3, 'c')]), 1)
+        self.assertEqual(self.tree.calls, [('insert', '4')])
+        self.assertShows([(1, 'a'), (4, 'd'), (2, 'b'), (3, 'c')])
+    
+    def test_reordered_rows_are_moved(self):
+        self.sync.sync([(3, 'c'), (1, 'a'), (2, 'b')])
+        self.assertNotIn('insert', [call[0] for call in self.tree.calls])
+        self.assertShows([(3, 'c'), (1, 'a'), (2, 'b')])
+    
+    def test_key_index_selects_the_iid_column(self):
+        tree = FakeTree()
+        TreeviewSync(tree, key_index=1).sync([('a', 10), ('b', 20)])
+        self.assertEqual(tree.order, ['10', '20'])
+    
+    def test_clear_removes_everything(self):
+        self.sync.clear()
+        self.assertEqual(self.tree.order, [])
+        self.assertEqual(self.sync.sync([(1, 'a')]), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()